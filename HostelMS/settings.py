@@ -45,11 +45,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost so session and auth queries are counted too; inert unless SQL_INSTRUMENTATION
+    'hostel.middleware.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'hostel.replica.ReplicaPinMiddleware',
+    'user.middleware.ProfileMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -59,9 +63,7 @@ ROOT_URLCONF = 'HostelMS.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [BASE_DIR / 'templates']
-        ,
-        'APP_DIRS': True,
+        'DIRS': [BASE_DIR / 'templates'],
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -69,6 +71,14 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Each template is parsed once per process; runserver's autoreloader
+            # still clears this cache when a template file changes
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -85,6 +95,24 @@ DATABASES = {
     }
 }
 
+# Read replica for the reporting views (hostel.replica); unset keeps every
+# read on 'default'. With SQLite, point it at a second file and copy the
+# primary into it with `python manage.py sync_replica`.
+REPLICA_DATABASE = 'replica'
+REPLICA_DB_NAME = config('REPLICA_DB_NAME', default='')
+if REPLICA_DB_NAME:
+    DATABASES[REPLICA_DATABASE] = {
+        **DATABASES['default'],
+        'NAME': REPLICA_DB_NAME if os.path.isabs(REPLICA_DB_NAME) else BASE_DIR / REPLICA_DB_NAME,
+        # Tests read and write one database
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['hostel.replica.ReplicaRouter']
+
+# How long a browser keeps reading from the primary after a write
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
 # Oracle Database Configuration (commented out for testing)
 # DATABASES = {
 #     'default': {
@@ -97,6 +125,58 @@ DATABASES = {
 #     }
 # }
 
+# Cache Configuration
+# Use a shared backend (Redis/Memcached) in production so every worker
+# sees the same cached dashboard statistics.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='hostelms'),
+    }
+}
+
+# Upper bound on how long the dashboard statistics snapshot may drift
+DASHBOARD_STATS_TIMEOUT = config('DASHBOARD_STATS_TIMEOUT', default=300, cast=int)
+
+# Per-student dashboard cache; entries are also dropped whenever the student's data changes
+STUDENT_DASHBOARD_TIMEOUT = config('STUDENT_DASHBOARD_TIMEOUT', default=600, cast=int)
+
+# Cached rows of the complaint and application lists; rows are also dropped when they change
+LIST_ROW_CACHE_TIMEOUT = config('LIST_ROW_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Cached hostel hierarchy trees, one per hostel; also dropped when its rooms or residents change
+HOSTEL_TREE_TIMEOUT = config('HOSTEL_TREE_TIMEOUT', default=3600, cast=int)
+
+# Waitlist queue order: comma-separated keys (semester, submitted_at), '-' for descending.
+# Run rebuild_waitlist after changing it
+WAITLIST_PRIORITY = config('WAITLIST_PRIORITY', default='-semester,submitted_at', cast=Csv())
+
+# Keyset pagination for the complaint and application lists
+LIST_PAGE_SIZE = config('LIST_PAGE_SIZE', default=50, cast=int)
+LIST_PAGE_SIZE_MAX = config('LIST_PAGE_SIZE_MAX', default=200, cast=int)
+
+# Read path for hostel.repository: 'auto' uses the stored procedures on
+# Oracle and the ORM elsewhere; 'orm' or 'oracle' force one for benchmarking
+REPOSITORY_BACKEND = config('REPOSITORY_BACKEND', default='auto')
+
+# Oracle REF CURSOR fetch tuning for hostel.db_utils
+ORACLE_ARRAYSIZE = config('ORACLE_ARRAYSIZE', default=1000, cast=int)
+ORACLE_PREFETCHROWS = config('ORACLE_PREFETCHROWS', default=1000, cast=int)
+
+# Oracle session pool for the hostel.db_utils stored-procedure path
+ORACLE_POOL = {
+    'ENABLED': config('ORACLE_POOL_ENABLED', default=False, cast=bool),
+    'MIN': config('ORACLE_POOL_MIN', default=2, cast=int),
+    'MAX': config('ORACLE_POOL_MAX', default=10, cast=int),
+    'INCREMENT': config('ORACLE_POOL_INCREMENT', default=1, cast=int),
+    # Milliseconds to wait for a free session before raising
+    'WAIT_TIMEOUT': config('ORACLE_POOL_WAIT_TIMEOUT', default=5000, cast=int),
+    # Seconds before idle sessions above MIN are closed
+    'IDLE_TIMEOUT': config('ORACLE_POOL_IDLE_TIMEOUT', default=300, cast=int),
+    # Seconds a session may sit idle before it is pinged on acquire
+    'PING_INTERVAL': config('ORACLE_POOL_PING_INTERVAL', default=60, cast=int),
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -132,6 +212,16 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Fee voucher download, resolved from BASE_DIR rather than the working directory
+FEE_VOUCHER_PATH = config('FEE_VOUCHER_PATH', default=os.path.join(BASE_DIR, 'static', 'fee_voucher.pdf'))
+
+# Hand file downloads to the front-end server: '' (serve from Django),
+# 'x-sendfile' (Apache/lighttpd) or 'x-accel-redirect' (nginx).
+# For nginx, SENDFILE_URL must be an `internal` location aliased to SENDFILE_ROOT.
+SENDFILE_BACKEND = config('SENDFILE_BACKEND', default='')
+SENDFILE_ROOT = config('SENDFILE_ROOT', default=os.path.join(BASE_DIR, 'static'))
+SENDFILE_URL = config('SENDFILE_URL', default='/protected/')
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
@@ -140,12 +230,52 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'user.User'
 CRISPY_TEMPLATE_PACK = 'bootstrap4'
 
+# Load the session user together with their Student/Admin profile in one
+# query; ModelBackend stays listed so sessions created before still resolve
+AUTHENTICATION_BACKENDS = [
+    'user.backends.ProfileBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+# Cache that user between requests (0 disables); needs a shared cache backend
+# with more than one worker so profile changes are seen everywhere
+AUTH_PROFILE_CACHE_TIMEOUT = config('AUTH_PROFILE_CACHE_TIMEOUT', default=0, cast=int)
+# 'django.contrib.sessions.backends.cached_db' serves session reads from the cache
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.db')
+
 # Login URL configuration
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'homepage'
 LOGOUT_REDIRECT_URL = 'login'
 
+# Per-request SQL instrumentation (Server-Timing header and log line);
+# requests running more than SQL_QUERY_BUDGET queries are logged as warnings
+SQL_INSTRUMENTATION = config('SQL_INSTRUMENTATION', default=False, cast=bool)
+SQL_QUERY_BUDGET = config('SQL_QUERY_BUDGET', default=20, cast=int)
+
 # Logging Configuration
+# LOG_QUEUED moves formatting and file/console I/O to a background thread;
+# LOG_ACCESS_SAMPLE_RATE keeps that share of hostel.access page-view events.
+# The log file rotates by size, or by time when LOG_ROTATE_WHEN is set
+# (e.g. 'midnight'); with several worker processes use one file per worker.
+LOGGING_CONFIG = 'hostel.log_handlers.configure_logging'
+LOG_QUEUED = config('LOG_QUEUED', default=False, cast=bool)
+LOG_ACCESS_SAMPLE_RATE = config('LOG_ACCESS_SAMPLE_RATE', default=1.0, cast=float)
+LOG_FILE = config('LOG_FILE', default=os.path.join(BASE_DIR, 'logs', 'hostel.log'))
+LOG_MAX_BYTES = config('LOG_MAX_BYTES', default=10 * 1024 * 1024, cast=int)
+LOG_BACKUP_COUNT = config('LOG_BACKUP_COUNT', default=5, cast=int)
+LOG_ROTATE_WHEN = config('LOG_ROTATE_WHEN', default='')
+
+if LOG_ROTATE_WHEN:
+    LOG_FILE_HANDLER = {
+        'class': 'logging.handlers.TimedRotatingFileHandler',
+        'when': LOG_ROTATE_WHEN,
+    }
+else:
+    LOG_FILE_HANDLER = {
+        'class': 'logging.handlers.RotatingFileHandler',
+        'maxBytes': LOG_MAX_BYTES,
+    }
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -159,11 +289,19 @@ LOGGING = {
             'style': '{',
         },
     },
+    'filters': {
+        'sample_access': {
+            '()': 'hostel.log_handlers.SamplingFilter',
+            'rate': LOG_ACCESS_SAMPLE_RATE,
+        },
+    },
     'handlers': {
         'file': {
+            **LOG_FILE_HANDLER,
             'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': os.path.join(BASE_DIR, 'logs', 'hostel.log'),
+            'filename': LOG_FILE,
+            'backupCount': LOG_BACKUP_COUNT,
+            'delay': True,
             'formatter': 'verbose',
         },
         'console': {
@@ -178,6 +316,9 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'hostel.access': {
+            'filters': ['sample_access'],
+        },
         'user': {
             'handlers': ['file', 'console'],
             'level': 'INFO',
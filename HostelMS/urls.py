@@ -18,7 +18,9 @@ from django.contrib import admin
 from django.urls import path,include
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('', include("user.urls")),
-    path('', include("hostel.urls"))
+    path('', include("hostel.urls")),
+    # After the app URLs: the admin site's catch-all would otherwise take
+    # hostel's admin/dashboard/ routes and redirect them to the admin login
+    path('admin/', admin.site.urls),
 ]
@@ -92,6 +92,10 @@ ON hostel_room(occupancy);
 CREATE INDEX idx_room_type_occupancy
 ON hostel_room(room_type, occupancy);
 
+-- Function-based index on free beds for get_available_rooms
+CREATE INDEX idx_room_free_beds
+ON hostel_room(capacity - occupied_beds, room_type, occupancy);
+
 -- =====================================================
 -- Room Residents (ManyToMany) Table Indexes
 -- =====================================================
@@ -187,7 +191,7 @@ BEGIN
     DBMS_OUTPUT.PUT_LINE('  - Application table (4 indexes)');
     DBMS_OUTPUT.PUT_LINE('  - Student table (4 indexes)');
     DBMS_OUTPUT.PUT_LINE('  - Admin table (2 indexes)');
-    DBMS_OUTPUT.PUT_LINE('  - Room table (4 indexes)');
+    DBMS_OUTPUT.PUT_LINE('  - Room table (5 indexes)');
     DBMS_OUTPUT.PUT_LINE('  - Room Residents table (3 indexes)');
     DBMS_OUTPUT.PUT_LINE('  - Floor table (2 indexes)');
     DBMS_OUTPUT.PUT_LINE('  - Wing table (1 index)');
@@ -167,6 +167,8 @@ CREATE OR REPLACE PROCEDURE approve_application(
 IS
     v_applicant_id NUMBER;
     v_count NUMBER;
+    v_capacity NUMBER;
+    v_occupied NUMBER;
 BEGIN
     -- Get the applicant ID
     SELECT applicant_id INTO v_applicant_id
@@ -190,8 +192,34 @@ BEGIN
     WHERE room_id = p_room_id AND student_id = v_applicant_id;
 
     IF v_count = 0 THEN
+        -- Lock the room row so concurrent approvals cannot overfill it
+        SELECT capacity, occupied_beds INTO v_capacity, v_occupied
+        FROM hostel_room
+        WHERE id = p_room_id
+        FOR UPDATE;
+
+        IF v_occupied >= v_capacity THEN
+            RAISE_APPLICATION_ERROR(-20001, 'Room ' || p_room_id || ' has no free bed');
+        END IF;
+
         INSERT INTO hostel_room_residents (room_id, student_id)
         VALUES (p_room_id, v_applicant_id);
+
+        -- Keep the denormalized bed counter in the same transaction
+        UPDATE hostel_room
+        SET occupied_beds = occupied_beds + 1
+        WHERE id = p_room_id;
+
+        -- ...and the room's group in the statistics summary
+        UPDATE hostel_roomstatistic s
+        SET s.occupied_beds = s.occupied_beds + 1
+        WHERE (s.hostel_id, s.room_type, s.occupancy) = (
+            SELECT w.hostel_id, r.room_type, r.occupancy
+            FROM hostel_room r
+            INNER JOIN hostel_floor f ON r.floor_id = f.id
+            INNER JOIN hostel_wing w ON f.wing_id = w.id
+            WHERE r.id = p_room_id
+        );
     END IF;
 
     COMMIT;
@@ -229,7 +257,8 @@ END update_complaint_status;
 
 -- =====================================================
 -- Procedure: get_dashboard_stats
--- Description: Retrieves dashboard statistics for admin
+-- Description: Retrieves dashboard statistics for admin.
+--              Each table is scanned once with conditional aggregation.
 -- Parameters: p_cursor OUT SYS_REFCURSOR
 -- =====================================================
 CREATE OR REPLACE PROCEDURE get_dashboard_stats(p_cursor OUT SYS_REFCURSOR)
@@ -237,33 +266,45 @@ IS
 BEGIN
     OPEN p_cursor FOR
         SELECT
-            (SELECT COUNT(*) FROM user_student) AS total_students,
-            (SELECT COUNT(*) FROM hostel_room) AS total_rooms,
-            (SELECT COUNT(*)
-             FROM hostel_application
-             WHERE status = 0) AS pending_applications,
-            (SELECT COUNT(*)
-             FROM hostel_complaint
-             WHERE status = 'Pending') AS pending_complaints,
-            (SELECT COUNT(*)
-             FROM hostel_complaint
-             WHERE status = 'In Progress') AS inprogress_complaints,
-            (SELECT COUNT(*)
-             FROM hostel_complaint
-             WHERE status = 'Resolved') AS resolved_complaints,
-            (SELECT COUNT(*)
-             FROM hostel_application
-             WHERE status = 1) AS approved_applications,
-            (SELECT COUNT(*)
-             FROM user_student
-             WHERE application_status = 1) AS students_with_rooms
-        FROM DUAL;
+            s.total_students,
+            r.total_rooms,
+            a.pending_applications,
+            c.pending_complaints,
+            c.inprogress_complaints,
+            c.resolved_complaints,
+            a.approved_applications,
+            s.students_with_rooms,
+            h.hostel_count
+        FROM (
+            SELECT COUNT(*) AS total_students,
+                   SUM(CASE WHEN application_status = 1 THEN 1 ELSE 0 END) AS students_with_rooms
+            FROM user_student
+        ) s
+        CROSS JOIN (
+            SELECT COUNT(*) AS total_rooms FROM hostel_room
+        ) r
+        CROSS JOIN (
+            SELECT SUM(CASE WHEN status = 0 THEN 1 ELSE 0 END) AS pending_applications,
+                   SUM(CASE WHEN status = 1 THEN 1 ELSE 0 END) AS approved_applications
+            FROM hostel_application
+        ) a
+        CROSS JOIN (
+            SELECT SUM(CASE WHEN status = 'Pending' THEN 1 ELSE 0 END) AS pending_complaints,
+                   SUM(CASE WHEN status = 'In Progress' THEN 1 ELSE 0 END) AS inprogress_complaints,
+                   SUM(CASE WHEN status = 'Resolved' THEN 1 ELSE 0 END) AS resolved_complaints
+            FROM hostel_complaint
+        ) c
+        CROSS JOIN (
+            SELECT COUNT(*) AS hostel_count FROM hostel_hostel
+        ) h;
 END get_dashboard_stats;
 /
 
 -- =====================================================
 -- Procedure: get_room_statistics
--- Description: Retrieves room occupancy statistics
+-- Description: Retrieves room occupancy statistics from the
+--              hostel_roomstatistic summary (one row per hostel,
+--              room type and occupancy), never the rooms table
 -- Parameters: p_cursor OUT SYS_REFCURSOR
 -- =====================================================
 CREATE OR REPLACE PROCEDURE get_room_statistics(p_cursor OUT SYS_REFCURSOR)
@@ -271,26 +312,21 @@ IS
 BEGIN
     OPEN p_cursor FOR
         SELECT
-            r.room_type,
-            r.occupancy,
-            COUNT(r.id) AS total_rooms,
-            COUNT(rr.student_id) AS occupied_beds,
-            CASE r.occupancy
-                WHEN 'Single' THEN COUNT(r.id) * 1
-                WHEN 'Double' THEN COUNT(r.id) * 2
-                WHEN 'Triple' THEN COUNT(r.id) * 3
-                ELSE 0
-            END AS total_capacity
-        FROM hostel_room r
-        LEFT JOIN hostel_room_residents rr ON r.id = rr.room_id
-        GROUP BY r.room_type, r.occupancy
-        ORDER BY r.room_type, r.occupancy;
+            s.room_type,
+            s.occupancy,
+            SUM(s.total_rooms) AS total_rooms,
+            SUM(s.occupied_beds) AS occupied_beds,
+            SUM(s.total_capacity) AS total_capacity
+        FROM hostel_roomstatistic s
+        GROUP BY s.room_type, s.occupancy
+        ORDER BY s.room_type, s.occupancy;
 END get_room_statistics;
 /
 
 -- =====================================================
 -- Procedure: get_available_rooms
--- Description: Retrieves rooms with available capacity
+-- Description: Retrieves rooms with available capacity. The free-bed
+--              test uses idx_room_free_beds (see indexes.sql).
 -- Parameters:
 --   p_room_type IN VARCHAR2 (optional) - Filter by room type
 --   p_occupancy IN VARCHAR2 (optional) - Filter by occupancy
@@ -309,13 +345,8 @@ BEGIN
             r.number,
             r.room_type,
             r.occupancy,
-            COUNT(rr.student_id) AS current_occupants,
-            CASE r.occupancy
-                WHEN 'Single' THEN 1
-                WHEN 'Double' THEN 2
-                WHEN 'Triple' THEN 3
-                ELSE 0
-            END AS max_capacity,
+            r.occupied_beds AS current_occupants,
+            r.capacity AS max_capacity,
             f.number AS floor_number,
             w.name AS wing_name,
             h.name AS hostel_name
@@ -323,21 +354,125 @@ BEGIN
         INNER JOIN hostel_floor f ON r.floor_id = f.id
         INNER JOIN hostel_wing w ON f.wing_id = w.id
         INNER JOIN hostel_hostel h ON w.hostel_id = h.id
-        LEFT JOIN hostel_room_residents rr ON r.id = rr.room_id
-        WHERE (p_room_type IS NULL OR r.room_type = p_room_type)
+        WHERE r.capacity - r.occupied_beds > 0
+          AND (p_room_type IS NULL OR r.room_type = p_room_type)
           AND (p_occupancy IS NULL OR r.occupancy = p_occupancy)
-        GROUP BY r.id, r.number, r.room_type, r.occupancy,
-                 f.number, w.name, h.name
-        HAVING COUNT(rr.student_id) < CASE r.occupancy
-            WHEN 'Single' THEN 1
-            WHEN 'Double' THEN 2
-            WHEN 'Triple' THEN 3
-            ELSE 0
-        END
         ORDER BY h.name, w.name, f.number, r.number;
 END get_available_rooms;
 /
 
+-- =====================================================
+-- Package: complaint_triage
+-- Description: Bulk complaint status transitions. One call moves every
+--              source status with one set-based UPDATE and one audit
+--              INSERT each. The procedures do not commit: the caller's
+--              transaction covers the whole call, so a failure leaves
+--              no complaint half moved or unaudited.
+-- =====================================================
+CREATE OR REPLACE PACKAGE complaint_triage AS
+    TYPE id_array IS TABLE OF NUMBER INDEX BY PLS_INTEGER;
+    TYPE status_array IS TABLE OF VARCHAR2(20) INDEX BY PLS_INTEGER;
+
+    -- =====================================================
+    -- Procedure: transition_complaints
+    -- Description: Moves the given complaints that are in one of
+    --              p_from_statuses to p_to_status and records one
+    --              hostel_complaintstatuschange row for each
+    -- Parameters:
+    --   p_ids IN id_array - Complaint IDs to move
+    --   p_from_statuses IN status_array - Statuses to move from, in order
+    --   p_to_status IN VARCHAR2 - New status value
+    --   p_changed_by IN NUMBER - Admin user ID recorded on the audit rows
+    --   p_moved_counts OUT id_array - Complaints moved from each of p_from_statuses
+    -- =====================================================
+    PROCEDURE transition_complaints(
+        p_ids IN id_array,
+        p_from_statuses IN status_array,
+        p_to_status IN VARCHAR2,
+        p_changed_by IN NUMBER,
+        p_moved_counts OUT id_array
+    );
+
+    -- =====================================================
+    -- Procedure: transition_all_complaints
+    -- Description: Same as transition_complaints for every complaint
+    --              in one of p_from_statuses; no ids are bound
+    -- =====================================================
+    PROCEDURE transition_all_complaints(
+        p_from_statuses IN status_array,
+        p_to_status IN VARCHAR2,
+        p_changed_by IN NUMBER,
+        p_moved_counts OUT id_array
+    );
+END complaint_triage;
+/
+
+CREATE OR REPLACE PACKAGE BODY complaint_triage AS
+    PROCEDURE audit_moved(
+        p_moved_ids IN id_array,
+        p_from_status IN VARCHAR2,
+        p_to_status IN VARCHAR2,
+        p_changed_by IN NUMBER,
+        p_changed_at IN TIMESTAMP
+    )
+    IS
+    BEGIN
+        FORALL i IN 1 .. p_moved_ids.COUNT
+            INSERT INTO hostel_complaintstatuschange (
+                complaint_id, old_status, new_status, changed_by_id, changed_at
+            )
+            VALUES (
+                p_moved_ids(i), p_from_status, p_to_status, p_changed_by, p_changed_at
+            );
+    END audit_moved;
+
+    PROCEDURE transition_complaints(
+        p_ids IN id_array,
+        p_from_statuses IN status_array,
+        p_to_status IN VARCHAR2,
+        p_changed_by IN NUMBER,
+        p_moved_counts OUT id_array
+    )
+    IS
+        v_moved_ids id_array;
+        v_changed_at TIMESTAMP := SYS_EXTRACT_UTC(SYSTIMESTAMP);
+    BEGIN
+        FOR s IN 1 .. p_from_statuses.COUNT LOOP
+            FORALL i IN INDICES OF p_ids
+                UPDATE hostel_complaint
+                SET status = p_to_status
+                WHERE id = p_ids(i)
+                  AND status = p_from_statuses(s)
+                RETURNING id BULK COLLECT INTO v_moved_ids;
+
+            audit_moved(v_moved_ids, p_from_statuses(s), p_to_status, p_changed_by, v_changed_at);
+            p_moved_counts(s) := v_moved_ids.COUNT;
+        END LOOP;
+    END transition_complaints;
+
+    PROCEDURE transition_all_complaints(
+        p_from_statuses IN status_array,
+        p_to_status IN VARCHAR2,
+        p_changed_by IN NUMBER,
+        p_moved_counts OUT id_array
+    )
+    IS
+        v_moved_ids id_array;
+        v_changed_at TIMESTAMP := SYS_EXTRACT_UTC(SYSTIMESTAMP);
+    BEGIN
+        FOR s IN 1 .. p_from_statuses.COUNT LOOP
+            UPDATE hostel_complaint
+            SET status = p_to_status
+            WHERE status = p_from_statuses(s)
+            RETURNING id BULK COLLECT INTO v_moved_ids;
+
+            audit_moved(v_moved_ids, p_from_statuses(s), p_to_status, p_changed_by, v_changed_at);
+            p_moved_counts(s) := v_moved_ids.COUNT;
+        END LOOP;
+    END transition_all_complaints;
+END complaint_triage;
+/
+
 -- =====================================================
 -- Display success message
 -- =====================================================
@@ -357,6 +492,8 @@ BEGIN
     DBMS_OUTPUT.PUT_LINE('  9. get_dashboard_stats');
     DBMS_OUTPUT.PUT_LINE(' 10. get_room_statistics');
     DBMS_OUTPUT.PUT_LINE(' 11. get_available_rooms');
+    DBMS_OUTPUT.PUT_LINE(' 12. complaint_triage.transition_complaints');
+    DBMS_OUTPUT.PUT_LINE(' 13. complaint_triage.transition_all_complaints');
     DBMS_OUTPUT.PUT_LINE('========================================');
 END;
 /
@@ -1,10 +1,216 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import Sum
 from hostel.models import *
-# Register your models here.
-
-admin.site.register(Hostel)
-admin.site.register(Wing)
-admin.site.register(Floor)
-admin.site.register(Room)
-admin.site.register(Complaint)
-admin.site.register(Application)
\ No newline at end of file
+from hostel.allocation import allocate_pending_applications
+from hostel.triage import transition_complaints
+
+# Changelists load related rows with list_select_related, so __str__ and
+# the display columns cost no query per row, filter only on indexed
+# columns, and skip the second, unfiltered COUNT(*)
+# (show_full_result_count=False) that Django runs under every filter.
+
+
+@admin.register(Hostel)
+class HostelAdmin(admin.ModelAdmin):
+    list_display = ('name', 'type', 'address', 'admin', 'rooms', 'occupants', 'beds')
+    list_select_related = ('admin',)
+    search_fields = ('name',)
+
+    def get_queryset(self, request):
+        # Summed from the RoomStatistic summary: a few rows per hostel, not its rooms and residents
+        return super().get_queryset(request).annotate(
+            room_count=Sum('room_statistics__total_rooms'),
+            occupant_count=Sum('room_statistics__occupied_beds'),
+            bed_count=Sum('room_statistics__total_capacity'),
+        )
+
+    @admin.display(description='Rooms', ordering='room_count')
+    def rooms(self, obj):
+        return obj.room_count or 0
+
+    @admin.display(description='Occupants', ordering='occupant_count')
+    def occupants(self, obj):
+        return obj.occupant_count or 0
+
+    @admin.display(description='Beds', ordering='bed_count')
+    def beds(self, obj):
+        return obj.bed_count or 0
+
+
+@admin.register(Wing)
+class WingAdmin(admin.ModelAdmin):
+    list_display = ('name', 'hostel')
+    list_select_related = ('hostel',)
+    autocomplete_fields = ('hostel',)
+
+
+@admin.register(Floor)
+class FloorAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'wing', 'hostel')
+    list_select_related = ('wing__hostel',)
+
+    @admin.display(description='Hostel')
+    def hostel(self, obj):
+        return obj.wing.hostel
+
+
+@admin.register(Room)
+class RoomAdmin(admin.ModelAdmin):
+    list_display = ('number', 'hostel', 'floor', 'room_type', 'occupancy', 'occupied_beds', 'capacity')
+    list_select_related = ('floor__wing__hostel',)
+    # room_free_bed_idx covers occupancy and room_type; floor_id is a foreign key index
+    list_filter = ('occupancy', 'room_type', 'floor__wing__hostel')
+    search_fields = ('number',)
+    # Searches students as you type instead of rendering all of them into a <select>
+    autocomplete_fields = ('residents',)
+    # Maintained by Room.save and the residents signal
+    readonly_fields = ('capacity', 'occupied_beds')
+    show_full_result_count = False
+
+    @admin.display(description='Hostel', ordering='floor__wing__hostel__name')
+    def hostel(self, obj):
+        return obj.floor.wing.hostel
+
+
+class ComplaintStatusChangeInline(admin.TabularInline):
+    model = ComplaintStatusChange
+    fields = ('old_status', 'new_status', 'changed_by', 'changed_at')
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('changed_by')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Complaint)
+class ComplaintAdmin(admin.ModelAdmin):
+    list_display = ('id', 'student_number', 'student_name', 'summary', 'status')
+    list_select_related = ('student',)
+    # Served by complaint_status_id_idx, newest first
+    list_filter = ('status',)
+    ordering = ('-id',)
+    # Exact matches stay on indexes; a substring search over descriptions is the search page's job
+    search_fields = ('=id', '=student__student_id')
+    autocomplete_fields = ('student',)
+    inlines = (ComplaintStatusChangeInline,)
+    show_full_result_count = False
+    actions = ['mark_in_progress', 'mark_resolved']
+
+    @admin.display(description='Student ID')
+    def student_number(self, obj):
+        return obj.student.student_id
+
+    @admin.display(description='Student')
+    def student_name(self, obj):
+        return obj.student.name
+
+    @admin.display(description='Description')
+    def summary(self, obj):
+        return obj.description if len(obj.description) <= 60 else f'{obj.description[:57]}...'
+
+    def _transition(self, request, queryset, new_status):
+        # The queryset goes through as a subquery, so "select all" binds no ids
+        moved = transition_complaints(
+            new_status,
+            complaint_ids=queryset,
+            changed_by_id=request.profile.pk if isinstance(request.profile, Admin) else None,
+        )
+        self.message_user(request, f'{sum(moved.values())} complaints moved to {new_status}.', messages.SUCCESS)
+
+    @admin.action(description='Mark selected complaints In Progress')
+    def mark_in_progress(self, request, queryset):
+        self._transition(request, queryset, 'In Progress')
+
+    @admin.action(description='Mark selected complaints Resolved')
+    def mark_resolved(self, request, queryset):
+        self._transition(request, queryset, 'Resolved')
+
+
+@admin.register(ComplaintStatusChange)
+class ComplaintStatusChangeAdmin(admin.ModelAdmin):
+    list_display = ('complaint_id', 'old_status', 'new_status', 'changed_by', 'changed_at')
+    list_select_related = ('changed_by',)
+    ordering = ('-id',)
+    search_fields = ('=complaint__id',)
+    show_full_result_count = False
+
+    # The audit trail is written by triage only
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Application)
+class ApplicationAdmin(admin.ModelAdmin):
+    list_display = ('id', 'student_number', 'applicant_name', 'room_type', 'occupancy', 'status')
+    list_select_related = ('applicant',)
+    # Served by application_status_id_idx and application_prefs_id_idx
+    list_filter = ('status', 'room_type')
+    ordering = ('-id',)
+    search_fields = ('=id', '=applicant__student_id')
+    autocomplete_fields = ('applicant',)
+    show_full_result_count = False
+    actions = ['allocate_rooms']
+
+    @admin.display(description='Student ID')
+    def student_number(self, obj):
+        return obj.applicant.student_id
+
+    @admin.display(description='Applicant')
+    def applicant_name(self, obj):
+        return obj.applicant.name
+
+    @admin.action(description='Allocate rooms to selected pending applications')
+    def allocate_rooms(self, request, queryset):
+        result = allocate_pending_applications(application_ids=queryset.filter(status=False))
+        self.message_user(request, f"{result['allocated']} applications allocated a room.", messages.SUCCESS)
+        if result['unmatched']:
+            self.message_user(request, f"{result['unmatched']} applications have no matching free bed.", messages.WARNING)
+
+
+@admin.register(RoomStatistic)
+class RoomStatisticAdmin(admin.ModelAdmin):
+    list_display = ('hostel', 'room_type', 'occupancy', 'total_rooms', 'occupied_beds', 'total_capacity')
+    list_select_related = ('hostel',)
+    list_filter = ('hostel',)
+
+    # Maintained by refresh_occupied_beds and rebuild_room_statistics
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ('application_id', 'student_number', 'applicant_name', 'room_type', 'occupancy', 'priority')
+    list_select_related = ('application__applicant',)
+    # Queue order, served by waitlist_queue_idx
+    list_filter = ('room_type', 'occupancy')
+    ordering = ('room_type', 'occupancy', 'priority', 'id')
+    show_full_result_count = False
+
+    @admin.display(description='Student ID')
+    def student_number(self, obj):
+        return obj.application.applicant.student_id
+
+    @admin.display(description='Applicant')
+    def applicant_name(self, obj):
+        return obj.application.applicant.name
+
+    # Maintained by the application signals and the allocator; see rebuild_waitlist
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,215 @@
+"""
+Batch room allocation for HostelMS.
+
+Matches pending applications to rooms with free beds in a single pass over
+an in-memory capacity index, then commits the allocations in chunked
+transactions using set-based writes. Applications are taken in waitlist
+order, and fill_free_beds gives beds freed later to the waitlist heads.
+"""
+import logging
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from django.db import transaction
+from django.db.models import F, QuerySet
+
+from user.backends import invalidate_profiles
+from user.models import Student
+from .models import Room, Application
+from .stats import invalidate_dashboard_stats
+from .student_cache import invalidate_student_dashboards
+from .versions import APPLICATIONS, STUDENTS, bump_versions
+from .waitlist import dequeue_applicants, queue_heads
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def build_capacity_index() -> Dict[Tuple[str, str], deque]:
+    """
+    Load every room with a free bed, grouped by (room_type, occupancy).
+
+    Returns:
+        Dict: Maps (room_type, occupancy) to a deque of [room_id, free_beds]
+              entries in room id order
+    """
+    index = defaultdict(deque)
+    rooms = (
+        Room.objects
+        .with_free_beds()
+        .order_by('id')
+        .values_list('id', 'room_type', 'occupancy', 'capacity', 'occupied_beds')
+    )
+    for room_id, room_type, occupancy, capacity, occupied_beds in rooms:
+        index[(room_type, occupancy)].append([room_id, capacity - occupied_beds])
+    return index
+
+
+def match_applications(applications: Iterable[Tuple[int, int, str, str]],
+                       index: Dict[Tuple[str, str], deque]) -> Tuple[List[Tuple[int, int, int]], List[int]]:
+    """
+    Assign each application the first room with a free bed of its kind.
+
+    Args:
+        applications: (application_id, applicant_id, room_type, occupancy) rows
+        index: Capacity index from build_capacity_index(); consumed in place
+
+    Returns:
+        Tuple: (allocations as (application_id, applicant_id, room_id),
+                ids of applications that could not be matched)
+    """
+    allocations = []
+    unmatched = []
+    for application_id, applicant_id, room_type, occupancy in applications:
+        rooms = index.get((room_type, occupancy))
+        if not rooms:
+            unmatched.append(application_id)
+            continue
+        room = rooms[0]
+        allocations.append((application_id, applicant_id, room[0]))
+        room[1] -= 1
+        if room[1] == 0:
+            rooms.popleft()
+    return allocations, unmatched
+
+
+def _commit_chunk(chunk: List[Tuple[int, int, int]]) -> None:
+    """Write one chunk of allocations in a single transaction."""
+    Residents = Room.residents.through
+    with transaction.atomic():
+        Application.objects.filter(id__in=[a[0] for a in chunk]).update(status=True)
+        Student.objects.filter(user_id__in=[a[1] for a in chunk]).update(application_status=True)
+        Residents.objects.bulk_create(
+            [Residents(room_id=room_id, student_id=applicant_id) for _, applicant_id, room_id in chunk],
+            ignore_conflicts=True,
+        )
+        # The bulk insert bypasses m2m_changed, so recount the touched rooms here
+        Room.objects.filter(pk__in={a[2] for a in chunk}).refresh_occupied_beds()
+        # ...and the update() calls bypass post_save, so take the applicants off the
+        # waitlist (every queue they were in) and drop their cached copies
+        applicant_ids = [a[1] for a in chunk]
+        dequeue_applicants(applicant_ids)
+        transaction.on_commit(lambda: invalidate_student_dashboards(applicant_ids))
+        transaction.on_commit(lambda: invalidate_profiles(applicant_ids))
+        bump_versions(APPLICATIONS, STUDENTS)
+
+
+def allocate_pending_applications(application_ids: Union[Iterable[int], QuerySet, None] = None,
+                                  chunk_size: int = DEFAULT_CHUNK_SIZE,
+                                  dry_run: bool = False) -> Dict:
+    """
+    Allocate rooms to pending applications in one batch.
+
+    Args:
+        application_ids: Restrict the batch to these applications, as ids
+            or as an Application queryset (applied as a subquery)
+        chunk_size: Number of allocations committed per transaction
+        dry_run: Match applications without writing anything
+
+    Returns:
+        Dict: Batch summary with keys:
+            - allocated: Number of applications allocated a room
+            - unmatched: Number of applications left without a room
+            - allocations: List of (application_id, applicant_id, room_id)
+    """
+    applications = (
+        Application.objects
+        .filter(status=False, applicant__application_status=False)
+        .order_by(F('waitlist_entry__priority').asc(nulls_last=True), 'id')
+        .values_list('id', 'applicant_id', 'room_type', 'occupancy')
+    )
+    if isinstance(application_ids, QuerySet):
+        applications = applications.filter(id__in=application_ids.order_by().values('id'))
+    elif application_ids is not None:
+        applications = applications.filter(id__in=list(application_ids))
+
+    # An applicant with several pending applications is only housed once
+    seen = set()
+    pending = []
+    for row in applications:
+        if row[1] not in seen:
+            seen.add(row[1])
+            pending.append(row)
+
+    allocations, unmatched = match_applications(pending, build_capacity_index())
+
+    if not dry_run:
+        for start in range(0, len(allocations), chunk_size):
+            _commit_chunk(allocations[start:start + chunk_size])
+        if allocations:
+            # Set-based writes bypass the model signals
+            invalidate_dashboard_stats()
+
+    logger.info('Batch allocation %s: %s allocated, %s unmatched',
+                'planned' if dry_run else 'committed', len(allocations), len(unmatched))
+
+    return {
+        'allocated': len(allocations),
+        'unmatched': len(unmatched),
+        'allocations': allocations,
+    }
+
+
+def _claim_free_beds(room_id: int) -> List[Tuple[int, int, int]]:
+    """
+    Match a room's free beds to its queue heads; call inside a transaction.
+
+    The room row, the head entries and their applicants stay locked until
+    the transaction ends, so a concurrent fill neither overfills the room
+    nor houses the same applicant in a second room; see queue_heads.
+    """
+    # Not sliced (no first()): Oracle cannot combine FOR UPDATE with a row limit
+    rooms = list(
+        Room.objects
+        .select_for_update()
+        .filter(pk=room_id)
+        .values_list('room_type', 'occupancy', 'capacity', 'occupied_beds')
+    )
+    if not rooms:
+        return []
+    room_type, occupancy, capacity, occupied_beds = rooms[0]
+    # Re-checked under the lock: the bed may have been taken since it was freed
+    if occupied_beds >= capacity:
+        return []
+
+    return [
+        (application_id, applicant_id, room_id)
+        for application_id, applicant_id in queue_heads(room_type, occupancy, capacity - occupied_beds, lock=True)
+    ]
+
+
+def fill_free_beds(room_ids: Iterable[int]) -> List[Tuple[int, int, int]]:
+    """
+    Give the free beds of these rooms to the heads of their waitlists.
+
+    Each room costs one index range scan of its queue for as many heads as
+    it has free beds; pending applications are never rescanned.
+
+    Args:
+        room_ids: Rooms that may have beds free (e.g. after a resident left)
+
+    Returns:
+        List[Tuple[int, int, int]]: Allocations made, as
+            (application_id, applicant_id, room_id)
+    """
+    candidates = list(
+        Room.objects
+        .filter(pk__in=list(room_ids))
+        .with_free_beds()
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+    allocations = []
+    for room_id in candidates:
+        # Committed room by room, so the next room's heads exclude those housed here
+        with transaction.atomic():
+            chunk = _claim_free_beds(room_id)
+            if chunk:
+                _commit_chunk(chunk)
+        allocations.extend(chunk)
+
+    if allocations:
+        invalidate_dashboard_stats()
+        logger.info('Waitlist filled %s freed beds: %s', len(allocations), allocations)
+    return allocations
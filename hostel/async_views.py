@@ -0,0 +1,103 @@
+"""
+Async variants of the HostelMS dashboard and list views.
+
+Same templates, filters and caches as the views in hostel.views, but the
+data is read with Django's async ORM and async cache API, so under an ASGI
+server (e.g. ``uvicorn HostelMS.asgi:application``) a worker keeps serving
+other clients while a request waits on the database or cache. Independent
+reads within a request are awaited together with asyncio.gather.
+
+Django runs async ORM queries through sync_to_async, one request's queries
+at a time, so gather() overlaps their scheduling rather than the SQL
+itself; the gain is in how many slow clients one process can hold.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.shortcuts import render, redirect
+
+from .decorators import student_required, admin_required
+from .pagination import akeyset_paginate
+from .views import (
+    admin_dashboard_context, applications_context, complaints_context,
+    filter_applications, filter_complaints, search_page,
+)
+
+logger = logging.getLogger(__name__)
+access_logger = logging.getLogger('hostel.access')
+
+# Templates use the context processors (messages, session-backed user), so
+# rendering stays on the request's sync thread
+arender = sync_to_async(render)
+
+
+@admin_required
+async def admin_dashboard(request):
+    """Async admin dashboard, served from the cached statistics snapshot"""
+    from .stats import aget_dashboard_stats
+
+    try:
+        context = admin_dashboard_context(await aget_dashboard_stats())
+
+        access_logger.info('Admin %s accessed dashboard (async)', request.user.username)
+        return await arender(request, 'hostel/admin_dashboard.html', context)
+
+    except Exception as e:
+        logger.error('Error loading admin dashboard: %s', e)
+        messages.error(request, 'An error occurred while loading the dashboard.')
+        return redirect('homepage')
+
+
+@student_required
+async def student_dashboard(request):
+    """Async student dashboard; a cache miss loads its four parts concurrently"""
+    from .student_cache import aget_student_dashboard
+
+    try:
+        context = await aget_student_dashboard(request.user.pk)
+        if context is None:
+            messages.error(request, 'Student profile not found. Please contact administrator.')
+            return redirect('homepage')
+
+        access_logger.info('Student %s accessed dashboard (async)', context['student'].student_id)
+        return await arender(request, 'hostel/student_dashboard.html', context)
+
+    except Exception as e:
+        logger.error('Error loading student dashboard: %s', e)
+        messages.error(request, 'An error occurred while loading your dashboard.')
+        return redirect('homepage')
+
+
+@admin_required
+async def fetch_complaints(request):
+    """Async keyset page of complaints"""
+    try:
+        complaints, filters = filter_complaints(request)
+        page = await sync_to_async(search_page)(request, filters)
+        if page is None:
+            page = await akeyset_paginate(complaints, request)
+
+        access_logger.info('Admin %s fetched complaints page (async)', request.user.username)
+        return await arender(request, 'hostel/complaints.html', complaints_context(page, filters))
+
+    except Exception as e:
+        logger.error('Error fetching complaints: %s', e)
+        messages.error(request, 'An error occurred while fetching complaints.')
+        return redirect('homepage')
+
+
+@admin_required
+async def fetch_applications(request):
+    """Async keyset page of applications"""
+    try:
+        applications, filters = filter_applications(request)
+        page = await akeyset_paginate(applications, request)
+
+        access_logger.info('Admin %s fetched applications page (async)', request.user.username)
+        return await arender(request, 'hostel/applications.html', applications_context(page, filters))
+
+    except Exception as e:
+        logger.error('Error fetching applications: %s', e)
+        messages.error(request, 'An error occurred while fetching applications.')
+        return redirect('homepage')
@@ -0,0 +1,76 @@
+"""
+Bed counter and room summary upkeep for HostelMS.
+
+Handlers for the model changes that move students between rooms or rooms
+between RoomStatistic groups, dispatched from hostel.signals. A residents
+change recounts the rooms' occupied_beds (refresh_occupied_beds also moves
+their RoomStatistic groups, the rooms version counter and the hostel
+trees) and hands any freed bed to the waitlist; adding, moving or
+deleting a room rebuilds its hostels' summary rows.
+"""
+from typing import Iterable, Tuple
+
+from django.db import transaction
+
+from .allocation import fill_free_beds
+from .hierarchy import parent_hostel_ids
+from .models import Room, RoomStatistic
+
+
+def residents_changed(room_ids: Iterable[int], freed: bool, using) -> None:
+    """
+    Recount these rooms after residents were added to or removed from them.
+
+    Call it inside the transaction that wrote the residents rows.
+
+    Args:
+        room_ids: Rooms whose residents changed
+        freed: Whether beds may have been freed; they go to the waitlist
+            heads once the transaction commits
+        using: Database alias of the transaction
+    """
+    room_ids = list(room_ids)
+    if not room_ids:
+        return
+    Room.objects.using(using).filter(pk__in=room_ids).refresh_occupied_beds()
+    if freed:
+        transaction.on_commit(lambda: fill_free_beds(room_ids), using=using)
+
+
+def resident_deleting(student, using) -> None:
+    """Remember a student's rooms before the delete cascades to their residents rows."""
+    student._vacated_room_ids = list(student.rooms.using(using).values_list('pk', flat=True))
+
+
+def resident_deleted(student, using) -> None:
+    """Free the beds of a deleted student; the cascade sent no m2m_changed."""
+    residents_changed(student.__dict__.pop('_vacated_room_ids', []), True, using)
+
+
+def _rebuild_on_commit(floor_ids: Iterable, using) -> None:
+    # Looked up now: a cascading delete removes the floor before the commit
+    hostel_ids = list(parent_hostel_ids('room', floor_ids, using))
+    if hostel_ids:
+        transaction.on_commit(lambda: RoomStatistic.objects.using(using).rebuild(hostel_ids), using=using)
+
+
+def room_saved(room, old_group: Tuple, created: bool, using) -> None:
+    """
+    Rebuild the summary rows a saved room was added to or moved between.
+
+    Occupancy changes are applied incrementally by refresh_occupied_beds,
+    so an edit that keeps the room in its group costs nothing.
+
+    Args:
+        room: The saved Room
+        old_group: (floor_id, room_type, occupancy) it was loaded with
+        created: Whether the room was inserted
+        using: Database alias of the transaction
+    """
+    if created or old_group != (room.floor_id, room.room_type, room.occupancy):
+        _rebuild_on_commit({old_group[0], room.floor_id}, using)
+
+
+def room_deleted(room, using) -> None:
+    """Rebuild the summary rows of a deleted room's hostel."""
+    _rebuild_on_commit([room.floor_id], using)
@@ -1,14 +1,189 @@
 """
 Database utility functions for HostelMS.
 Provides Python wrappers for Oracle stored procedures.
+
+Procedures returning a REF CURSOR have two wrappers: an ``iter_*``
+generator that streams rows in fetch batches of ``arraysize`` (with
+``prefetchrows`` rows sent on the first round trip), and a ``call_*``
+function that collects them into a list.
 """
 import cx_Oracle
 import logging
+from contextlib import contextmanager
+from django.conf import settings
 from django.db import connection
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
+
+from .oracle_pool import pool_enabled, pooled_connection
 
 logger = logging.getLogger(__name__)
 
+COMPLAINT_COLUMNS = ['id', 'description', 'status', 'student_id', 'student_name', 'student_email']
+
+STUDENT_COMPLAINT_COLUMNS = ['id', 'description', 'status']
+
+APPLICATION_COLUMNS = [
+    'id', 'room_type', 'occupancy', 'status', 'applicant_user_id', 'student_id',
+    'applicant_name', 'applicant_email', 'semester',
+]
+
+STUDENT_APPLICATION_COLUMNS = ['id', 'room_type', 'occupancy', 'status']
+
+PENDING_APPLICATION_COLUMNS = [
+    'id', 'room_type', 'occupancy', 'status', 'student_id', 'applicant_name', 'applicant_email', 'semester',
+]
+
+ROOM_STATISTICS_COLUMNS = ['room_type', 'occupancy', 'total_rooms', 'occupied_beds', 'total_capacity']
+
+AVAILABLE_ROOM_COLUMNS = [
+    'id', 'number', 'room_type', 'occupancy', 'current_occupants', 'max_capacity',
+    'floor_number', 'wing_name', 'hostel_name',
+]
+
+
+@contextmanager
+def _cursor():
+    """
+    Open a cursor for a stored-procedure call.
+
+    Uses a session borrowed from the Oracle session pool when
+    settings.ORACLE_POOL is enabled, otherwise Django's connection. Pooled
+    sessions do not see uncommitted writes made through the ORM.
+    """
+    if pool_enabled():
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+    else:
+        with connection.cursor() as cursor:
+            yield cursor
+
+
+def _iter_ref_cursor(procedure: str, args: List, columns: List[str],
+                     arraysize: Optional[int] = None,
+                     prefetchrows: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Call a procedure whose last parameter is an OUT SYS_REFCURSOR and stream its rows.
+
+    The REF CURSOR is created up front so its fetch sizes apply from the
+    first round trip; rows are then read ``arraysize`` at a time.
+
+    Args:
+        procedure: Name of the stored procedure
+        args: IN parameters, in order, before the REF CURSOR
+        columns: Dictionary keys for the selected columns, in order
+        arraysize: Rows fetched per round trip (default: settings.ORACLE_ARRAYSIZE)
+        prefetchrows: Rows returned with the execute call (default: settings.ORACLE_PREFETCHROWS)
+
+    Yields:
+        Dict: One row keyed by ``columns``
+    """
+    with _cursor() as cursor:
+        ref_cursor = cursor.connection.cursor()
+        ref_cursor.arraysize = arraysize or settings.ORACLE_ARRAYSIZE
+        ref_cursor.prefetchrows = prefetchrows if prefetchrows is not None else settings.ORACLE_PREFETCHROWS
+
+        try:
+            cursor.callproc(procedure, [*args, ref_cursor])
+            while True:
+                rows = ref_cursor.fetchmany()
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(columns, row))
+        finally:
+            ref_cursor.close()
+
+
+def iter_all_complaints(arraysize: Optional[int] = None, prefetchrows: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Stream all complaints with student details.
+
+    Yields:
+        Dict: Complaint rows shaped like call_get_all_complaints()
+    """
+    return _iter_ref_cursor('get_all_complaints', [], COMPLAINT_COLUMNS, arraysize, prefetchrows)
+
+
+def iter_complaints_by_student(student_user_id: int, arraysize: Optional[int] = None,
+                               prefetchrows: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Stream complaints for a specific student.
+
+    Yields:
+        Dict: Complaint rows shaped like call_get_complaints_by_student()
+    """
+    return _iter_ref_cursor('get_complaints_by_student', [student_user_id], STUDENT_COMPLAINT_COLUMNS,
+                            arraysize, prefetchrows)
+
+
+def iter_complaints_by_status(status: str, arraysize: Optional[int] = None,
+                              prefetchrows: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Stream complaints filtered by status.
+
+    Yields:
+        Dict: Complaint rows shaped like call_get_complaints_by_status()
+    """
+    return _iter_ref_cursor('get_complaints_by_status', [status], COMPLAINT_COLUMNS, arraysize, prefetchrows)
+
+
+def iter_applications(arraysize: Optional[int] = None, prefetchrows: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Stream all room applications with applicant details.
+
+    Yields:
+        Dict: Application rows shaped like call_fetch_applications()
+    """
+    return _iter_ref_cursor('fetch_applications', [], APPLICATION_COLUMNS, arraysize, prefetchrows)
+
+
+def iter_applications_by_student(student_user_id: int, arraysize: Optional[int] = None,
+                                 prefetchrows: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Stream applications for a specific student.
+
+    Yields:
+        Dict: Application rows shaped like call_get_applications_by_student()
+    """
+    return _iter_ref_cursor('get_applications_by_student', [student_user_id], STUDENT_APPLICATION_COLUMNS,
+                            arraysize, prefetchrows)
+
+
+def iter_pending_applications(arraysize: Optional[int] = None, prefetchrows: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Stream all pending (unapproved) applications.
+
+    Yields:
+        Dict: Application rows shaped like call_get_pending_applications()
+    """
+    return _iter_ref_cursor('get_pending_applications', [], PENDING_APPLICATION_COLUMNS, arraysize, prefetchrows)
+
+
+def iter_room_statistics(arraysize: Optional[int] = None, prefetchrows: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Stream room occupancy statistics.
+
+    Yields:
+        Dict: Statistics rows shaped like call_get_room_statistics()
+    """
+    return _iter_ref_cursor('get_room_statistics', [], ROOM_STATISTICS_COLUMNS, arraysize, prefetchrows)
+
+
+def iter_available_rooms(room_type: Optional[str] = None, occupancy: Optional[str] = None,
+                         arraysize: Optional[int] = None, prefetchrows: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Stream rooms with available capacity.
+
+    Yields:
+        Dict: Room rows shaped like call_get_available_rooms()
+    """
+    return _iter_ref_cursor('get_available_rooms', [room_type, occupancy], AVAILABLE_ROOM_COLUMNS,
+                            arraysize, prefetchrows)
+
 
 def call_get_all_complaints() -> List[Dict]:
     """
@@ -24,40 +199,13 @@ def call_get_all_complaints() -> List[Dict]:
             - student_email: Email of student
     """
     try:
-        cursor = connection.cursor()
-
-        plsql = """
-            DECLARE
-                complaints_cursor SYS_REFCURSOR;
-            BEGIN
-                get_all_complaints(complaints_cursor);
-                :complaints := complaints_cursor;
-            END;
-        """
-
-        complaints_var = cursor.var(cx_Oracle.CURSOR)
-        cursor.execute(plsql, {'complaints': complaints_var})
-
-        rows = complaints_var.getvalue().fetchall()
-        cursor.close()
-
-        # Convert tuples to dictionaries
-        complaints = []
-        for row in rows:
-            complaints.append({
-                'id': row[0],
-                'description': row[1],
-                'status': row[2],
-                'student_id': row[3],
-                'student_name': row[4],
-                'student_email': row[5],
-            })
+        complaints = list(iter_all_complaints())
 
-        logger.info(f'Fetched {len(complaints)} complaints from database')
+        logger.info('Fetched %s complaints from database', len(complaints))
         return complaints
 
     except Exception as e:
-        logger.error(f'Error calling get_all_complaints: {str(e)}')
+        logger.error('Error calling get_all_complaints: %s', e)
         raise
 
 
@@ -75,39 +223,13 @@ def call_get_complaints_by_student(student_user_id: int) -> List[Dict]:
             - status: Current status
     """
     try:
-        cursor = connection.cursor()
-
-        plsql = """
-            DECLARE
-                complaints_cursor SYS_REFCURSOR;
-            BEGIN
-                get_complaints_by_student(:student_id, complaints_cursor);
-                :complaints := complaints_cursor;
-            END;
-        """
-
-        complaints_var = cursor.var(cx_Oracle.CURSOR)
-        cursor.execute(plsql, {
-            'student_id': student_user_id,
-            'complaints': complaints_var
-        })
-
-        rows = complaints_var.getvalue().fetchall()
-        cursor.close()
-
-        complaints = []
-        for row in rows:
-            complaints.append({
-                'id': row[0],
-                'description': row[1],
-                'status': row[2],
-            })
+        complaints = list(iter_complaints_by_student(student_user_id))
 
-        logger.info(f'Fetched {len(complaints)} complaints for student {student_user_id}')
+        logger.info('Fetched %s complaints for student %s', len(complaints), student_user_id)
         return complaints
 
     except Exception as e:
-        logger.error(f'Error calling get_complaints_by_student: {str(e)}')
+        logger.error('Error calling get_complaints_by_student: %s', e)
         raise
 
 
@@ -122,42 +244,13 @@ def call_get_complaints_by_status(status: str) -> List[Dict]:
         List[Dict]: List of complaint dictionaries
     """
     try:
-        cursor = connection.cursor()
-
-        plsql = """
-            DECLARE
-                complaints_cursor SYS_REFCURSOR;
-            BEGIN
-                get_complaints_by_status(:status, complaints_cursor);
-                :complaints := complaints_cursor;
-            END;
-        """
-
-        complaints_var = cursor.var(cx_Oracle.CURSOR)
-        cursor.execute(plsql, {
-            'status': status,
-            'complaints': complaints_var
-        })
-
-        rows = complaints_var.getvalue().fetchall()
-        cursor.close()
-
-        complaints = []
-        for row in rows:
-            complaints.append({
-                'id': row[0],
-                'description': row[1],
-                'status': row[2],
-                'student_id': row[3],
-                'student_name': row[4],
-                'student_email': row[5],
-            })
+        complaints = list(iter_complaints_by_status(status))
 
-        logger.info(f'Fetched {len(complaints)} complaints with status {status}')
+        logger.info('Fetched %s complaints with status %s', len(complaints), status)
         return complaints
 
     except Exception as e:
-        logger.error(f'Error calling get_complaints_by_status: {str(e)}')
+        logger.error('Error calling get_complaints_by_status: %s', e)
         raise
 
 
@@ -178,42 +271,13 @@ def call_fetch_applications() -> List[Dict]:
             - semester: Applicant's semester
     """
     try:
-        cursor = connection.cursor()
-
-        plsql = """
-            DECLARE
-                applications_cursor SYS_REFCURSOR;
-            BEGIN
-                fetch_applications(applications_cursor);
-                :applications := applications_cursor;
-            END;
-        """
-
-        applications_var = cursor.var(cx_Oracle.CURSOR)
-        cursor.execute(plsql, {'applications': applications_var})
-
-        rows = applications_var.getvalue().fetchall()
-        cursor.close()
-
-        applications = []
-        for row in rows:
-            applications.append({
-                'id': row[0],
-                'room_type': row[1],
-                'occupancy': row[2],
-                'status': row[3],
-                'applicant_user_id': row[4],
-                'student_id': row[5],
-                'applicant_name': row[6],
-                'applicant_email': row[7],
-                'semester': row[8],
-            })
+        applications = list(iter_applications())
 
-        logger.info(f'Fetched {len(applications)} applications from database')
+        logger.info('Fetched %s applications from database', len(applications))
         return applications
 
     except Exception as e:
-        logger.error(f'Error calling fetch_applications: {str(e)}')
+        logger.error('Error calling fetch_applications: %s', e)
         raise
 
 
@@ -228,40 +292,13 @@ def call_get_applications_by_student(student_user_id: int) -> List[Dict]:
         List[Dict]: List of application dictionaries
     """
     try:
-        cursor = connection.cursor()
-
-        plsql = """
-            DECLARE
-                applications_cursor SYS_REFCURSOR;
-            BEGIN
-                get_applications_by_student(:student_id, applications_cursor);
-                :applications := applications_cursor;
-            END;
-        """
-
-        applications_var = cursor.var(cx_Oracle.CURSOR)
-        cursor.execute(plsql, {
-            'student_id': student_user_id,
-            'applications': applications_var
-        })
-
-        rows = applications_var.getvalue().fetchall()
-        cursor.close()
-
-        applications = []
-        for row in rows:
-            applications.append({
-                'id': row[0],
-                'room_type': row[1],
-                'occupancy': row[2],
-                'status': row[3],
-            })
+        applications = list(iter_applications_by_student(student_user_id))
 
-        logger.info(f'Fetched {len(applications)} applications for student {student_user_id}')
+        logger.info('Fetched %s applications for student %s', len(applications), student_user_id)
         return applications
 
     except Exception as e:
-        logger.error(f'Error calling get_applications_by_student: {str(e)}')
+        logger.error('Error calling get_applications_by_student: %s', e)
         raise
 
 
@@ -273,41 +310,13 @@ def call_get_pending_applications() -> List[Dict]:
         List[Dict]: List of pending application dictionaries
     """
     try:
-        cursor = connection.cursor()
-
-        plsql = """
-            DECLARE
-                applications_cursor SYS_REFCURSOR;
-            BEGIN
-                get_pending_applications(applications_cursor);
-                :applications := applications_cursor;
-            END;
-        """
-
-        applications_var = cursor.var(cx_Oracle.CURSOR)
-        cursor.execute(plsql, {'applications': applications_var})
-
-        rows = applications_var.getvalue().fetchall()
-        cursor.close()
-
-        applications = []
-        for row in rows:
-            applications.append({
-                'id': row[0],
-                'room_type': row[1],
-                'occupancy': row[2],
-                'status': row[3],
-                'student_id': row[4],
-                'applicant_name': row[5],
-                'applicant_email': row[6],
-                'semester': row[7],
-            })
+        applications = list(iter_pending_applications())
 
-        logger.info(f'Fetched {len(applications)} pending applications')
+        logger.info('Fetched %s pending applications', len(applications))
         return applications
 
     except Exception as e:
-        logger.error(f'Error calling get_pending_applications: {str(e)}')
+        logger.error('Error calling get_pending_applications: %s', e)
         raise
 
 
@@ -323,26 +332,23 @@ def call_approve_application(application_id: int, room_id: int) -> bool:
         bool: True if successful, False otherwise
     """
     try:
-        cursor = connection.cursor()
-
-        plsql = """
-            BEGIN
-                approve_application(:app_id, :room_id);
-            END;
-        """
-
-        cursor.execute(plsql, {
-            'app_id': application_id,
-            'room_id': room_id
-        })
-
-        cursor.close()
+        with _cursor() as cursor:
+            plsql = """
+                BEGIN
+                    approve_application(:app_id, :room_id);
+                END;
+            """
+
+            cursor.execute(plsql, {
+                'app_id': application_id,
+                'room_id': room_id
+            })
 
-        logger.info(f'Approved application {application_id} and allocated room {room_id}')
+        logger.info('Approved application %s and allocated room %s', application_id, room_id)
         return True
 
     except Exception as e:
-        logger.error(f'Error calling approve_application: {str(e)}')
+        logger.error('Error calling approve_application: %s', e)
         raise
 
 
@@ -358,26 +364,66 @@ def call_update_complaint_status(complaint_id: int, status: str) -> bool:
         bool: True if successful, False otherwise
     """
     try:
-        cursor = connection.cursor()
+        with _cursor() as cursor:
+            plsql = """
+                BEGIN
+                    update_complaint_status(:comp_id, :status);
+                END;
+            """
+
+            cursor.execute(plsql, {
+                'comp_id': complaint_id,
+                'status': status
+            })
 
-        plsql = """
-            BEGIN
-                update_complaint_status(:comp_id, :status);
-            END;
-        """
+        logger.info('Updated complaint %s status to %s', complaint_id, status)
+        return True
 
-        cursor.execute(plsql, {
-            'comp_id': complaint_id,
-            'status': status
-        })
+    except Exception as e:
+        logger.error('Error calling update_complaint_status: %s', e)
+        raise
 
-        cursor.close()
 
-        logger.info(f'Updated complaint {complaint_id} status to {status}')
-        return True
+def call_transition_complaints(complaint_ids: Optional[List[int]], from_statuses: List[str], to_status: str,
+                               changed_by_id: Optional[int] = None) -> List[int]:
+    """
+    Move complaints from any of ``from_statuses`` to another status in one call.
+
+    The selected ids are bound as a single PL/SQL associative array, and
+    moving every complaint binds no ids at all. The procedures do not
+    commit and run on Django's connection rather than a pooled session, so
+    the caller's transaction covers every source status.
+
+    Args:
+        complaint_ids: IDs of the complaints to move; None moves every
+            complaint in one of ``from_statuses``
+        from_statuses: Statuses the complaints may currently be in, moved in order
+        to_status: New status (In Progress, Resolved)
+        changed_by_id: Admin user ID recorded on the audit rows
+
+    Returns:
+        List[int]: Number of complaints moved from each of ``from_statuses``
+    """
+    try:
+        with connection.cursor() as cursor:
+            statuses_var = cursor.arrayvar(cx_Oracle.STRING, list(from_statuses))
+            counts_var = cursor.arrayvar(cx_Oracle.NUMBER, len(from_statuses))
+            if complaint_ids is None:
+                cursor.callproc('complaint_triage.transition_all_complaints', [
+                    statuses_var, to_status, changed_by_id, counts_var,
+                ])
+            else:
+                cursor.callproc('complaint_triage.transition_complaints', [
+                    cursor.arrayvar(cx_Oracle.NUMBER, list(complaint_ids)),
+                    statuses_var, to_status, changed_by_id, counts_var,
+                ])
+            moved = [int(count) for count in counts_var.getvalue()]
+
+        logger.info('Moved %s complaints from %s to %s', moved, from_statuses, to_status)
+        return moved
 
     except Exception as e:
-        logger.error(f'Error calling update_complaint_status: {str(e)}')
+        logger.error('Error calling complaint_triage: %s', e)
         raise
 
 
@@ -395,24 +441,23 @@ def call_get_dashboard_stats() -> Dict:
             - resolved_complaints: Number of resolved complaints
             - approved_applications: Number of approved applications
             - students_with_rooms: Number of students with allocated rooms
+            - hostel_count: Total number of hostels
     """
     try:
-        cursor = connection.cursor()
-
-        plsql = """
-            DECLARE
-                stats_cursor SYS_REFCURSOR;
-            BEGIN
-                get_dashboard_stats(stats_cursor);
-                :stats := stats_cursor;
-            END;
-        """
+        with _cursor() as cursor:
+            plsql = """
+                DECLARE
+                    stats_cursor SYS_REFCURSOR;
+                BEGIN
+                    get_dashboard_stats(stats_cursor);
+                    :stats := stats_cursor;
+                END;
+            """
 
-        stats_var = cursor.var(cx_Oracle.CURSOR)
-        cursor.execute(plsql, {'stats': stats_var})
+            stats_var = cursor.var(cx_Oracle.CURSOR)
+            cursor.execute(plsql, {'stats': stats_var})
 
-        row = stats_var.getvalue().fetchone()
-        cursor.close()
+            row = stats_var.getvalue().fetchone()
 
         if row:
             stats = {
@@ -424,6 +469,7 @@ def call_get_dashboard_stats() -> Dict:
                 'resolved_complaints': row[5] or 0,
                 'approved_applications': row[6] or 0,
                 'students_with_rooms': row[7] or 0,
+                'hostel_count': row[8] or 0,
             }
 
             logger.info('Fetched dashboard statistics')
@@ -433,7 +479,7 @@ def call_get_dashboard_stats() -> Dict:
             return {}
 
     except Exception as e:
-        logger.error(f'Error calling get_dashboard_stats: {str(e)}')
+        logger.error('Error calling get_dashboard_stats: %s', e)
         raise
 
 
@@ -445,38 +491,13 @@ def call_get_room_statistics() -> List[Dict]:
         List[Dict]: List of room statistics by type and occupancy
     """
     try:
-        cursor = connection.cursor()
-
-        plsql = """
-            DECLARE
-                stats_cursor SYS_REFCURSOR;
-            BEGIN
-                get_room_statistics(stats_cursor);
-                :stats := stats_cursor;
-            END;
-        """
-
-        stats_var = cursor.var(cx_Oracle.CURSOR)
-        cursor.execute(plsql, {'stats': stats_var})
-
-        rows = stats_var.getvalue().fetchall()
-        cursor.close()
-
-        statistics = []
-        for row in rows:
-            statistics.append({
-                'room_type': row[0],
-                'occupancy': row[1],
-                'total_rooms': row[2],
-                'occupied_beds': row[3],
-                'total_capacity': row[4],
-            })
+        statistics = list(iter_room_statistics())
 
-        logger.info(f'Fetched room statistics for {len(statistics)} categories')
+        logger.info('Fetched room statistics for %s categories', len(statistics))
         return statistics
 
     except Exception as e:
-        logger.error(f'Error calling get_room_statistics: {str(e)}')
+        logger.error('Error calling get_room_statistics: %s', e)
         raise
 
 
@@ -493,44 +514,11 @@ def call_get_available_rooms(room_type: Optional[str] = None,
         List[Dict]: List of available rooms
     """
     try:
-        cursor = connection.cursor()
-
-        plsql = """
-            DECLARE
-                rooms_cursor SYS_REFCURSOR;
-            BEGIN
-                get_available_rooms(:room_type, :occupancy, rooms_cursor);
-                :rooms := rooms_cursor;
-            END;
-        """
-
-        rooms_var = cursor.var(cx_Oracle.CURSOR)
-        cursor.execute(plsql, {
-            'room_type': room_type,
-            'occupancy': occupancy,
-            'rooms': rooms_var
-        })
-
-        rows = rooms_var.getvalue().fetchall()
-        cursor.close()
-
-        rooms = []
-        for row in rows:
-            rooms.append({
-                'id': row[0],
-                'number': row[1],
-                'room_type': row[2],
-                'occupancy': row[3],
-                'current_occupants': row[4],
-                'max_capacity': row[5],
-                'floor_number': row[6],
-                'wing_name': row[7],
-                'hostel_name': row[8],
-            })
+        rooms = list(iter_available_rooms(room_type, occupancy))
 
-        logger.info(f'Fetched {len(rooms)} available rooms')
+        logger.info('Fetched %s available rooms', len(rooms))
         return rooms
 
     except Exception as e:
-        logger.error(f'Error calling get_available_rooms: {str(e)}')
+        logger.error('Error calling get_available_rooms: %s', e)
         raise
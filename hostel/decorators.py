@@ -2,16 +2,41 @@
 Custom authentication and authorization decorators for HostelMS.
 """
 from functools import wraps
+from asgiref.sync import iscoroutinefunction
 from django.contrib import messages
 from django.shortcuts import redirect
 from django.contrib.auth.decorators import login_required
+from django.contrib.auth.views import redirect_to_login
+
+
+def _async_role_required(view_func, role, message):
+    """
+    Async counterpart of login_required plus a role check.
+
+    Loads the user with request.auser() and stores it on request.user, so
+    the view and the templates can read it without a synchronous query.
+    """
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        if not getattr(request.user, role, False):
+            messages.error(request, message)
+            return redirect('homepage')
+        return await view_func(request, *args, **kwargs)
+    return wrapper
 
 
 def student_required(view_func):
     """
     Decorator that ensures the user is authenticated and is a student.
     Redirects to login if not authenticated, or homepage if not a student.
+    Works on both sync and async views.
     """
+    if iscoroutinefunction(view_func):
+        return _async_role_required(view_func, 'is_student', 'This page is only accessible to students.')
+
     @wraps(view_func)
     @login_required
     def wrapper(request, *args, **kwargs):
@@ -26,7 +51,11 @@ def admin_required(view_func):
     """
     Decorator that ensures the user is authenticated and is an admin.
     Redirects to login if not authenticated, or homepage if not an admin.
+    Works on both sync and async views.
     """
+    if iscoroutinefunction(view_func):
+        return _async_role_required(view_func, 'is_admin', 'This page is only accessible to administrators.')
+
     @wraps(view_func)
     @login_required
     def wrapper(request, *args, **kwargs):
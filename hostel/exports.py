@@ -0,0 +1,115 @@
+"""
+Streaming bulk exports for HostelMS.
+
+Rows are streamed from the repository (QuerySet.iterator() or a REF CURSOR
+read in fetch batches) and encoded one at a time, so memory use stays flat
+regardless of table size. Complaint and application rows use the same keys
+as db_utils.call_get_all_complaints / call_fetch_applications.
+
+CSV cells are opened by spreadsheets, and complaint descriptions are
+written by students, so text that a spreadsheet would run as a formula is
+prefixed with a quote.
+"""
+import csv
+import json
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from . import repository
+from .models import Room
+
+DEFAULT_CHUNK_SIZE = 2000
+
+FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+RESIDENT_COLUMNS = [
+    'room_id', 'room_number', 'room_type', 'occupancy', 'floor_number', 'wing_name',
+    'hostel_name', 'student_id', 'student_name', 'student_email', 'semester',
+]
+
+
+def resident_rows(chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict]:
+    """Room residents with their room location, in residents table order."""
+    rows = (
+        Room.residents.through.objects
+        .order_by('id')
+        .values_list(
+            'room_id', 'room__number', 'room__room_type', 'room__occupancy', 'room__floor__number',
+            'room__floor__wing__name', 'room__floor__wing__hostel__name', 'student__student_id',
+            'student__name', 'student__email', 'student__semester',
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+    for row in rows:
+        yield dict(zip(RESIDENT_COLUMNS, row))
+
+
+DATASETS: Dict[str, Tuple[List[str], Callable[..., Iterator[Dict]]]] = {
+    'complaints': (
+        ['id', 'description', 'status', 'student_id', 'student_name', 'student_email'],
+        lambda chunk_size: repository.complaints(chunk_size=chunk_size),
+    ),
+    'applications': (
+        ['id', 'room_type', 'occupancy', 'status', 'applicant_user_id', 'student_id',
+         'applicant_name', 'applicant_email', 'semester'],
+        lambda chunk_size: repository.applications(chunk_size=chunk_size),
+    ),
+    'residents': (
+        RESIDENT_COLUMNS,
+        resident_rows,
+    ),
+}
+
+
+# Leading characters that make a spreadsheet evaluate a cell (OWASP CSV injection)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def csv_safe(row: Dict) -> Dict:
+    """Prefix text cells that a spreadsheet would read as a formula with a quote."""
+    return {
+        key: f"'{value}" if isinstance(value, str) and value.startswith(FORMULA_PREFIXES) else value
+        for key, value in row.items()
+    }
+
+
+class _Echo:
+    """File-like object whose write() hands the line straight back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def stream_export(dataset: str, fmt: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Encode a dataset line by line.
+
+    The CSV header is produced before the query runs, so a streaming
+    response sends its first bytes immediately.
+
+    Args:
+        dataset: One of DATASETS
+        fmt: One of FORMATS
+        chunk_size: Rows fetched from the database per round trip
+
+    Returns:
+        Iterator[str]: Encoded lines, each ending with a newline
+    """
+    if dataset not in DATASETS:
+        raise ValueError(f'Unknown export dataset: {dataset}')
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown export format: {fmt}')
+
+    fields, rows = DATASETS[dataset]
+
+    if fmt == 'csv':
+        writer = csv.DictWriter(_Echo(), fieldnames=fields)
+        yield writer.writeheader()
+        for row in rows(chunk_size):
+            yield writer.writerow(csv_safe(row))
+    else:
+        for row in rows(chunk_size):
+            yield json.dumps(row, default=str) + '\n'
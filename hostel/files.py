@@ -0,0 +1,151 @@
+"""
+File download helpers for HostelMS.
+
+Serves files from disk with stat-based validators (ETag/Last-Modified),
+304 Not Modified responses, single HTTP byte ranges, and an optional
+X-Sendfile / X-Accel-Redirect mode that leaves the byte copying to the
+front-end web server.
+"""
+import os
+import re
+from typing import Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+BLOCK_SIZE = 64 * 1024
+
+
+def _file_etag(stat: os.stat_result) -> str:
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def _not_modified(request, etag: str, mtime: int) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since."""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag in etags or f'W/{etag}' in etags
+
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return if_modified_since is not None and mtime <= if_modified_since
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range into an inclusive (start, end) pair.
+
+    Returns None for malformed or multi-range headers, which are answered
+    with the full file, and raises ValueError when the range cannot be
+    satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('Empty suffix range')
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+
+def _read_range(path: str, start: int, length: int) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(BLOCK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _sendfile_response(path: str) -> Optional[HttpResponse]:
+    """Build an empty response that asks the web server to send ``path``."""
+    backend = settings.SENDFILE_BACKEND
+    if backend == 'x-sendfile':
+        response = HttpResponse()
+        response['X-Sendfile'] = path
+        return response
+    if backend == 'x-accel-redirect':
+        relative = os.path.relpath(path, settings.SENDFILE_ROOT).replace(os.sep, '/')
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = settings.SENDFILE_URL.rstrip('/') + '/' + relative
+        return response
+    return None
+
+
+def serve_file(request, path: str, content_type: str, filename: Optional[str] = None) -> HttpResponse:
+    """
+    Serve a file from disk with conditional GET and Range support.
+
+    Args:
+        request: The current HttpRequest
+        path: Absolute path of the file to send
+        content_type: MIME type of the file
+        filename: Download name for the Content-Disposition header
+
+    Returns:
+        HttpResponse: 200, 206, 304 or 416 response
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    stat = os.stat(path)
+    etag = _file_etag(stat)
+    mtime = int(stat.st_mtime)
+    last_modified = http_date(mtime)
+
+    if _not_modified(request, etag, mtime):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+        return response
+
+    response = _sendfile_response(path)
+
+    if response is None:
+        byte_range = None
+        range_header = request.META.get('HTTP_RANGE')
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if range_header and (not if_range or if_range in (etag, last_modified)):
+            try:
+                byte_range = _parse_range(range_header, stat.st_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{stat.st_size}'
+                return response
+
+        if byte_range:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(_read_range(path, start, length), status=206)
+            response['Content-Length'] = str(length)
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        else:
+            response = FileResponse(open(path, 'rb'))
+            response['Content-Length'] = str(stat.st_size)
+
+    response['Content-Type'] = content_type
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    # Only the student's browser may keep a copy, and it must revalidate
+    response['Cache-Control'] = 'private, no-cache'
+    if filename:
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,69 @@
+"""
+Template fragment caching for the complaint and application lists.
+
+Each table row is cached with {% cache %} under its fragment name and the
+row's (id, status), so a status change, including the set-based updates
+of bulk triage and room allocation, renders a fresh row on its own. Edits
+that keep the status (a description, or the student's name) are handled
+by the signal handlers, which drop the affected rows' fragments.
+
+The lists that render these rows read from the primary. A lagging replica
+could otherwise re-cache a row from before a change whose fragment was
+just dropped, and serve it for LIST_ROW_CACHE_TIMEOUT.
+"""
+from typing import Iterable, List, Tuple
+
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+
+# Must match the fragment names used in the templates
+COMPLAINT_ROW = 'complaint_row'
+APPLICATION_ROW = 'application_row'
+
+
+def row_key(fragment_name: str, pk, status) -> str:
+    """Cache key of one row fragment, as built by the {% cache %} tag."""
+    return make_template_fragment_key(fragment_name, [pk, status])
+
+
+def invalidate_rows(fragment_name: str, rows: Iterable[Tuple]) -> None:
+    """
+    Drop cached row fragments.
+
+    Args:
+        fragment_name: COMPLAINT_ROW or APPLICATION_ROW
+        rows: (id, status) pairs of the rows to drop
+    """
+    keys = [row_key(fragment_name, pk, status) for pk, status in set(rows)]
+    if keys:
+        cache.delete_many(keys)
+
+
+def complaint_rows(complaint_ids: Iterable) -> List[Tuple]:
+    """(id, status) pairs of these complaints under every status, since a row may be cached under an old one."""
+    from .models import Complaint
+
+    return [(pk, status) for pk in complaint_ids for status, _ in Complaint.STATUS_CHOICES]
+
+
+def application_rows(application_ids: Iterable) -> List[Tuple]:
+    """(id, status) pairs of these applications under both statuses."""
+    return [(pk, status) for pk in application_ids for status in (False, True)]
+
+
+def invalidate_rows_on_commit(fragment_name: str, rows: Iterable[Tuple], using) -> None:
+    """Drop cached row fragments once the current transaction commits."""
+    rows = list(rows)
+    if rows:
+        transaction.on_commit(lambda: invalidate_rows(fragment_name, rows), using=using)
+
+
+def student_rows_changed(student, using) -> None:
+    """Drop the complaint and application rows of a student whose ID or name changed."""
+    from .models import Application, Complaint
+
+    complaint_ids = Complaint.objects.using(using).filter(student=student).values_list('pk', flat=True)
+    invalidate_rows_on_commit(COMPLAINT_ROW, complaint_rows(complaint_ids), using)
+    application_ids = Application.objects.using(using).filter(applicant=student).values_list('pk', flat=True)
+    invalidate_rows_on_commit(APPLICATION_ROW, application_rows(application_ids), using)
@@ -0,0 +1,175 @@
+"""
+Hostel hierarchy tree for HostelMS.
+
+Serializes the Hostel -> Wing -> Floor -> Room -> residents hierarchy as
+JSON. A tree is loaded with one query per level (hostels, wings, floors,
+rooms, residents) through prefetch_related, however many rooms there are,
+and each hostel's tree is encoded once and cached under its own key.
+The handlers below (dispatched from hostel.signals) and the bed recount
+drop a hostel's entry whenever its rooms, residents or layout change.
+"""
+import json
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_PREFIX = 'hostel_tree:'
+
+# Each level's link to its parent, by model name
+TREE_PARENTS = {'room': 'floor_id', 'floor': 'wing_id', 'wing': 'hostel_id'}
+
+
+def _cache_key(hostel_id) -> str:
+    return f'{CACHE_PREFIX}{hostel_id}'
+
+
+def invalidate_hostel_trees(hostel_ids: Iterable) -> None:
+    """Drop the cached trees of these hostels."""
+    keys = [_cache_key(hostel_id) for hostel_id in set(hostel_ids) if hostel_id is not None]
+    if keys:
+        cache.delete_many(keys)
+
+
+def invalidate_hostel_trees_on_commit(hostel_ids: Iterable, using) -> None:
+    """Drop the cached trees of these hostels once the current transaction commits."""
+    hostel_ids = [hostel_id for hostel_id in hostel_ids if hostel_id is not None]
+    if hostel_ids:
+        transaction.on_commit(lambda: invalidate_hostel_trees(hostel_ids), using=using)
+
+
+def parent_hostel_ids(model_name: str, parent_ids: Iterable, using) -> Set[int]:
+    """
+    Hostels containing these parents of a tree node.
+
+    Args:
+        model_name: Node model, a TREE_PARENTS key
+        parent_ids: Values of the node's TREE_PARENTS field
+        using: Database alias to read from
+    """
+    from .models import Floor, Wing
+
+    parent_ids = set(parent_ids) - {None}
+    if not parent_ids:
+        return set()
+    if model_name == 'room':
+        return set(Floor.objects.using(using).filter(pk__in=parent_ids).values_list('wing__hostel_id', flat=True))
+    if model_name == 'floor':
+        return set(Wing.objects.using(using).filter(pk__in=parent_ids).values_list('hostel_id', flat=True))
+    return parent_ids
+
+
+def tree_node_changed(node, old_parent_id, using) -> None:
+    """
+    A wing, floor or room was saved or deleted: drop its hostel's tree.
+
+    Args:
+        node: The Wing, Floor or Room
+        old_parent_id: Parent it was loaded with, so a move drops both hostels' trees
+        using: Database alias of the transaction
+    """
+    model_name = node._meta.model_name
+    parent_ids = {old_parent_id, getattr(node, TREE_PARENTS[model_name])}
+    invalidate_hostel_trees_on_commit(parent_hostel_ids(model_name, parent_ids, using), using)
+
+
+def resident_changed(student, using) -> None:
+    """Drop the trees that list this student, e.g. after a rename."""
+    from .models import Hostel
+
+    invalidate_hostel_trees_on_commit(
+        Hostel.objects.using(using).filter(wings__floors__rooms__residents=student).values_list('pk', flat=True),
+        using,
+    )
+
+
+def load_hostel_trees(hostel_ids: Optional[Iterable[int]] = None) -> List[Dict]:
+    """
+    Load hostel trees from the database in five queries.
+
+    Args:
+        hostel_ids: Only load these hostels (default: all)
+
+    Returns:
+        List[Dict]: One nested dict per hostel, ordered by id
+    """
+    from django.db.models import Prefetch
+
+    from user.models import Student
+    from .models import Hostel, Wing, Floor, Room
+
+    hostels = Hostel.objects.only('id', 'name', 'address', 'type').order_by('id').prefetch_related(
+        Prefetch('wings', queryset=Wing.objects.only('id', 'name', 'hostel_id').order_by('name', 'id')),
+        Prefetch('wings__floors', queryset=Floor.objects.only('id', 'number', 'wing_id').order_by('number', 'id')),
+        Prefetch('wings__floors__rooms', queryset=Room.objects.only(
+            'id', 'number', 'room_type', 'occupancy', 'capacity', 'occupied_beds', 'floor_id',
+        ).order_by('number', 'id')),
+        Prefetch('wings__floors__rooms__residents', queryset=Student.objects.only(
+            'user', 'student_id', 'name',
+        ).order_by('student_id')),
+    )
+    if hostel_ids is not None:
+        hostels = hostels.filter(pk__in=list(hostel_ids))
+
+    return [
+        {
+            'id': hostel.id,
+            'name': hostel.name,
+            'address': hostel.address,
+            'type': hostel.type,
+            'wings': [
+                {
+                    'id': wing.id,
+                    'name': wing.name,
+                    'floors': [
+                        {
+                            'id': floor.id,
+                            'number': floor.number,
+                            'rooms': [
+                                {
+                                    'id': room.id,
+                                    'number': room.number,
+                                    'room_type': room.room_type,
+                                    'occupancy': room.occupancy,
+                                    'capacity': room.capacity,
+                                    'occupied_beds': room.occupied_beds,
+                                    'residents': [
+                                        {'student_id': student.student_id, 'name': student.name}
+                                        for student in room.residents.all()
+                                    ],
+                                }
+                                for room in floor.rooms.all()
+                            ],
+                        }
+                        for floor in wing.floors.all()
+                    ],
+                }
+                for wing in hostel.wings.all()
+            ],
+        }
+        for hostel in hostels
+    ]
+
+
+def get_hostel_tree_json(hostel_ids: List[int]) -> List[str]:
+    """
+    Return the JSON-encoded trees of these hostels, loading the misses together.
+
+    Args:
+        hostel_ids: Hostels to return, in order
+
+    Returns:
+        List[str]: One encoded tree per hostel that exists, in the order given
+    """
+    keys = {hostel_id: _cache_key(hostel_id) for hostel_id in hostel_ids}
+    cached = cache.get_many(list(keys.values()))
+
+    missing = [hostel_id for hostel_id, key in keys.items() if key not in cached]
+    if missing:
+        loaded = {_cache_key(tree['id']): json.dumps(tree) for tree in load_hostel_trees(missing)}
+        if loaded:
+            cache.set_many(loaded, settings.HOSTEL_TREE_TIMEOUT)
+        cached.update(loaded)
+
+    return [cached[key] for key in keys.values() if key in cached]
@@ -0,0 +1,105 @@
+"""
+Logging pipeline for HostelMS.
+
+configure_logging() is installed as settings.LOGGING_CONFIG. It applies
+settings.LOGGING as usual and, with LOG_QUEUED on, moves the configured
+handlers behind a QueueHandler/QueueListener pair: request threads only
+put the record on an in-memory queue, and a background thread formats it
+and does the file and console I/O.
+"""
+import atexit
+import logging
+import logging.config
+import os
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List
+
+from django.conf import settings
+
+_listeners: List[QueueListener] = []
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The stock prepare() merges msg % args on the calling thread; here the
+    record is queued as is, so log arguments should be values that are not
+    mutated afterwards (strings, numbers, exceptions).
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Pass a random share of INFO-and-below records; warnings always pass.
+
+    Attach to a logger carrying high-volume events, e.g. hostel.access.
+
+    Args:
+        rate: Share of records to keep, between 0 and 1
+    """
+
+    def __init__(self, rate: float = 1.0, name: str = ''):
+        super().__init__(name)
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+def _make_log_dirs(config: Dict) -> None:
+    for handler in config.get('handlers', {}).values():
+        directory = os.path.dirname(handler.get('filename', ''))
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+
+def _queue_handlers(logger_names: List[str]) -> None:
+    """Replace each logger's handlers with one queue per distinct handler set."""
+    queues: Dict[tuple, QueueHandler] = {}
+    for name in logger_names:
+        logger = logging.getLogger(name)
+        handlers = tuple(logger.handlers)
+        if not handlers:
+            continue
+        if handlers not in queues:
+            log_queue = queue.SimpleQueue()
+            listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            listener.start()
+            _listeners.append(listener)
+            queues[handlers] = DeferredQueueHandler(log_queue)
+        logger.handlers = [queues[handlers]]
+
+
+def stop_listeners() -> None:
+    """Flush queued records and stop the listener threads."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def configure_logging(logging_settings: Dict) -> None:
+    """
+    LOGGING_CONFIG callable: dictConfig plus the optional queue pipeline.
+
+    Args:
+        logging_settings: settings.LOGGING
+    """
+    if not logging_settings:
+        return
+
+    _make_log_dirs(logging_settings)
+    logging.config.dictConfig(logging_settings)
+
+    if getattr(settings, 'LOG_QUEUED', False):
+        stop_listeners()
+        _queue_handlers([''] + list(logging_settings.get('loggers', {})))
+
+
+atexit.register(stop_listeners)
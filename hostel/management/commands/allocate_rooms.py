@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from hostel.allocation import DEFAULT_CHUNK_SIZE, allocate_pending_applications
+
+
+class Command(BaseCommand):
+    help = 'Allocate rooms to all pending applications in one batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Allocations committed per transaction (default: {DEFAULT_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Match applications to rooms without saving anything',
+        )
+
+    def handle(self, *args, **options):
+        result = allocate_pending_applications(
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+        )
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run: no changes saved'))
+
+        self.stdout.write(self.style.SUCCESS(f"[OK] {result['allocated']} applications allocated a room"))
+        if result['unmatched']:
+            self.stdout.write(self.style.WARNING(f"{result['unmatched']} applications have no matching free bed"))
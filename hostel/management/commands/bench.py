@@ -0,0 +1,294 @@
+"""
+End-to-end benchmark for every HostelMS view.
+
+Builds a throwaway test database, seeds it at the requested scale with
+hostel.sample_data, then drives each URL in hostel/urls.py and user/urls.py
+through the Django test client as a logged-in student or admin. Reports p50/p95/p99 latency, SQL
+query count and peak Python memory per view, optionally as JSON so runs
+can be diffed between releases.
+
+Usage:
+    python manage.py bench --scale 10 --iterations 50 --output bench.json
+    python manage.py bench --compare bench.json
+"""
+import json
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import django
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import URLPattern, get_resolver, reverse
+
+from user.models import Student, Admin
+from hostel import sample_data
+from hostel.hierarchy import invalidate_hostel_trees
+from hostel.models import Hostel
+
+BENCH_URLCONFS = ('hostel.urls', 'user.urls')
+
+
+@dataclass
+class BenchCase:
+    """One view request: who makes it and how."""
+    name: str
+    url_name: str
+    role: str  # 'anonymous', 'student', 'new_student' (no application yet) or 'admin'
+    method: str = 'get'
+    kwargs: Dict = field(default_factory=dict)
+    query: Dict = field(default_factory=dict)
+    data: Callable[[int], Dict] = None
+    relogin: bool = False
+    revalidate: bool = False  # send the previous response's ETag as If-None-Match
+    prepare: Callable[[], None] = None  # run untimed before each request
+
+
+# Every named URL in BENCH_URLCONFS must appear here at least once; the
+# command reports any that are missing so new views are not silently skipped.
+CASES: List[BenchCase] = [
+    # user/urls.py
+    BenchCase('homepage:student', 'homepage', 'student'),
+    BenchCase('homepage:admin', 'homepage', 'admin'),
+    BenchCase('signup:get', 'signup', 'anonymous'),
+    BenchCase('login:get', 'login', 'anonymous'),
+    BenchCase('logout', 'logout', 'student', relogin=True),
+
+    # hostel/urls.py, student views
+    BenchCase('student_dashboard', 'student_dashboard', 'student'),
+    BenchCase('lodge_complaint:get', 'lodge_complaint', 'student'),
+    BenchCase('lodge_complaint:post', 'lodge_complaint', 'student', method='post',
+              data=lambda i: {'description': f'Benchmark complaint {i}'}),
+    BenchCase('download_voucher', 'download_voucher', 'student'),
+    BenchCase('apply_room:get', 'apply_room', 'new_student'),
+
+    # hostel/urls.py, admin views
+    BenchCase('admin_dashboard', 'admin_dashboard', 'admin'),
+    BenchCase('dashboard_stats', 'dashboard_stats', 'admin'),
+    BenchCase('dashboard_stats:304', 'dashboard_stats', 'admin', revalidate=True),
+    BenchCase('dashboard_charts', 'dashboard_charts', 'admin'),
+    BenchCase('dashboard_charts:304', 'dashboard_charts', 'admin', revalidate=True),
+    BenchCase('fetch_complaints', 'fetch_complaints', 'admin'),
+    BenchCase('fetch_complaints:pending', 'fetch_complaints', 'admin', query={'status': 'Pending'}),
+    BenchCase('fetch_complaints:search', 'fetch_complaints', 'admin', query={'q': 'leaking tap'}),
+    BenchCase('search_complaints', 'search_complaints', 'admin', query={'q': 'water supply', 'status': 'Pending'}),
+    # 50 different complaints per request, so every run moves real rows
+    BenchCase('triage_complaints', 'triage_complaints', 'admin', method='post',
+              data=lambda i: {'status': 'Resolved', 'complaint_ids': range(i * 50 + 1, i * 50 + 51)}),
+    BenchCase('fetch_applications', 'fetch_applications', 'admin'),
+    BenchCase('fetch_applications:pending', 'fetch_applications', 'admin', query={'status': 'pending'}),
+    BenchCase('export_data:complaints', 'export_data', 'admin', kwargs={'dataset': 'complaints'}),
+    BenchCase('hostel_tree', 'hostel_tree', 'admin'),
+    BenchCase('hostel_tree:uncached', 'hostel_tree', 'admin',
+              prepare=lambda: invalidate_hostel_trees(Hostel.objects.values_list('pk', flat=True))),
+    BenchCase('hostel_tree_detail', 'hostel_tree_detail', 'admin', kwargs={'hostel_id': 1}),
+    BenchCase('export_data:residents', 'export_data', 'admin', kwargs={'dataset': 'residents'},
+              query={'format': 'jsonl'}),
+
+    # hostel/urls.py, async variants (run through the test client's WSGI handler)
+    BenchCase('async_student_dashboard', 'async_student_dashboard', 'student'),
+    BenchCase('async_admin_dashboard', 'async_admin_dashboard', 'admin'),
+    BenchCase('async_fetch_complaints', 'async_fetch_complaints', 'admin'),
+    BenchCase('async_fetch_applications', 'async_fetch_applications', 'admin'),
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def uncovered_url_names() -> List[str]:
+    """Named routes in BENCH_URLCONFS that have no BenchCase."""
+    covered = {case.url_name for case in CASES}
+    names = []
+    for urlconf in BENCH_URLCONFS:
+        for pattern in get_resolver(urlconf).url_patterns:
+            if isinstance(pattern, URLPattern) and pattern.name and pattern.name not in covered:
+                names.append(pattern.name)
+    return names
+
+
+class Command(BaseCommand):
+    help = 'Benchmark every HostelMS view against a seeded test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1,
+                            help='Scale factor; each unit adds 1 hostel, 500 rooms and 1000 students')
+        parser.add_argument('--iterations', type=int, default=30, help='Timed requests per view')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests per view before timing')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the generated data')
+        parser.add_argument('--only', action='append', default=[],
+                            help='Only run cases whose name starts with this prefix (repeatable)')
+        parser.add_argument('--output', help='Write results as JSON to this file')
+        parser.add_argument('--compare', help='Print the change against a previous JSON result')
+
+    def handle(self, *args, **options):
+        if options['scale'] < 1 or options['iterations'] < 1:
+            raise CommandError('--scale and --iterations must be at least 1')
+
+        missing = uncovered_url_names()
+        if missing:
+            self.stdout.write(self.style.WARNING(f"No benchmark case for: {', '.join(missing)}"))
+
+        cases = [
+            case for case in CASES
+            if not options['only'] or any(case.name.startswith(prefix) for prefix in options['only'])
+        ]
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        # A configured replica mirrors 'default' in tests, so its reads stay on the benchmark database
+        for alias in connections:
+            if connections[alias].settings_dict.get('TEST', {}).get('MIRROR') == DEFAULT_DB_ALIAS:
+                connections[alias].creation.set_as_test_mirror(connection.settings_dict)
+        try:
+            started = time.perf_counter()
+            sample_data.generate(options['scale'], seed=options['seed'])
+            cache.clear()
+            self.stdout.write(f"Seeded scale {options['scale']} in {time.perf_counter() - started:.1f}s")
+
+            results = {case.name: self.run_case(case, options['iterations'], options['warmup']) for case in cases}
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'meta': {
+                'scale': options['scale'],
+                'iterations': options['iterations'],
+                'seed': options['seed'],
+                'database': connection.vendor,
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            },
+            'views': results,
+        }
+
+        self.print_table(results)
+        if options['compare']:
+            self.print_comparison(results, options['compare'])
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def login(self, client: Client, role: str) -> None:
+        if role == 'student':
+            # A student with an application, a room and complaints
+            client.force_login(Student.objects.filter(application_status=True).order_by('pk').first().user)
+        elif role == 'new_student':
+            client.force_login(
+                Student.objects.filter(application__isnull=True).order_by('pk').first().user
+            )
+        elif role == 'admin':
+            client.force_login(Admin.objects.order_by('pk').first().user)
+
+    def request(self, client: Client, case: BenchCase, url: str, i: int):
+        if case.method == 'post':
+            response = client.post(url, case.data(i) if case.data else {})
+        else:
+            headers = {}
+            if case.revalidate and getattr(client, 'etag', None):
+                headers['If-None-Match'] = client.etag
+            response = client.get(url, case.query, headers=headers)
+            if case.revalidate and response.has_header('ETag'):
+                client.etag = response['ETag']
+        if response.streaming:
+            # Exports and downloads only do their work when consumed
+            b''.join(response.streaming_content)
+        return response
+
+    def run_case(self, case: BenchCase, iterations: int, warmup: int) -> Dict:
+        client = Client()
+        self.login(client, case.role)
+        url = reverse(case.url_name, kwargs=case.kwargs)
+
+        for i in range(warmup):
+            if case.relogin:
+                self.login(client, case.role)
+            if case.prepare:
+                case.prepare()
+            self.request(client, case, url, i)
+
+        timings = []
+        queries = []
+        status = None
+        for i in range(iterations):
+            if case.relogin:
+                self.login(client, case.role)
+            if case.prepare:
+                case.prepare()
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                response = self.request(client, case, url, warmup + i)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(ctx.captured_queries))
+            status = response.status_code
+
+        # Separate pass so tracemalloc's overhead does not skew the timings
+        if case.relogin:
+            self.login(client, case.role)
+        if case.prepare:
+            case.prepare()
+        tracemalloc.start()
+        try:
+            self.request(client, case, url, warmup + iterations)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'url': url,
+            'role': case.role,
+            'method': case.method.upper(),
+            'status': status,
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'p99_ms': round(percentile(timings, 99), 3),
+            'mean_ms': round(sum(timings) / len(timings), 3),
+            'queries': max(queries),
+            'peak_kb': round(peak / 1024, 1),
+        }
+
+    def print_table(self, results: Dict) -> None:
+        header = f"{'view':<30} {'status':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'peak KB':>9}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, row in results.items():
+            self.stdout.write(
+                f"{name:<30} {row['status']:>6} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+                f"{row['p99_ms']:>9.2f} {row['queries']:>8} {row['peak_kb']:>9.1f}"
+            )
+
+    def print_comparison(self, results: Dict, path: str) -> None:
+        try:
+            with open(path) as f:
+                baseline: Dict = json.load(f)['views']
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'Cannot read baseline {path}: {e}')
+
+        self.stdout.write(f'\nChange against {path}:')
+        for name, row in results.items():
+            old: Optional[Dict] = baseline.get(name)
+            if old is None:
+                self.stdout.write(f'{name:<30} new')
+                continue
+            change = (row['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 if old['p95_ms'] else 0.0
+            self.stdout.write(
+                f"{name:<30} p95 {old['p95_ms']:.2f} -> {row['p95_ms']:.2f} ms ({change:+.1f}%), "
+                f"queries {old['queries']} -> {row['queries']}"
+            )
@@ -0,0 +1,28 @@
+"""
+Health check for the Oracle session pool.
+
+Pings a pooled session and prints the pool's usage; exits with an error
+when no session could be acquired, so it can back a container or
+monitoring health probe.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from hostel.oracle_pool import check_pool, pool_enabled, pool_stats
+
+
+class Command(BaseCommand):
+    help = 'Ping a pooled Oracle session and report the session pool usage'
+
+    def handle(self, *args, **options):
+        if not pool_enabled():
+            raise CommandError('The Oracle session pool is disabled; set ORACLE_POOL_ENABLED first')
+
+        healthy = check_pool()
+        stats = pool_stats()
+        self.stdout.write(
+            f"Sessions: {stats['opened']} open, {stats['busy']} busy "
+            f"(min {stats['min']}, max {stats['max']}, increment {stats['increment']})"
+        )
+        if not healthy:
+            raise CommandError('Could not acquire and ping a pooled session; see the log for the error')
+        self.stdout.write(self.style.SUCCESS('[OK] Oracle session pool is healthy'))
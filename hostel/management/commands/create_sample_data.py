@@ -1,12 +1,28 @@
-from django.core.management.base import BaseCommand
+import time
+
+from django.core.management.base import BaseCommand, CommandError
 from user.models import User, Student, Admin
 from hostel.models import Hostel, Wing, Floor, Room, Application, Complaint
+from hostel import sample_data
 
 
 class Command(BaseCommand):
     help = 'Create sample data for testing the HostelMS application'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int,
+                            help=f'Generate a load-testing dataset: each unit adds 1 hostel, '
+                                 f'{sample_data.WINGS_PER_HOSTEL * sample_data.FLOORS_PER_WING * sample_data.ROOMS_PER_FLOOR} '
+                                 f'rooms and {sample_data.STUDENTS_PER_SCALE} students')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for --scale (default: 0)')
+        parser.add_argument('--batch-size', type=int, default=sample_data.DEFAULT_BATCH_SIZE,
+                            help=f'Rows per bulk insert for --scale (default: {sample_data.DEFAULT_BATCH_SIZE})')
+
     def handle(self, *args, **kwargs):
+        if kwargs['scale'] is not None:
+            self.create_scaled(kwargs['scale'], kwargs['seed'], kwargs['batch_size'])
+            return
+
         self.stdout.write(self.style.SUCCESS('Creating sample data...'))
 
         # Create Admin User
@@ -175,3 +191,19 @@ class Command(BaseCommand):
         self.stdout.write('  Student: username=alice,    password=student123')
         self.stdout.write('  Student: username=bob,      password=student123')
         self.stdout.write(self.style.SUCCESS('\nYou can now run: python manage.py runserver'))
+
+    def create_scaled(self, scale, seed, batch_size):
+        self.stdout.write(self.style.SUCCESS(f'Generating sample data at scale {scale} (seed {seed})...'))
+
+        started = time.perf_counter()
+        try:
+            counts = sample_data.generate(scale, seed=seed, batch_size=batch_size)
+        except ValueError as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        for name, count in counts.items():
+            self.stdout.write(f'  {name:<13} {count:>9}')
+        self.stdout.write(self.style.SUCCESS(f'\n=== Generated in {elapsed:.1f}s ==='))
+        self.stdout.write(f'  Admin:   username={sample_data.warden_username(0)}, password={sample_data.DEFAULT_PASSWORD}')
+        self.stdout.write(f'  Student: username={sample_data.student_username(0)}, password={sample_data.DEFAULT_PASSWORD}')
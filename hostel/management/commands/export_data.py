@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from hostel.exports import DATASETS, DEFAULT_CHUNK_SIZE, FORMATS, stream_export
+
+
+class Command(BaseCommand):
+    help = 'Stream complaints, applications or residents to CSV or JSON Lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(DATASETS))
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument(
+            '--output',
+            help='File to write to (default: standard output)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Rows fetched from the database per round trip (default: {DEFAULT_CHUNK_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        lines = stream_export(options['dataset'], options['format'], options['chunk_size'])
+
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as out:
+                out.writelines(lines)
+            self.stderr.write(self.style.SUCCESS(f"[OK] {options['dataset']} exported to {options['output']}"))
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
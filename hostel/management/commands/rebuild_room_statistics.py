@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from hostel.models import RoomStatistic
+
+
+class Command(BaseCommand):
+    help = 'Recompute the room statistics summary from the rooms table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hostel',
+            type=int,
+            action='append',
+            dest='hostel_ids',
+            help='Only rebuild this hostel (repeatable; default: all hostels)',
+        )
+
+    def handle(self, *args, **options):
+        RoomStatistic.objects.rebuild(options['hostel_ids'])
+        self.stdout.write(self.style.SUCCESS(f'[OK] {RoomStatistic.objects.count()} room statistic rows'))
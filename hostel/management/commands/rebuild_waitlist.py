@@ -0,0 +1,17 @@
+"""
+Recreate the room waitlist from the pending applications.
+
+Run after changing WAITLIST_PRIORITY, so existing entries are reordered
+by the new keys.
+"""
+from django.core.management.base import BaseCommand
+
+from hostel.waitlist import rebuild_waitlist
+
+
+class Command(BaseCommand):
+    help = 'Recreate the waitlist entries of all pending applications'
+
+    def handle(self, *args, **options):
+        count = rebuild_waitlist()
+        self.stdout.write(self.style.SUCCESS(f'[OK] Rebuilt {count} waitlist entries'))
@@ -0,0 +1,40 @@
+"""
+Copy the primary SQLite database into the replica file.
+
+Stands in for real replication when trying the replica router locally:
+set REPLICA_DB_NAME to a second SQLite file, run this command, and the
+reporting views read from the copy until it is refreshed again. Running it
+on a timer gives a replica that lags behind the primary.
+"""
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database into the replica database file'
+
+    def handle(self, *args, **options):
+        if settings.REPLICA_DATABASE not in connections.databases:
+            raise CommandError('No replica configured; set REPLICA_DB_NAME first')
+
+        primary = connections[DEFAULT_DB_ALIAS]
+        replica = connections[settings.REPLICA_DATABASE]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('sync_replica only copies SQLite databases; use database replication otherwise')
+
+        # Drop Django's handle on the old copy before overwriting it
+        replica.close()
+        primary.ensure_connection()
+        target = sqlite3.connect(str(replica.settings_dict['NAME']))
+        try:
+            # Online backup: consistent even while the primary takes writes
+            primary.connection.backup(target)
+        finally:
+            target.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"[OK] Copied {primary.settings_dict['NAME']} to {replica.settings_dict['NAME']}"
+        ))
@@ -0,0 +1,123 @@
+"""
+Per-request SQL instrumentation for HostelMS.
+
+QueryInstrumentationMiddleware records every query a request runs through
+connection.execute_wrapper (so it works with DEBUG off), then reports the
+query count, database time and repeated statements as a Server-Timing
+header and one structured log line. Requests over settings.SQL_QUERY_BUDGET
+are logged as warnings together with their most repeated statements, which
+is usually where an N+1 pattern shows up.
+
+Enabled with SQL_INSTRUMENTATION=True; otherwise Django drops the
+middleware at startup. Queries run while a streaming response is being
+consumed happen after the middleware returns and are not counted.
+"""
+import hashlib
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Collapse IN (%s, %s, ...) lists and whitespace so the same statement with
+# a different number of parameters shares a fingerprint
+IN_LIST_RE = re.compile(r'\((?:\s*%s\s*,)*\s*%s\s*\)')
+WHITESPACE_RE = re.compile(r'\s+')
+
+REPORTED_FINGERPRINTS = 3
+
+LOG_FORMAT = (
+    'method=%s path=%s status=%s queries=%s db_ms=%.2f total_ms=%.2f duplicates=%s repeated=%s'
+)
+
+
+def fingerprint(sql: str) -> str:
+    """Short stable identifier for a statement, ignoring parameter values."""
+    normalized = WHITESPACE_RE.sub(' ', IN_LIST_RE.sub('(...)', sql)).strip()
+    return hashlib.sha1(normalized.encode()).hexdigest()[:10]
+
+
+class QueryRecorder:
+    """execute_wrapper callable that times and fingerprints each query."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+        self.exact: Counter = Counter()
+        self.samples: Dict[str, str] = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            key = fingerprint(sql)
+            self.statements[key] += 1
+            self.samples.setdefault(key, sql)
+            if not many:
+                self.exact[(sql, repr(params))] += 1
+
+    @property
+    def duplicates(self) -> int:
+        """Queries that repeat an earlier statement with identical parameters."""
+        return sum(n - 1 for n in self.exact.values() if n > 1)
+
+    @property
+    def similar(self) -> int:
+        """Queries that repeat an earlier statement with any parameters."""
+        return sum(n - 1 for n in self.statements.values() if n > 1)
+
+    def most_repeated(self) -> List[Tuple[str, int]]:
+        return [(key, n) for key, n in self.statements.most_common(REPORTED_FINGERPRINTS) if n > 1]
+
+
+class QueryInstrumentationMiddleware:
+    """Count and time the SQL each request runs and report it."""
+
+    def __init__(self, get_response):
+        if not settings.SQL_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.budget = settings.SQL_QUERY_BUDGET
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.duration * 1000
+
+        response['Server-Timing'] = (
+            f'db;dur={db_ms:.2f};desc="{recorder.count} queries, {recorder.similar} repeated", '
+            f'app;dur={total_ms - db_ms:.2f}'
+        )
+
+        fields = (
+            request.method, request.path, response.status_code, recorder.count,
+            db_ms, total_ms, recorder.duplicates, recorder.similar,
+        )
+        if recorder.count > self.budget:
+            repeated = recorder.most_repeated()
+            logger.warning(LOG_FORMAT + ' over_budget=%s top=%s', *fields, self.budget,
+                           ' '.join(f'{key}x{n}' for key, n in repeated) or '-')
+            for key, n in repeated:
+                logger.warning('  %s x%s: %s', key, n, recorder.samples[key])
+        else:
+            logger.info(LOG_FORMAT, *fields)
+
+        return response
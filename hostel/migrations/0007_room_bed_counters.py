@@ -0,0 +1,60 @@
+# Generated by Django 5.0 on 2026-10-17 01:30
+
+from django.db import migrations, models
+from django.db.models import Case, Count, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+
+OCCUPANCY_CAPACITY = {
+    'Single': 1,
+    'Double': 2,
+    'Triple': 3,
+}
+
+
+def populate_bed_counters(apps, schema_editor):
+    Room = apps.get_model('hostel', 'Room')
+    Residents = Room.residents.through
+    db_alias = schema_editor.connection.alias
+
+    occupants = (
+        Residents.objects.using(db_alias)
+        .filter(room_id=OuterRef('pk'))
+        .order_by()
+        .values('room_id')
+        .annotate(n=Count('pk'))
+        .values('n')
+    )
+    Room.objects.using(db_alias).update(
+        capacity=Case(
+            *[When(occupancy=occupancy, then=Value(capacity)) for occupancy, capacity in OCCUPANCY_CAPACITY.items()],
+            default=Value(1),
+        ),
+        occupied_beds=Coalesce(Subquery(occupants), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hostel', '0006_list_pagination_indexes'),
+        ('user', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='capacity',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='room',
+            name='occupied_beds',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_bed_counters, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['occupancy', 'occupied_beds', 'room_type'], name='room_free_bed_idx'),
+        ),
+    ]
@@ -0,0 +1,102 @@
+"""
+Full-text index over Complaint.description, see hostel/search.py.
+
+SQLite: an external-content FTS5 table plus triggers that mirror every
+insert, update and delete of hostel_complaint. Note that Django rebuilds
+SQLite tables for most AlterField operations, which drops these triggers;
+a later migration that alters hostel_complaint must recreate them.
+
+Oracle: an Oracle Text CONTEXT index synced on commit. Django stores
+TextField as NCLOB, which CONTEXT cannot index directly, so the index is
+declared on status and reads TO_CLOB(description) through a
+MULTI_COLUMN_DATASTORE. It therefore picks up new complaints but not
+edits to an existing description, which the application never makes.
+
+Other backends get no index; search falls back to substring matching.
+"""
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE hostel_complaint_fts USING fts5(
+        description, content='hostel_complaint', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER hostel_complaint_fts_ai AFTER INSERT ON hostel_complaint BEGIN
+        INSERT INTO hostel_complaint_fts(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER hostel_complaint_fts_ad AFTER DELETE ON hostel_complaint BEGIN
+        INSERT INTO hostel_complaint_fts(hostel_complaint_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER hostel_complaint_fts_au AFTER UPDATE OF description ON hostel_complaint BEGIN
+        INSERT INTO hostel_complaint_fts(hostel_complaint_fts, rowid, description)
+        VALUES ('delete', old.id, old.description);
+        INSERT INTO hostel_complaint_fts(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    "INSERT INTO hostel_complaint_fts(hostel_complaint_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS hostel_complaint_fts_au',
+    'DROP TRIGGER IF EXISTS hostel_complaint_fts_ad',
+    'DROP TRIGGER IF EXISTS hostel_complaint_fts_ai',
+    'DROP TABLE IF EXISTS hostel_complaint_fts',
+]
+
+ORACLE_FORWARD = [
+    """
+    BEGIN
+        CTX_DDL.CREATE_PREFERENCE('hostel_complaint_ds', 'MULTI_COLUMN_DATASTORE');
+        CTX_DDL.SET_ATTRIBUTE('hostel_complaint_ds', 'COLUMNS', 'TO_CLOB(description) description');
+    END;
+    """,
+    """
+    CREATE INDEX hostel_complaint_text_idx ON hostel_complaint(status)
+    INDEXTYPE IS CTXSYS.CONTEXT
+    PARAMETERS ('DATASTORE hostel_complaint_ds SYNC (ON COMMIT)')
+    """,
+]
+
+ORACLE_REVERSE = [
+    'DROP INDEX hostel_complaint_text_idx',
+    "BEGIN CTX_DDL.DROP_PREFERENCE('hostel_complaint_ds'); END;",
+]
+
+
+def _run(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql, params=None)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FORWARD)
+    elif vendor == 'oracle':
+        _run(schema_editor, ORACLE_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_REVERSE)
+    elif vendor == 'oracle':
+        _run(schema_editor, ORACLE_REVERSE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hostel', '0007_room_bed_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0 on 2026-10-17 01:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_room_statistics(apps, schema_editor):
+    Room = apps.get_model('hostel', 'Room')
+    RoomStatistic = apps.get_model('hostel', 'RoomStatistic')
+    db_alias = schema_editor.connection.alias
+
+    groups = (
+        Room.objects.using(db_alias)
+        .order_by()
+        .values('floor__wing__hostel_id', 'room_type', 'occupancy')
+        .annotate(rooms=Count('pk'), occupied=Sum('occupied_beds'), beds=Sum('capacity'))
+    )
+    RoomStatistic.objects.using(db_alias).bulk_create([
+        RoomStatistic(
+            hostel_id=group['floor__wing__hostel_id'],
+            room_type=group['room_type'],
+            occupancy=group['occupancy'],
+            total_rooms=group['rooms'],
+            occupied_beds=group['occupied'] or 0,
+            total_capacity=group['beds'] or 0,
+        )
+        for group in groups
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hostel', '0009_complaint_status_change'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('room_type', models.CharField(choices=[('AC', 'AC'), ('Non-AC', 'Non-AC')], max_length=6)),
+                ('occupancy', models.CharField(choices=[('Single', 'Single'), ('Double', 'Double'), ('Triple', 'Triple')], max_length=6)),
+                ('total_rooms', models.PositiveIntegerField(default=0)),
+                ('occupied_beds', models.PositiveIntegerField(default=0)),
+                ('total_capacity', models.PositiveIntegerField(default=0)),
+                ('hostel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='room_statistics', to='hostel.hostel')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='roomstatistic',
+            constraint=models.UniqueConstraint(fields=('hostel', 'room_type', 'occupancy'), name='room_statistic_group_uniq'),
+        ),
+        migrations.RunPython(populate_room_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.0 on 2026-10-17 02:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def priority_key(semester, submitted_at):
+    # Frozen copy of hostel.waitlist.priority_key for the default
+    # WAITLIST_PRIORITY of '-semester,submitted_at'; run rebuild_waitlist
+    # after migrating if the setting differs
+    semester = min(max(semester, 0), 9999)
+    submitted = min(max(int(submitted_at.timestamp() * 1_000_000), 0), 10 ** 17 - 1)
+    return f'{9999 - semester:04d}.{submitted:017d}'
+
+
+def populate_waitlist(apps, schema_editor):
+    Application = apps.get_model('hostel', 'Application')
+    WaitlistEntry = apps.get_model('hostel', 'WaitlistEntry')
+    db_alias = schema_editor.connection.alias
+
+    # Existing rows share one submitted_at, so the queues keep their id order within a semester
+    pending = (
+        Application.objects.using(db_alias)
+        .filter(status=False, applicant__application_status=False)
+        .values_list('id', 'room_type', 'occupancy', 'applicant__semester', 'submitted_at')
+    )
+    WaitlistEntry.objects.using(db_alias).bulk_create([
+        WaitlistEntry(application_id=pk, room_type=room_type, occupancy=occupancy,
+                      priority=priority_key(semester, submitted_at))
+        for pk, room_type, occupancy, semester, submitted_at in pending
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hostel', '0010_room_statistic'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='submitted_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('room_type', models.CharField(choices=[('AC', 'AC'), ('Non-AC', 'Non-AC')], max_length=6)),
+                ('occupancy', models.CharField(choices=[('Single', 'Single'), ('Double', 'Double'), ('Triple', 'Triple')], max_length=6)),
+                ('priority', models.CharField(max_length=64)),
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entry', to='hostel.application')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['room_type', 'occupancy', 'priority', 'id'], name='waitlist_queue_idx')],
+            },
+        ),
+        migrations.RunPython(populate_waitlist, migrations.RunPython.noop),
+    ]
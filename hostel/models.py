@@ -1,8 +1,15 @@
-from django.db import models
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from django.contrib.auth.models import User
 
 from user.models import Student, Admin
+from .hierarchy import invalidate_hostel_trees
+from .versions import ROOMS, bump_versions
 
 
 class Hostel(models.Model):
@@ -35,6 +42,93 @@ class Floor(models.Model):
         return f'Floor {self.number}'
 
 
+class RoomQuerySet(models.QuerySet):
+
+    def with_free_beds(self, room_type=None, occupancy=None):
+        """
+        Rooms with at least one free bed.
+
+        Capacity is fixed per occupancy, so the test is written as one
+        ``occupied_beds < n`` range per occupancy and stays an index range
+        scan on room_free_bed_idx.
+        """
+        capacities = Room.OCCUPANCY_CAPACITY
+        if occupancy is not None:
+            capacities = {occupancy: capacities.get(occupancy, 0)}
+
+        free = Q(pk__in=[])
+        for occ, capacity in capacities.items():
+            free |= Q(occupancy=occ, occupied_beds__lt=capacity)
+
+        queryset = self.filter(free)
+        if room_type is not None:
+            queryset = queryset.filter(room_type=room_type)
+        return queryset
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Insert rooms in bulk, keeping their capacity and the summary rows in step.
+
+        bulk_create skips Room.save and post_save, so the capacity save()
+        would set is filled in here, and the RoomStatistic rows of the
+        rooms' hostels are rebuilt in the same transaction.
+        """
+        objs = list(objs)
+        for room in objs:
+            room.capacity = Room.OCCUPANCY_CAPACITY.get(room.occupancy, room.capacity)
+        with transaction.atomic(using=self.db):
+            rooms = super().bulk_create(objs, *args, **kwargs)
+            hostel_ids = set(
+                Floor.objects.using(self.db)
+                .filter(pk__in={room.floor_id for room in objs})
+                .values_list('wing__hostel_id', flat=True)
+            )
+            if hostel_ids:
+                RoomStatistic.objects.using(self.db).rebuild(hostel_ids)
+                transaction.on_commit(lambda: invalidate_hostel_trees(hostel_ids), using=self.db)
+        return rooms
+
+    def refresh_occupied_beds(self):
+        """
+        Recount occupied_beds from the residents table for these rooms.
+
+        The change in each room's count is also applied to its
+        RoomStatistic group, so the summary never needs a full recount.
+        """
+        Residents = Room.residents.through
+        occupants = (
+            Residents.objects
+            .filter(room_id=OuterRef('pk'))
+            .order_by()
+            .values('room_id')
+            .annotate(n=Count('pk'))
+            .values('n')
+        )
+        with transaction.atomic(using=self.db):
+            before = list(
+                self.select_for_update(of=('self',))
+                .values_list('pk', 'floor__wing__hostel_id', 'room_type', 'occupancy', 'occupied_beds')
+            )
+            if not before:
+                return 0
+            updated = self.update(occupied_beds=Coalesce(Subquery(occupants), 0))
+
+            after = dict(
+                Room.objects.using(self.db)
+                .filter(pk__in=[row[0] for row in before])
+                .values_list('pk', 'occupied_beds')
+            )
+            deltas = Counter()
+            for pk, hostel_id, room_type, occupancy, old in before:
+                deltas[(hostel_id, room_type, occupancy)] += after.get(pk, old) - old
+            RoomStatistic.objects.using(self.db).add_occupied_beds(deltas)
+            bump_versions(ROOMS, using=self.db)
+            # The trees list each room's residents, so drop them even where the count is unchanged
+            hostel_ids = {row[1] for row in before}
+            transaction.on_commit(lambda: invalidate_hostel_trees(hostel_ids), using=self.db)
+        return updated
+
+
 class Room(models.Model):
     ROOM_TYPE_CHOICES = [
         ('AC', 'AC'),
@@ -47,16 +141,132 @@ class Room(models.Model):
         ('Triple', 'Triple'),
     ]
 
+    # Beds per room for each occupancy
+    OCCUPANCY_CAPACITY = {
+        'Single': 1,
+        'Double': 2,
+        'Triple': 3,
+    }
+
     number = models.CharField(max_length=200)
     room_type = models.CharField(max_length=6, choices=ROOM_TYPE_CHOICES, default='AC')
     occupancy = models.CharField(max_length=6, choices=OCCUPANCY_CHOICES, default='Single')
     floor = models.ForeignKey(Floor, related_name='rooms', on_delete=models.CASCADE)
     residents = models.ManyToManyField(Student, related_name='rooms', null=True)
+    # Denormalized bed counters, kept in sync by the residents m2m_changed signal
+    capacity = models.PositiveSmallIntegerField(default=1)
+    occupied_beds = models.PositiveSmallIntegerField(default=0)
+
+    objects = RoomQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # "Rooms with a free bed" lookups, see RoomQuerySet.with_free_beds
+            models.Index(fields=['occupancy', 'occupied_beds', 'room_type'], name='room_free_bed_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.capacity = self.OCCUPANCY_CAPACITY.get(self.occupancy, self.capacity)
+        super().save(*args, **kwargs)
+
+    @property
+    def free_beds(self):
+        return max(self.capacity - self.occupied_beds, 0)
 
     def __str__(self):
         return self.number
 
 
+class RoomStatisticQuerySet(models.QuerySet):
+
+    def add_occupied_beds(self, deltas):
+        """
+        Shift the occupied_beds counters of several groups in one UPDATE.
+
+        Call it after the rooms themselves were updated: a group with no
+        summary row yet (e.g. its first room was bulk-created) cannot take
+        a delta, so its hostel's rows are rebuilt from the rooms instead.
+
+        Args:
+            deltas: Mapping of (hostel_id, room_type, occupancy) to the
+                change in occupied beds
+        """
+        deltas = {group: delta for group, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        match = Q(pk__in=[])
+        changes = []
+        for hostel_id, room_type, occupancy in deltas:
+            group = Q(hostel_id=hostel_id, room_type=room_type, occupancy=occupancy)
+            match |= group
+            changes.append(When(group, then=Value(deltas[(hostel_id, room_type, occupancy)])))
+        updated = self.filter(match).update(occupied_beds=F('occupied_beds') + Case(*changes, default=Value(0)))
+
+        if updated < len(deltas):
+            existing = set(self.filter(match).values_list('hostel_id', 'room_type', 'occupancy'))
+            self.rebuild({group[0] for group in deltas if group not in existing})
+
+    def rebuild(self, hostel_ids=None):
+        """
+        Recompute the summary rows from the rooms table.
+
+        Args:
+            hostel_ids: Only rebuild these hostels' rows (default: all)
+        """
+        rooms = Room.objects.using(self.db)
+        stale = self
+        if hostel_ids is not None:
+            rooms = rooms.filter(floor__wing__hostel_id__in=hostel_ids)
+            stale = stale.filter(hostel_id__in=hostel_ids)
+
+        groups = (
+            rooms
+            .order_by()
+            .values('floor__wing__hostel_id', 'room_type', 'occupancy')
+            .annotate(rooms=Count('pk'), occupied=Sum('occupied_beds'), beds=Sum('capacity'))
+        )
+        with transaction.atomic(using=self.db):
+            stale.delete()
+            self.bulk_create([
+                RoomStatistic(
+                    hostel_id=group['floor__wing__hostel_id'],
+                    room_type=group['room_type'],
+                    occupancy=group['occupancy'],
+                    total_rooms=group['rooms'],
+                    occupied_beds=group['occupied'] or 0,
+                    total_capacity=group['beds'] or 0,
+                )
+                for group in groups
+            ])
+            bump_versions(ROOMS, using=self.db)
+
+
+class RoomStatistic(models.Model):
+    """
+    Room and bed totals per (hostel, room_type, occupancy).
+
+    Occupancy changes are applied incrementally by
+    RoomQuerySet.refresh_occupied_beds; room edits rebuild their hostel's rows.
+    """
+    hostel = models.ForeignKey(Hostel, related_name='room_statistics', on_delete=models.CASCADE)
+    room_type = models.CharField(max_length=6, choices=Room.ROOM_TYPE_CHOICES)
+    occupancy = models.CharField(max_length=6, choices=Room.OCCUPANCY_CHOICES)
+    total_rooms = models.PositiveIntegerField(default=0)
+    occupied_beds = models.PositiveIntegerField(default=0)
+    total_capacity = models.PositiveIntegerField(default=0)
+
+    objects = RoomStatisticQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['hostel', 'room_type', 'occupancy'], name='room_statistic_group_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.hostel_id} {self.room_type} {self.occupancy}: {self.occupied_beds}/{self.total_capacity}'
+
+
 class Complaint(models.Model):
     STATUS_CHOICES = [
         ('Pending', 'Pending'),
@@ -68,10 +278,27 @@ class Complaint(models.Model):
     status = models.CharField(max_length=11, choices=STATUS_CHOICES, default='Pending')
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of the status-filtered complaint list
+            models.Index(fields=['status', 'id'], name='complaint_status_id_idx'),
+        ]
+
     def __str__(self):
         return f'{self.student.name}: {self.status}'
 
 
+class ComplaintStatusChange(models.Model):
+    complaint = models.ForeignKey(Complaint, on_delete=models.CASCADE, related_name='status_changes')
+    old_status = models.CharField(max_length=11, choices=Complaint.STATUS_CHOICES)
+    new_status = models.CharField(max_length=11, choices=Complaint.STATUS_CHOICES)
+    changed_by = models.ForeignKey(Admin, on_delete=models.SET_NULL, null=True, blank=True)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'Complaint {self.complaint_id}: {self.old_status} -> {self.new_status}'
+
+
 class Application(models.Model):
     ROOM_TYPE_CHOICES = [
         ('AC', 'AC'),
@@ -87,6 +314,37 @@ class Application(models.Model):
     room_type = models.CharField(max_length=6, choices=ROOM_TYPE_CHOICES, default='AC')
     occupancy = models.CharField(max_length=6, choices=OCCUPANCY_CHOICES, default='Single')
     status = models.BooleanField(default=False)
+    submitted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the filtered application list
+            models.Index(fields=['status', 'id'], name='application_status_id_idx'),
+            models.Index(fields=['room_type', 'occupancy', 'status', 'id'], name='application_prefs_id_idx'),
+        ]
 
     def __str__(self):
         return f'{self.applicant.name}: {self.status}'
+
+
+class WaitlistEntry(models.Model):
+    """
+    A pending application's place in its (room_type, occupancy) queue.
+
+    ``priority`` encodes the settings.WAITLIST_PRIORITY keys as one sortable
+    string (see hostel.waitlist), so the head of a queue is the first entry
+    of waitlist_queue_idx.
+    """
+    application = models.OneToOneField(Application, on_delete=models.CASCADE, related_name='waitlist_entry')
+    room_type = models.CharField(max_length=6, choices=Room.ROOM_TYPE_CHOICES)
+    occupancy = models.CharField(max_length=6, choices=Room.OCCUPANCY_CHOICES)
+    priority = models.CharField(max_length=64)
+
+    class Meta:
+        indexes = [
+            # Queue head lookups, see hostel.waitlist.queue_heads
+            models.Index(fields=['room_type', 'occupancy', 'priority', 'id'], name='waitlist_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.room_type} {self.occupancy}: application {self.application_id}'
@@ -0,0 +1,148 @@
+"""
+Oracle session pool for HostelMS.
+
+Gives the db_utils stored-procedure wrappers sessions from a
+cx_Oracle.SessionPool instead of Django's per-request connection, so
+workers borrow an open session rather than paying connection setup cost.
+Configured through settings.ORACLE_POOL.
+"""
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+import cx_Oracle
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def pool_enabled() -> bool:
+    """True when db_utils should borrow sessions from the pool."""
+    return settings.ORACLE_POOL['ENABLED']
+
+
+def _dsn(db: Dict) -> str:
+    # Same DSN rules as Django's Oracle backend
+    if db['HOST'] and db['PORT']:
+        return cx_Oracle.makedsn(db['HOST'], int(db['PORT']), db['NAME'])
+    return db['NAME']
+
+
+def get_pool() -> cx_Oracle.SessionPool:
+    """
+    Return the process-wide session pool, creating it on first use.
+
+    Returns:
+        cx_Oracle.SessionPool: Pool sized by settings.ORACLE_POOL
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                db = settings.DATABASES['default']
+                options = settings.ORACLE_POOL
+                _pool = cx_Oracle.SessionPool(
+                    user=db['USER'],
+                    password=db['PASSWORD'],
+                    dsn=_dsn(db),
+                    min=options['MIN'],
+                    max=options['MAX'],
+                    increment=options['INCREMENT'],
+                    threaded=True,
+                    homogeneous=True,
+                    encoding='UTF-8',
+                    getmode=cx_Oracle.SPOOL_ATTRVAL_TIMEDWAIT,
+                    wait_timeout=options['WAIT_TIMEOUT'],
+                    timeout=options['IDLE_TIMEOUT'],
+                    ping_interval=options['PING_INTERVAL'],
+                )
+                # Hand the sessions back to the server when the worker exits
+                atexit.register(close_pool)
+                logger.info('Created Oracle session pool (min=%s, max=%s, increment=%s)',
+                            options['MIN'], options['MAX'], options['INCREMENT'])
+    return _pool
+
+
+@contextmanager
+def pooled_connection() -> Iterator[cx_Oracle.Connection]:
+    """
+    Borrow a session from the pool and always hand it back.
+
+    Yields:
+        cx_Oracle.Connection: A pooled session
+    """
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def check_pool() -> bool:
+    """
+    Health check: borrow a session and ping the server.
+
+    Returns:
+        bool: True if a session could be acquired and answered the ping
+    """
+    try:
+        with pooled_connection() as conn:
+            conn.ping()
+        return True
+    except cx_Oracle.Error as e:
+        logger.error('Oracle session pool health check failed: %s', e)
+        return False
+
+
+def pool_stats() -> Dict:
+    """
+    Current pool usage.
+
+    Returns:
+        Dict: Pool statistics with keys:
+            - enabled: Whether db_utils uses the pool
+            - opened: Sessions currently open
+            - busy: Sessions currently borrowed
+            - min: Minimum pool size
+            - max: Maximum pool size
+            - increment: Sessions opened per growth step
+
+        The keys are the same before the pool is created, with no sessions
+        open and the sizes it will be created with.
+    """
+    if _pool is None:
+        options = settings.ORACLE_POOL
+        return {
+            'enabled': pool_enabled(),
+            'opened': 0,
+            'busy': 0,
+            'min': options['MIN'],
+            'max': options['MAX'],
+            'increment': options['INCREMENT'],
+        }
+
+    return {
+        'enabled': pool_enabled(),
+        'opened': _pool.opened,
+        'busy': _pool.busy,
+        'min': _pool.min,
+        'max': _pool.max,
+        'increment': _pool.increment,
+    }
+
+
+def close_pool() -> None:
+    """Close the pool and its sessions; registered with atexit when the pool is created."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            atexit.unregister(close_pool)
+            _pool.close(force=True)
+            _pool = None
+            logger.info('Closed Oracle session pool')
@@ -0,0 +1,112 @@
+"""
+Keyset (cursor) pagination for HostelMS list views.
+
+Pages are addressed by the primary key of the row at their edge instead of
+an OFFSET, so fetching page N costs the same index range scan as page 1.
+"""
+from typing import List, Optional
+
+from django.conf import settings
+
+
+class KeysetPage:
+    """One page of rows plus the cursors needed to reach its neighbours."""
+
+    def __init__(self, object_list: List, page_size: int,
+                 next_cursor: Optional[int] = None, prev_cursor: Optional[int] = None):
+        self.object_list = object_list
+        self.page_size = page_size
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.prev_cursor is not None
+
+
+def _parse_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_page_size(request) -> int:
+    """
+    Read the requested page size, clamped to LIST_PAGE_SIZE_MAX.
+
+    Args:
+        request: The current HttpRequest
+
+    Returns:
+        int: Number of rows to show on the page
+    """
+    page_size = _parse_int(request.GET.get('page_size')) or settings.LIST_PAGE_SIZE
+    return max(1, min(page_size, settings.LIST_PAGE_SIZE_MAX))
+
+
+def _page_query(queryset, request, page_size: Optional[int]):
+    """Build the page query: one extra row tells whether a further page exists."""
+    if page_size is None:
+        page_size = get_page_size(request)
+
+    after = _parse_int(request.GET.get('after'))
+    before = _parse_int(request.GET.get('before'))
+
+    if before is not None:
+        queryset = queryset.filter(id__gt=before).order_by('id')
+    else:
+        if after is not None:
+            queryset = queryset.filter(id__lt=after)
+        queryset = queryset.order_by('-id')
+    return queryset[:page_size + 1], page_size, after, before
+
+
+def _build_page(rows: List, page_size: int, after: Optional[int], before: Optional[int]) -> KeysetPage:
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if before is not None:
+        rows.reverse()
+        prev_cursor = rows[0].id if rows and has_more else None
+        next_cursor = rows[-1].id if rows else None
+    else:
+        prev_cursor = rows[0].id if rows and after is not None else None
+        next_cursor = rows[-1].id if rows and has_more else None
+
+    return KeysetPage(rows, page_size, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+
+def keyset_paginate(queryset, request, page_size: Optional[int] = None) -> KeysetPage:
+    """
+    Return one newest-first page of ``queryset`` keyed on ``id``.
+
+    ``?after=<id>`` moves to older rows and ``?before=<id>`` back to newer
+    ones. One extra row is fetched to know whether a further page exists.
+
+    Args:
+        queryset: Filtered queryset to paginate (any ordering is replaced)
+        request: The current HttpRequest
+        page_size: Rows per page; read from the request when omitted
+
+    Returns:
+        KeysetPage: The rows of the page and its navigation cursors
+    """
+    query, page_size, after, before = _page_query(queryset, request, page_size)
+    return _build_page(list(query), page_size, after, before)
+
+
+async def akeyset_paginate(queryset, request, page_size: Optional[int] = None) -> KeysetPage:
+    """Async version of keyset_paginate, fetching the page with the async ORM."""
+    query, page_size, after, before = _page_query(queryset, request, page_size)
+    return _build_page([row async for row in query], page_size, after, before)
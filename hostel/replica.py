@@ -0,0 +1,148 @@
+"""
+Read replica routing for HostelMS.
+
+Reads go to the primary ('default') database unless a view opts in with
+the use_replica decorator, in which case its ORM reads (including those
+made while a streaming export is consumed) go to settings.REPLICA_DATABASE.
+Writes always go to the primary.
+
+Replicas lag behind the primary, so after a POST (or any other unsafe
+request) ReplicaPinMiddleware sets a short-lived cookie, and while it is
+present use_replica leaves that browser's reads on the primary. Users
+therefore see their own changes straight away.
+
+Without a replica configured in DATABASES everything stays on the primary.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Iterator
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.http import StreamingHttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+PIN_COOKIE = 'hostelms_primary'
+
+UNSAFE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+# Settings that identify the database a connection points at
+TARGET_KEYS = ('ENGINE', 'NAME', 'HOST', 'PORT')
+
+_replica_reads: ContextVar[bool] = ContextVar('replica_reads', default=False)
+
+
+def replica_configured() -> bool:
+    """
+    True when a separate replica database is available.
+
+    Under tests the replica is a mirror pointing at 'default''s database;
+    reading it through a second connection would miss the test's
+    uncommitted data, so it then counts as not configured.
+    """
+    alias = settings.REPLICA_DATABASE
+    if alias not in connections.databases:
+        return False
+    replica = connections[alias].settings_dict
+    primary = connections[DEFAULT_DB_ALIAS].settings_dict
+    return any(replica.get(key) != primary.get(key) for key in TARGET_KEYS)
+
+
+def read_connection(model):
+    """Connection that raw-SQL reads of ``model`` should use, following the router."""
+    return connections[router.db_for_read(model)]
+
+
+@contextmanager
+def replica_reads(enabled: bool = True) -> Iterator[None]:
+    """Send the ORM reads made inside the block to the replica."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """Database router: replica reads on request, everything else on the primary."""
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and replica_configured():
+            return settings.REPLICA_DATABASE
+        # Explicit, so instances loaded from the replica are not re-read there
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary
+        if db == settings.REPLICA_DATABASE:
+            return False
+        return None
+
+
+def is_pinned(request) -> bool:
+    """True while this browser must read from the primary after a write."""
+    return PIN_COOKIE in request.COOKIES
+
+
+def _iter_on_replica(content):
+    """Consume a streaming response's iterator with replica reads on."""
+    content = iter(content)
+    while True:
+        with replica_reads():
+            try:
+                chunk = next(content)
+            except StopIteration:
+                return
+        yield chunk
+
+
+def use_replica(view_func):
+    """
+    Decorator that sends a read-only view's queries to the replica.
+
+    Apply it inside the role decorators, so the user and session are
+    still loaded from the primary. Browsers pinned to the primary by
+    ReplicaPinMiddleware read from the primary. Works on both sync and
+    async views.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            # sync_to_async copies the context, so the ORM threads see the flag
+            with replica_reads(not is_pinned(request)):
+                return await view_func(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        enabled = not is_pinned(request)
+        with replica_reads(enabled):
+            response = view_func(request, *args, **kwargs)
+        # Streaming exports run their queries after the view has returned
+        if enabled and isinstance(response, StreamingHttpResponse):
+            response.streaming_content = _iter_on_replica(response.streaming_content)
+        return response
+    return wrapper
+
+
+class ReplicaPinMiddleware(MiddlewareMixin):
+    """
+    Pin a browser to the primary for settings.REPLICA_PIN_SECONDS after an
+    unsafe request, so its next reads cannot miss what it just wrote.
+    """
+
+    def process_response(self, request, response):
+        if request.method in UNSAFE_METHODS and settings.REPLICA_PIN_SECONDS > 0 and replica_configured():
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
@@ -0,0 +1,219 @@
+"""
+Backend-agnostic read repository for HostelMS.
+
+Each function returns the same row shapes on every database: on Oracle it
+calls the stored procedures through hostel.db_utils, elsewhere it runs an
+equivalent single ORM/SQL query. settings.REPOSITORY_BACKEND can force
+either implementation ('orm' or 'oracle') so the two can be benchmarked
+against each other on an Oracle deployment.
+"""
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Sum
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def use_procedures() -> bool:
+    """True when reads should go through the Oracle stored procedures."""
+    backend = settings.REPOSITORY_BACKEND
+    if backend == 'auto':
+        return connection.vendor == 'oracle'
+    return backend == 'oracle'
+
+
+def _rows(queryset, columns: List[str], chunk_size: int) -> Iterator[Dict]:
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield dict(zip(columns, row))
+
+
+def complaints(status: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Stream complaints with student details, newest first.
+
+    Args:
+        status: Optional status filter (Pending, In Progress, Resolved)
+        chunk_size: Rows fetched per database round trip
+
+    Yields:
+        Dict: Rows keyed by db_utils.COMPLAINT_COLUMNS
+    """
+    if use_procedures():
+        from . import db_utils
+        if status:
+            return db_utils.iter_complaints_by_status(status, arraysize=chunk_size)
+        return db_utils.iter_all_complaints(arraysize=chunk_size)
+
+    from .models import Complaint
+
+    queryset = Complaint.objects.order_by('-id')
+    if status:
+        queryset = queryset.filter(status=status)
+    queryset = queryset.values_list(
+        'id', 'description', 'status', 'student__student_id', 'student__name', 'student__email',
+    )
+    return _rows(
+        queryset,
+        ['id', 'description', 'status', 'student_id', 'student_name', 'student_email'],
+        chunk_size,
+    )
+
+
+def applications(chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Stream room applications with applicant details, pending first.
+
+    Args:
+        chunk_size: Rows fetched per database round trip
+
+    Yields:
+        Dict: Rows keyed by db_utils.APPLICATION_COLUMNS, with status as a bool
+    """
+    if use_procedures():
+        from . import db_utils
+        # The procedure returns the NUMBER(1) status column as 0/1
+        return (
+            dict(row, status=bool(row['status']))
+            for row in db_utils.iter_applications(arraysize=chunk_size)
+        )
+
+    from .models import Application
+
+    queryset = Application.objects.order_by('status', '-id').values_list(
+        'id', 'room_type', 'occupancy', 'status', 'applicant__user_id', 'applicant__student_id',
+        'applicant__name', 'applicant__email', 'applicant__semester',
+    )
+    return _rows(
+        queryset,
+        ['id', 'room_type', 'occupancy', 'status', 'applicant_user_id', 'student_id',
+         'applicant_name', 'applicant_email', 'semester'],
+        chunk_size,
+    )
+
+
+def dashboard_stats() -> Dict:
+    """
+    Compute the admin dashboard counters in a single round trip.
+
+    Returns:
+        Dict: Integer counters keyed by stats.STATS_KEYS
+    """
+    from .stats import STATS_KEYS
+
+    if use_procedures():
+        from .db_utils import call_get_dashboard_stats
+        stats = call_get_dashboard_stats()
+        return {key: int(stats.get(key) or 0) for key in STATS_KEYS}
+
+    from user.models import Student
+    from .models import Room, Hostel, Application, Complaint
+    from .replica import read_connection
+
+    # Raw SQL bypasses the router, so the connection is picked explicitly
+    db = read_connection(Complaint)
+    qn = db.ops.quote_name
+    sql = f"""
+        SELECT
+            s.total_students,
+            r.total_rooms,
+            a.pending_applications,
+            a.approved_applications,
+            c.pending_complaints,
+            c.inprogress_complaints,
+            c.resolved_complaints,
+            s.students_with_rooms,
+            h.hostel_count
+        FROM (
+            SELECT COUNT(*) AS total_students,
+                   SUM(CASE WHEN application_status = %s THEN 1 ELSE 0 END) AS students_with_rooms
+            FROM {qn(Student._meta.db_table)}
+        ) s
+        CROSS JOIN (
+            SELECT COUNT(*) AS total_rooms FROM {qn(Room._meta.db_table)}
+        ) r
+        CROSS JOIN (
+            SELECT SUM(CASE WHEN status = %s THEN 1 ELSE 0 END) AS pending_applications,
+                   SUM(CASE WHEN status = %s THEN 1 ELSE 0 END) AS approved_applications
+            FROM {qn(Application._meta.db_table)}
+        ) a
+        CROSS JOIN (
+            SELECT SUM(CASE WHEN status = %s THEN 1 ELSE 0 END) AS pending_complaints,
+                   SUM(CASE WHEN status = %s THEN 1 ELSE 0 END) AS inprogress_complaints,
+                   SUM(CASE WHEN status = %s THEN 1 ELSE 0 END) AS resolved_complaints
+            FROM {qn(Complaint._meta.db_table)}
+        ) c
+        CROSS JOIN (
+            SELECT COUNT(*) AS hostel_count FROM {qn(Hostel._meta.db_table)}
+        ) h
+    """
+    params = [True, False, True, 'Pending', 'In Progress', 'Resolved']
+
+    with db.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+
+    # SUM() comes back as a Decimal on some backends
+    return {key: int(value or 0) for key, value in zip(STATS_KEYS, row)}
+
+
+def room_statistics() -> List[Dict]:
+    """
+    Room counts and bed usage per (room_type, occupancy).
+
+    Read from the RoomStatistic summary, so the cost does not grow with
+    the number of rooms.
+
+    Returns:
+        List[Dict]: Rows keyed by db_utils.ROOM_STATISTICS_COLUMNS
+    """
+    if use_procedures():
+        from .db_utils import call_get_room_statistics
+        return call_get_room_statistics()
+
+    from .models import RoomStatistic
+
+    return list(
+        RoomStatistic.objects
+        .values('room_type', 'occupancy')
+        .annotate(
+            total_rooms=Sum('total_rooms'),
+            occupied_beds=Sum('occupied_beds'),
+            total_capacity=Sum('total_capacity'),
+        )
+        .order_by('room_type', 'occupancy')
+    )
+
+
+def available_rooms(room_type: Optional[str] = None, occupancy: Optional[str] = None) -> List[Dict]:
+    """
+    Rooms with at least one free bed, with their location.
+
+    Args:
+        room_type: Optional filter by room type (AC/Non-AC)
+        occupancy: Optional filter by occupancy (Single/Double/Triple)
+
+    Returns:
+        List[Dict]: Rows keyed by db_utils.AVAILABLE_ROOM_COLUMNS
+    """
+    if use_procedures():
+        from .db_utils import call_get_available_rooms
+        return call_get_available_rooms(room_type, occupancy)
+
+    from .models import Room
+
+    queryset = (
+        Room.objects
+        .with_free_beds(room_type=room_type, occupancy=occupancy)
+        .order_by('floor__wing__hostel__name', 'floor__wing__name', 'floor__number', 'number')
+        .values_list(
+            'id', 'number', 'room_type', 'occupancy', 'occupied_beds', 'capacity',
+            'floor__number', 'floor__wing__name', 'floor__wing__hostel__name',
+        )
+    )
+    columns = [
+        'id', 'number', 'room_type', 'occupancy', 'current_occupants', 'max_capacity',
+        'floor_number', 'wing_name', 'hostel_name',
+    ]
+    return [dict(zip(columns, row)) for row in queryset]
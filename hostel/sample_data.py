@@ -0,0 +1,258 @@
+"""
+Bulk sample data generator for HostelMS load testing.
+
+Builds a deterministic dataset from a scale factor and a random seed: each
+scale unit adds one hostel (2 wings x 5 floors x 50 rooms) and 1000
+students, most of them housed with an approved application, some with a
+pending application, and each with a few complaints. Rows are written
+with batched multi-row inserts, one transaction per batch of students;
+primary keys are assigned up front so no rows have to be read back, and
+every account shares one precomputed password hash.
+"""
+import logging
+import random
+from typing import Dict, List, Tuple
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from user.models import User, Student, Admin
+from .models import Hostel, Wing, Floor, Room, RoomStatistic, Application, Complaint
+from .hierarchy import invalidate_hostel_trees
+from .stats import invalidate_dashboard_stats
+from .versions import TABLES, bump_versions
+from .waitlist import rebuild_waitlist
+
+logger = logging.getLogger(__name__)
+
+STUDENTS_PER_SCALE = 1000
+WINGS_PER_HOSTEL = 2
+FLOORS_PER_WING = 5
+ROOMS_PER_FLOOR = 50
+
+# Share of students placed in a room (with an approved application) and,
+# of the rest, the share waiting on a pending application
+HOUSED_FRACTION = 0.6
+PENDING_FRACTION = 0.5
+MAX_COMPLAINTS_PER_STUDENT = 3
+
+DEFAULT_PASSWORD = 'student123'
+DEFAULT_BATCH_SIZE = 5000
+
+COMPLAINT_TEXTS = [
+    'AC not working in my room',
+    'Water supply issue',
+    'Light bulb needs replacement',
+    'Wi-Fi keeps disconnecting',
+    'Broken window latch',
+    'Leaking tap in the washroom',
+    'Room needs pest control',
+    'Ceiling fan is making noise',
+]
+COMPLAINT_STATUS_WEIGHTS = {'Pending': 3, 'In Progress': 2, 'Resolved': 5}
+
+
+def student_username(index: int) -> str:
+    return f'student{index:06d}'
+
+
+def warden_username(index: int) -> str:
+    return f'warden{index:03d}'
+
+
+def _next_pk(model) -> int:
+    return (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+def _reset_sequences(models: List) -> None:
+    """Move auto-increment sequences past the explicitly assigned keys."""
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def _insert(model, field_names: List[str], rows: List[Tuple], batch_size: int) -> None:
+    """
+    Insert value tuples for ``field_names``, giving every other column its default.
+
+    Does the job of bulk_create without building model instances or
+    preparing each value field by field, which is where bulk_create spends
+    its time at this volume. Foreign keys are given as raw ids, and no
+    signals are sent.
+    """
+    opts = model._meta
+    given = [opts.get_field(name) for name in field_names]
+    # Defaults are prepared once, not once per row
+    defaults = [
+        (field, field.get_db_prep_save(field.get_default(), connection))
+        for field in opts.concrete_fields
+        if field not in given and not field.primary_key
+    ]
+    columns = [field.column for field in given] + [field.column for field, _ in defaults]
+    default_values = tuple(value for _, value in defaults)
+
+    qn = connection.ops.quote_name
+    sql = (
+        f"INSERT INTO {qn(opts.db_table)} ({', '.join(qn(column) for column in columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(sql, [row + default_values for row in rows[start:start + batch_size]])
+
+
+def generate(scale: int, seed: int = 0, batch_size: int = DEFAULT_BATCH_SIZE,
+             password: str = DEFAULT_PASSWORD) -> Dict[str, int]:
+    """
+    Generate a scale-factor dataset.
+
+    Args:
+        scale: Number of scale units (1 hostel and 1000 students each)
+        seed: Random seed; the same seed and scale give the same data
+        batch_size: Rows per executemany call and students per transaction
+        password: Password shared by every generated account
+
+    Returns:
+        Dict[str, int]: Number of rows created per model
+
+    Raises:
+        ValueError: If scale is not positive or the accounts already exist
+    """
+    if scale < 1:
+        raise ValueError('scale must be at least 1')
+    if User.objects.filter(username__in=[warden_username(0), student_username(0)]).exists():
+        raise ValueError('Generated accounts already exist; flush the database first')
+
+    rng = random.Random(seed)
+    # One hash for every account; the fixed salt keeps the output repeatable
+    password_hash = make_password(password, salt=f'hostelms{seed}')
+
+    room_types = [code for code, _ in Room.ROOM_TYPE_CHOICES]
+    occupancies = [code for code, _ in Room.OCCUPANCY_CHOICES]
+    complaint_statuses = list(COMPLAINT_STATUS_WEIGHTS)
+    complaint_weights = list(COMPLAINT_STATUS_WEIGHTS.values())
+
+    user_pk = _next_pk(User)
+    hostel_pk = _next_pk(Hostel)
+    wing_pk = _next_pk(Wing)
+    floor_pk = _next_pk(Floor)
+    room_pk = _next_pk(Room)
+
+    counts = dict.fromkeys(
+        ['admins', 'hostels', 'wings', 'floors', 'rooms', 'students', 'residents', 'applications', 'complaints'], 0
+    )
+
+    # Room layout and bed assignment are planned before anything is written,
+    # so rooms are inserted with their final occupied_beds count
+    rooms = []
+    for h in range(scale):
+        for w in range(WINGS_PER_HOSTEL):
+            for f in range(FLOORS_PER_WING):
+                for r in range(ROOMS_PER_FLOOR):
+                    occupancy = rng.choice(occupancies)
+                    rooms.append({
+                        'pk': room_pk + len(rooms),
+                        'floor_pk': floor_pk + (h * WINGS_PER_HOSTEL + w) * FLOORS_PER_WING + f,
+                        'number': f'{f + 1}{r + 1:02d}',
+                        'room_type': rng.choice(room_types),
+                        'occupancy': occupancy,
+                        'capacity': Room.OCCUPANCY_CAPACITY[occupancy],
+                        'occupied_beds': 0,
+                    })
+
+    total_students = scale * STUDENTS_PER_SCALE
+    beds = [index for index, room in enumerate(rooms) for _ in range(room['capacity'])]
+    rng.shuffle(beds)
+    housed = rng.sample(range(total_students), min(int(total_students * HOUSED_FRACTION), len(beds)))
+    room_of = dict(zip(housed, beds))
+    for index in room_of.values():
+        rooms[index]['occupied_beds'] += 1
+
+    with transaction.atomic():
+        _insert(User, ['id', 'username', 'password', 'email', 'is_admin'], [
+            (user_pk + h, warden_username(h), password_hash, f'{warden_username(h)}@hostelms.com', True)
+            for h in range(scale)
+        ], batch_size)
+        _insert(Admin, ['user', 'admin_id', 'name', 'email'], [
+            (user_pk + h, f'ADM_{warden_username(h).upper()}', f'Warden {h + 1}', f'{warden_username(h)}@hostelms.com')
+            for h in range(scale)
+        ], batch_size)
+        _insert(Hostel, ['id', 'name', 'address', 'admin', 'type'], [
+            (hostel_pk + h, f'Hostel {h + 1}', f'Campus Block {h + 1}', user_pk + h, 'Boys' if h % 2 == 0 else 'Girls')
+            for h in range(scale)
+        ], batch_size)
+        _insert(Wing, ['id', 'name', 'hostel'], [
+            (wing_pk + h * WINGS_PER_HOSTEL + w, f'{chr(ord("A") + w)} Wing', hostel_pk + h)
+            for h in range(scale)
+            for w in range(WINGS_PER_HOSTEL)
+        ], batch_size)
+        _insert(Floor, ['id', 'number', 'wing'], [
+            (floor_pk + wing * FLOORS_PER_WING + f, f + 1, wing_pk + wing)
+            for wing in range(scale * WINGS_PER_HOSTEL)
+            for f in range(FLOORS_PER_WING)
+        ], batch_size)
+        # Room.save() is bypassed, so capacity is written explicitly
+        _insert(Room, ['id', 'number', 'floor', 'room_type', 'occupancy', 'capacity', 'occupied_beds'], [
+            (room['pk'], room['number'], room['floor_pk'], room['room_type'], room['occupancy'],
+             room['capacity'], room['occupied_beds'])
+            for room in rooms
+        ], batch_size)
+
+    counts['admins'] = counts['hostels'] = scale
+    counts['wings'] = scale * WINGS_PER_HOSTEL
+    counts['floors'] = counts['wings'] * FLOORS_PER_WING
+    counts['rooms'] = len(rooms)
+
+    student_pk = user_pk + scale
+    for start in range(0, total_students, batch_size):
+        users, students, residents, applications, complaints = [], [], [], [], []
+
+        for i in range(start, min(start + batch_size, total_students)):
+            pk = student_pk + i
+            username = student_username(i)
+            email = f'{username}@student.com'
+            room_index = room_of.get(i)
+
+            users.append((pk, username, password_hash, email, True))
+            students.append((pk, f'STU_{username.upper()}', f'Student {i + 1}', email,
+                             rng.randint(1, 8), room_index is not None))
+
+            if room_index is not None:
+                room = rooms[room_index]
+                residents.append((room['pk'], pk))
+                applications.append((pk, room['room_type'], room['occupancy'], True))
+            elif rng.random() < PENDING_FRACTION:
+                applications.append((pk, rng.choice(room_types), rng.choice(occupancies), False))
+
+            for _ in range(rng.randint(0, MAX_COMPLAINTS_PER_STUDENT)):
+                complaints.append((pk, rng.choice(COMPLAINT_TEXTS),
+                                   rng.choices(complaint_statuses, complaint_weights)[0]))
+
+        with transaction.atomic():
+            _insert(User, ['id', 'username', 'password', 'email', 'is_student'], users, batch_size)
+            _insert(Student, ['user', 'student_id', 'name', 'email', 'semester', 'application_status'],
+                    students, batch_size)
+            _insert(Room.residents.through, ['room', 'student'], residents, batch_size)
+            _insert(Application, ['applicant', 'room_type', 'occupancy', 'status'], applications, batch_size)
+            _insert(Complaint, ['student', 'description', 'status'], complaints, batch_size)
+
+        counts['students'] += len(students)
+        counts['residents'] += len(residents)
+        counts['applications'] += len(applications)
+        counts['complaints'] += len(complaints)
+
+    _reset_sequences([User, Hostel, Wing, Floor, Room])
+
+    # Raw inserts send no signals, so the summary rows, waitlist and cached counters are stale
+    RoomStatistic.objects.rebuild(range(hostel_pk, hostel_pk + scale))
+    rebuild_waitlist()
+    invalidate_dashboard_stats()
+    invalidate_hostel_trees(range(hostel_pk, hostel_pk + scale))
+    bump_versions(*TABLES)
+
+    logger.info('Generated sample data at scale %s (seed %s): %s', scale, seed, counts)
+    return counts
@@ -0,0 +1,129 @@
+"""
+Full-text search over complaint descriptions.
+
+On SQLite the complaints are mirrored into an FTS5 table
+(hostel_complaint_fts) and ranked with bm25; on Oracle an Oracle Text
+CONTEXT index is queried with CONTAINS and ranked by SCORE. Both indexes
+are created by migration 0008 and kept in sync by the database itself
+(triggers / SYNC ON COMMIT), so bulk and raw-SQL writes are covered too.
+Other backends fall back to a case-insensitive substring match.
+"""
+import operator
+import re
+from functools import reduce
+from typing import List, Optional, Tuple
+
+from django.db.models import Case, FloatField, Q, When
+
+from .models import Complaint
+from .replica import read_connection
+
+FTS_TABLE = 'hostel_complaint_fts'
+ORACLE_TEXT_INDEX = 'hostel_complaint_text_idx'
+
+MAX_TERMS = 8
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def parse_terms(query: str) -> List[str]:
+    """Split a free-text query into at most MAX_TERMS lowercase words."""
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def _has_fts_table(connection) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def _sqlite_ranked_ids(connection, terms: List[str], status: Optional[str], limit: int) -> List[Tuple[int, float]]:
+    # Any term may match and bm25 ranks rows matching more (and rarer) terms
+    # first; each is quoted (so FTS5 syntax in the input is inert) and
+    # prefix-matched, so "leak" also finds "leaking"
+    match = ' OR '.join(f'"{term}"*' for term in terms)
+    sql = f"""
+        SELECT c.id, bm25({FTS_TABLE}) AS rank
+        FROM {FTS_TABLE}
+        JOIN hostel_complaint c ON c.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH %s
+    """
+    params = [match]
+    if status:
+        sql += ' AND c.status = %s'
+        params.append(status)
+    sql += ' ORDER BY rank LIMIT %s'
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _oracle_ranked_ids(connection, terms: List[str], status: Optional[str], limit: int) -> List[Tuple[int, float]]:
+    # Braces make Oracle Text treat each word literally; ACCUM matches any
+    # word and scores rows matching more of them higher
+    match = ' ACCUM '.join(f'{{{term}}}' for term in terms)
+    # The CONTEXT index sits on status and reads the description through its datastore
+    sql = """
+        SELECT c.id, SCORE(1) AS rank
+        FROM hostel_complaint c
+        WHERE CONTAINS(c.status, %s, 1) > 0
+    """
+    params = [match]
+    if status:
+        sql += ' AND c.status = %s'
+        params.append(status)
+    sql += ' ORDER BY SCORE(1) DESC FETCH FIRST %s ROWS ONLY'
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _fallback_ranked_ids(terms: List[str], status: Optional[str], limit: int) -> List[Tuple[int, float]]:
+    matches = [Q(description__icontains=term) for term in terms]
+    queryset = Complaint.objects.filter(reduce(operator.or_, matches)).annotate(
+        # Number of terms matched, as the rank
+        matched=sum(Case(When(match, then=1), default=0, output_field=FloatField()) for match in matches),
+    )
+    if status:
+        queryset = queryset.filter(status=status)
+    return list(queryset.order_by('-matched', '-id').values_list('id', 'matched')[:limit])
+
+
+def search_complaints(query: str, status: Optional[str] = None, limit: int = 50) -> List[Complaint]:
+    """
+    Find complaints whose description contains any word of ``query``.
+
+    Complaints matching more of the words rank first.
+
+    Args:
+        query: Free text typed by the admin
+        status: Optional status filter (Pending, In Progress, Resolved)
+        limit: Maximum number of results
+
+    Returns:
+        List[Complaint]: Best matches first, with student loaded and the
+            backend's relevance score in ``search_rank``
+    """
+    terms = parse_terms(query)
+    if not terms:
+        return []
+
+    connection = read_connection(Complaint)
+    if connection.vendor == 'sqlite' and _has_fts_table(connection):
+        ranked = _sqlite_ranked_ids(connection, terms, status, limit)
+    elif connection.vendor == 'oracle':
+        ranked = _oracle_ranked_ids(connection, terms, status, limit)
+    else:
+        ranked = _fallback_ranked_ids(terms, status, limit)
+
+    complaints = Complaint.objects.select_related('student').in_bulk([pk for pk, _ in ranked])
+    results = []
+    for pk, rank in ranked:
+        complaint = complaints.get(pk)
+        if complaint is not None:
+            complaint.search_rank = rank
+            results.append(complaint)
+    return results
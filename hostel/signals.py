@@ -0,0 +1,232 @@
+"""
+Signal handlers for HostelMS.
+Keeps cached, denormalized data in step with model changes.
+
+Each model has one receiver per signal, which calls the handlers of every
+feature derived from that model, in this order:
+
+- stats: the admin dashboard snapshot
+- beds: the bed counters, RoomStatistic and freed-bed waitlist fills
+- student_cache, fragments: the cached student dashboards and list rows
+- hierarchy: the hostel trees
+- waitlist: the queue entries
+- versions: the JSON endpoint version counters
+
+The handlers live next to the features they serve and defer their cache
+work to transaction.on_commit. post_init remembers the tracked fields
+each instance was loaded with, so post_save handlers see what changed.
+"""
+from django.db.models.signals import post_init, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from user.models import Student
+from . import beds, fragments, hierarchy, stats, waitlist
+from .fragments import APPLICATION_ROW, COMPLAINT_ROW, application_rows, complaint_rows, invalidate_rows_on_commit
+from .models import Hostel, Wing, Floor, Room, Complaint, Application
+from .stats import APPLICATION_STATUS_KEYS, COMPLAINT_STATUS_KEYS
+from .student_cache import invalidate_student_dashboards_on_commit
+from .versions import model_changed
+
+# Fields whose loaded values the post_save handlers compare against
+TRACKED_FIELDS = {
+    Complaint: ('status',),
+    Application: ('status',),
+    Student: ('application_status', 'semester', 'student_id', 'name'),
+    Room: ('floor_id', 'room_type', 'occupancy'),
+    Floor: ('wing_id',),
+    Wing: ('hostel_id',),
+}
+
+
+def _field_values(sender, instance):
+    # Read from __dict__ so deferred fields never trigger a query
+    return {name: instance.__dict__.get(name) for name in TRACKED_FIELDS[sender]}
+
+
+def _loaded_fields(sender, instance):
+    """The tracked fields as loaded; the snapshot moves on to the values just saved."""
+    old = instance._loaded_fields
+    instance._loaded_fields = _field_values(sender, instance)
+    return old
+
+
+def _resident_ids(room, using):
+    return list(room.residents.using(using).values_list('pk', flat=True))
+
+
+@receiver(post_init, sender=Complaint)
+@receiver(post_init, sender=Application)
+@receiver(post_init, sender=Student)
+@receiver(post_init, sender=Room)
+@receiver(post_init, sender=Floor)
+@receiver(post_init, sender=Wing)
+def remember_loaded_fields(sender, instance, **kwargs):
+    instance._loaded_fields = _field_values(sender, instance)
+
+
+# =====================================================
+# Complaints
+# =====================================================
+
+@receiver(post_save, sender=Complaint)
+def complaint_saved(sender, instance, created, using, **kwargs):
+    old = _loaded_fields(sender, instance)
+    stats.status_saved(COMPLAINT_STATUS_KEYS, old['status'], instance.status, created, using)
+    invalidate_student_dashboards_on_commit([instance.student_id], using)
+    invalidate_rows_on_commit(COMPLAINT_ROW, complaint_rows([instance.pk]), using)
+    model_changed(sender, using)
+
+
+@receiver(post_delete, sender=Complaint)
+def complaint_deleted(sender, instance, using, **kwargs):
+    stats.row_counted(COMPLAINT_STATUS_KEYS[instance.status], -1, using)
+    invalidate_student_dashboards_on_commit([instance.student_id], using)
+    invalidate_rows_on_commit(COMPLAINT_ROW, complaint_rows([instance.pk]), using)
+    model_changed(sender, using)
+
+
+# =====================================================
+# Applications
+# =====================================================
+
+@receiver(post_save, sender=Application)
+def application_saved(sender, instance, created, using, **kwargs):
+    old = _loaded_fields(sender, instance)
+    stats.status_saved(APPLICATION_STATUS_KEYS, old['status'], instance.status, created, using)
+    invalidate_student_dashboards_on_commit([instance.applicant_id], using)
+    invalidate_rows_on_commit(APPLICATION_ROW, application_rows([instance.pk]), using)
+    waitlist.enqueue(instance)
+    model_changed(sender, using)
+
+
+@receiver(post_delete, sender=Application)
+def application_deleted(sender, instance, using, **kwargs):
+    # The waitlist entry goes with it through the cascade
+    stats.row_counted(APPLICATION_STATUS_KEYS[instance.status], -1, using)
+    invalidate_student_dashboards_on_commit([instance.applicant_id], using)
+    invalidate_rows_on_commit(APPLICATION_ROW, application_rows([instance.pk]), using)
+    model_changed(sender, using)
+
+
+# =====================================================
+# Students
+# =====================================================
+
+@receiver(post_save, sender=Student)
+def student_saved(sender, instance, created, using, **kwargs):
+    old = _loaded_fields(sender, instance)
+    new = instance._loaded_fields
+    stats.student_saved(old['application_status'], instance.application_status, created, using)
+    invalidate_student_dashboards_on_commit([instance.pk], using)
+    if not created:
+        # Complaint and application rows and the hostel trees show the student's ID and name
+        if (old['student_id'], old['name']) != (new['student_id'], new['name']):
+            fragments.student_rows_changed(instance, using)
+            hierarchy.resident_changed(instance, using)
+        # A semester change reorders the applicant's entries; being housed or
+        # unhoused by hand takes them out of or puts them back into the queues
+        if (old['semester'], old['application_status']) != (new['semester'], new['application_status']):
+            waitlist.requeue_applicant(instance.pk)
+    model_changed(sender, using)
+
+
+@receiver(pre_delete, sender=Student)
+def student_deleting(sender, instance, using, **kwargs):
+    beds.resident_deleting(instance, using)
+
+
+@receiver(post_delete, sender=Student)
+def student_deleted(sender, instance, using, **kwargs):
+    # Their complaints and applications were deleted first, through their own receivers
+    stats.student_deleted(instance.application_status, using)
+    beds.resident_deleted(instance, using)
+    invalidate_student_dashboards_on_commit([instance.pk], using)
+    model_changed(sender, using)
+
+
+# =====================================================
+# Room residents
+# =====================================================
+
+@receiver(m2m_changed, sender=Room.residents.through)
+def residents_changed(sender, instance, action, reverse, pk_set, using, **kwargs):
+    # Runs inside the transaction that writes the residents rows, from
+    # either side: room.residents (forward) or student.rooms (reverse)
+    if action == 'pre_clear':
+        related = instance.rooms if reverse else instance.residents
+        instance._cleared_pks = list(related.using(using).values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    pks = instance.__dict__.pop('_cleared_pks', []) if action == 'post_clear' else list(pk_set or [])
+    if not pks:
+        return
+    room_ids, student_ids = (pks, [instance.pk]) if reverse else ([instance.pk], pks)
+
+    beds.residents_changed(room_ids, action != 'post_add', using)
+    invalidate_student_dashboards_on_commit(student_ids, using)
+    if action == 'post_add':
+        # Students given a room by hand leave every queue they were in
+        waitlist.dequeue_applicants(student_ids, using)
+
+
+# =====================================================
+# Rooms, floors, wings and hostels
+# =====================================================
+
+@receiver(post_save, sender=Room)
+def room_saved(sender, instance, created, using, **kwargs):
+    old = _loaded_fields(sender, instance)
+    if created:
+        stats.row_counted('total_rooms', 1, using)
+    beds.room_saved(instance, (old['floor_id'], old['room_type'], old['occupancy']), created, using)
+    if not created:
+        # Residents' dashboards show the room number, type and occupancy
+        invalidate_student_dashboards_on_commit(_resident_ids(instance, using), using)
+    hierarchy.tree_node_changed(instance, old['floor_id'], using)
+    model_changed(sender, using)
+
+
+@receiver(pre_delete, sender=Room)
+def room_deleting(sender, instance, using, **kwargs):
+    # The delete cascades to the residents rows without sending m2m_changed
+    instance._resident_ids = _resident_ids(instance, using)
+
+
+@receiver(post_delete, sender=Room)
+def room_deleted(sender, instance, using, **kwargs):
+    stats.row_counted('total_rooms', -1, using)
+    beds.room_deleted(instance, using)
+    invalidate_student_dashboards_on_commit(instance.__dict__.pop('_resident_ids', []), using)
+    hierarchy.tree_node_changed(instance, instance._loaded_fields['floor_id'], using)
+    model_changed(sender, using)
+
+
+@receiver(post_save, sender=Floor)
+@receiver(post_save, sender=Wing)
+def tree_node_saved(sender, instance, using, **kwargs):
+    old = _loaded_fields(sender, instance)
+    hierarchy.tree_node_changed(instance, old[hierarchy.TREE_PARENTS[sender._meta.model_name]], using)
+
+
+@receiver(post_delete, sender=Floor)
+@receiver(post_delete, sender=Wing)
+def tree_node_deleted(sender, instance, using, **kwargs):
+    old = instance._loaded_fields
+    hierarchy.tree_node_changed(instance, old[hierarchy.TREE_PARENTS[sender._meta.model_name]], using)
+
+
+@receiver(post_save, sender=Hostel)
+def hostel_saved(sender, instance, created, using, **kwargs):
+    if created:
+        stats.row_counted('hostel_count', 1, using)
+    hierarchy.invalidate_hostel_trees_on_commit([instance.pk], using)
+    model_changed(sender, using)
+
+
+@receiver(post_delete, sender=Hostel)
+def hostel_deleted(sender, instance, using, **kwargs):
+    stats.row_counted('hostel_count', -1, using)
+    hierarchy.invalidate_hostel_trees_on_commit([instance.pk], using)
+    model_changed(sender, using)
@@ -0,0 +1,156 @@
+"""
+Admin dashboard statistics for HostelMS.
+Keeps a cached snapshot of the dashboard counters (computed in a single
+round trip by repository.dashboard_stats) that model signals adjust
+incrementally (see the *_saved / *_deleted handlers below, dispatched
+from hostel.signals). The snapshot is shared by every view and then moved by
+deltas, so it is always computed on the primary, never on a replica.
+"""
+import logging
+from typing import Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from . import repository
+from .replica import replica_reads
+
+logger = logging.getLogger(__name__)
+
+STATS_KEYS = (
+    'total_students',
+    'total_rooms',
+    'pending_applications',
+    'approved_applications',
+    'pending_complaints',
+    'inprogress_complaints',
+    'resolved_complaints',
+    'students_with_rooms',
+    'hostel_count',
+)
+
+COMPLAINT_STATUS_KEYS = {
+    'Pending': 'pending_complaints',
+    'In Progress': 'inprogress_complaints',
+    'Resolved': 'resolved_complaints',
+}
+
+APPLICATION_STATUS_KEYS = {
+    False: 'pending_applications',
+    True: 'approved_applications',
+}
+
+CACHE_PREFIX = 'dashboard_stats:'
+
+
+def _cache_key(name: str) -> str:
+    return f'{CACHE_PREFIX}{name}'
+
+
+def _cached_snapshot(cached: Dict) -> Optional[Dict]:
+    """The snapshot from a get_many result, or None unless every counter is in it."""
+    if len(cached) < len(STATS_KEYS):
+        return None
+    return {name: cached[_cache_key(name)] for name in STATS_KEYS}
+
+
+def _recompute_dashboard_stats() -> Dict:
+    # A lagging replica would seed the shared snapshot with stale counts
+    with replica_reads(False):
+        stats = repository.dashboard_stats()
+    cache.set_many(
+        {_cache_key(name): stats.get(name, 0) for name in STATS_KEYS},
+        settings.DASHBOARD_STATS_TIMEOUT,
+    )
+    logger.info('Recomputed dashboard statistics snapshot')
+    return stats
+
+
+def get_dashboard_stats() -> Dict:
+    """
+    Return the cached dashboard statistics, computing them on a cache miss.
+
+    Returns:
+        Dict: Dashboard statistics keyed by STATS_KEYS
+    """
+    stats = _cached_snapshot(cache.get_many([_cache_key(name) for name in STATS_KEYS]))
+    return stats if stats is not None else _recompute_dashboard_stats()
+
+
+async def aget_dashboard_stats() -> Dict:
+    """Async version of get_dashboard_stats; only a cache miss leaves the event loop."""
+    stats = _cached_snapshot(await cache.aget_many([_cache_key(name) for name in STATS_KEYS]))
+    return stats if stats is not None else await sync_to_async(_recompute_dashboard_stats)()
+
+
+def adjust_dashboard_stats(deltas: Dict[str, int]) -> None:
+    """
+    Apply counter deltas to the cached snapshot.
+
+    If any counter is missing from the cache the whole snapshot is dropped,
+    so the next read recomputes it instead of mixing stale and fresh values.
+
+    Args:
+        deltas: Mapping of stats key to the amount it changed by
+    """
+    for name, delta in deltas.items():
+        if not delta:
+            continue
+        try:
+            cache.incr(_cache_key(name), delta)
+        except ValueError:
+            invalidate_dashboard_stats()
+            return
+
+
+def invalidate_dashboard_stats() -> None:
+    """Drop the cached snapshot so the next read recomputes it."""
+    cache.delete_many([_cache_key(name) for name in STATS_KEYS])
+
+
+def _adjust_on_commit(deltas: Dict[str, int], using) -> None:
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if deltas:
+        transaction.on_commit(lambda: adjust_dashboard_stats(deltas), using=using)
+
+
+def row_counted(name: str, delta: int, using) -> None:
+    """A row counted by the ``name`` counter was created (1) or deleted (-1)."""
+    _adjust_on_commit({name: delta}, using)
+
+
+def status_saved(status_keys: Dict, old, new, created: bool, using) -> None:
+    """
+    A complaint or application was saved with status ``new``.
+
+    Args:
+        status_keys: COMPLAINT_STATUS_KEYS or APPLICATION_STATUS_KEYS
+        old: Status the row was loaded with; None if it was deferred, in
+            which case the change is unknown and the snapshot is dropped
+        new: Status saved
+        created: Whether the row was inserted
+        using: Database alias of the transaction
+    """
+    if created:
+        _adjust_on_commit({status_keys[new]: 1}, using)
+    elif old is None:
+        transaction.on_commit(invalidate_dashboard_stats, using=using)
+    elif old != new:
+        _adjust_on_commit({status_keys[old]: -1, status_keys[new]: 1}, using)
+
+
+def student_saved(old: Optional[bool], new: bool, created: bool, using) -> None:
+    """A student was saved with application_status ``new`` (loaded as ``old``, None if deferred)."""
+    if created:
+        _adjust_on_commit({'total_students': 1, 'students_with_rooms': int(new)}, using)
+    elif old is None:
+        transaction.on_commit(invalidate_dashboard_stats, using=using)
+    elif old != new:
+        _adjust_on_commit({'students_with_rooms': 1 if new else -1}, using)
+
+
+def student_deleted(application_status: bool, using) -> None:
+    """A student with this application_status was deleted."""
+    _adjust_on_commit({'total_students': -1, 'students_with_rooms': -int(application_status)}, using)
@@ -0,0 +1,120 @@
+"""
+Per-student dashboard cache for HostelMS.
+
+Caches everything the student dashboard renders (the student profile,
+their application, complaints and room) under one key per student, so a
+refresh is served without touching the database. Signal handlers and the
+bulk allocator drop a student's entry whenever any of that data changes.
+"""
+import asyncio
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_PREFIX = 'student_dashboard:'
+
+
+def _cache_key(student_id) -> str:
+    return f'{CACHE_PREFIX}{student_id}'
+
+
+def load_student_dashboard(user_id) -> Optional[Dict]:
+    """
+    Load the dashboard context for a student from the database.
+
+    Args:
+        user_id: Primary key of the student's User (and Student) row
+
+    Returns:
+        Optional[Dict]: Context with student, application, complaints and
+            room, or None if the user has no student profile
+    """
+    from user.models import Student
+    from .models import Application, Complaint
+
+    student = Student.objects.filter(pk=user_id).first()
+    if student is None:
+        return None
+
+    room = None
+    if student.application_status:
+        room = student.rooms.select_related('floor').first()
+
+    return {
+        'student': student,
+        'application': Application.objects.filter(applicant=student).first(),
+        'complaints': list(Complaint.objects.filter(student=student).order_by('-id')),
+        'room': room,
+    }
+
+
+def get_student_dashboard(user_id) -> Optional[Dict]:
+    """
+    Return the cached dashboard context for a student, loading it on a miss.
+
+    Args:
+        user_id: Primary key of the student's User (and Student) row
+
+    Returns:
+        Optional[Dict]: See load_student_dashboard
+    """
+    key = _cache_key(user_id)
+    context = cache.get(key)
+    if context is None:
+        context = load_student_dashboard(user_id)
+        if context is not None:
+            cache.set(key, context, settings.STUDENT_DASHBOARD_TIMEOUT)
+    return context
+
+
+async def aload_student_dashboard(user_id) -> Optional[Dict]:
+    """Async version of load_student_dashboard, running its queries concurrently."""
+    from user.models import Student
+    from .models import Room, Application, Complaint
+
+    async def complaints():
+        return [c async for c in Complaint.objects.filter(student_id=user_id).order_by('-id')]
+
+    # All four only need the user id, so none waits on another
+    student, application, complaint_list, room = await asyncio.gather(
+        Student.objects.filter(pk=user_id).afirst(),
+        Application.objects.filter(applicant_id=user_id).afirst(),
+        complaints(),
+        Room.objects.filter(residents=user_id).select_related('floor').afirst(),
+    )
+    if student is None:
+        return None
+
+    return {
+        'student': student,
+        'application': application,
+        'complaints': complaint_list,
+        'room': room if student.application_status else None,
+    }
+
+
+async def aget_student_dashboard(user_id) -> Optional[Dict]:
+    """Async version of get_student_dashboard."""
+    key = _cache_key(user_id)
+    context = await cache.aget(key)
+    if context is None:
+        context = await aload_student_dashboard(user_id)
+        if context is not None:
+            await cache.aset(key, context, settings.STUDENT_DASHBOARD_TIMEOUT)
+    return context
+
+
+def invalidate_student_dashboards(student_ids: Iterable) -> None:
+    """Drop the cached dashboards of these students."""
+    keys = [_cache_key(student_id) for student_id in set(student_ids)]
+    if keys:
+        cache.delete_many(keys)
+
+
+def invalidate_student_dashboards_on_commit(student_ids: Iterable, using) -> None:
+    """Drop the cached dashboards of these students once the current transaction commits."""
+    student_ids = [pk for pk in student_ids if pk is not None]
+    if student_ids:
+        transaction.on_commit(lambda: invalidate_student_dashboards(student_ids), using=using)
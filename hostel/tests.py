@@ -1,3 +1,1157 @@
-from django.test import TestCase
+import csv
+import importlib.util
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import CommandError, call_command
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+
+from user.models import User, Student, Admin
+from hostel import repository
+from hostel.allocation import allocate_pending_applications, fill_free_beds
+from hostel.exports import stream_export
+from hostel.files import serve_file
+from hostel.hierarchy import get_hostel_tree_json, load_hostel_trees
+from hostel.log_handlers import DeferredQueueHandler, SamplingFilter, configure_logging, stop_listeners
+from hostel.models import (
+    Hostel, Wing, Floor, Room, RoomStatistic, Complaint, ComplaintStatusChange, Application,
+    WaitlistEntry,
+)
+from hostel.middleware import QueryInstrumentationMiddleware
+from hostel.pagination import keyset_paginate
+from hostel.replica import PIN_COOKIE, ReplicaPinMiddleware, replica_reads, use_replica
+from hostel.search import search_complaints
+from hostel.stats import STATS_KEYS, get_dashboard_stats
+from hostel.student_cache import get_student_dashboard
+from hostel.triage import transition_complaints
+from hostel.waitlist import queue_heads
+
+
+def make_admin(username='warden'):
+    user = User.objects.create_user(username, password='pass', is_admin=True)
+    return Admin.objects.create(user=user, admin_id=username.upper(), name=username, email=f'{username}@example.com')
+
+
+def make_student(username, semester=1, **fields):
+    user = User.objects.create_user(username, password='pass', is_student=True)
+    return Student.objects.create(
+        user=user, student_id=username.upper(), name=username, email=f'{username}@example.com',
+        semester=semester, **fields,
+    )
+
+
+def make_floor(admin, name='North'):
+    hostel = Hostel.objects.create(name=name, address='Campus', admin=admin)
+    return Floor.objects.create(number=1, wing=Wing.objects.create(name='A', hostel=hostel))
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = make_admin()
+        self.student = make_student('alice')
+        self.floor = make_floor(self.admin)
+
+    def assertSnapshotCurrent(self):
+        with self.assertNumQueries(0):
+            stats = get_dashboard_stats()
+        self.assertEqual(stats, repository.dashboard_stats())
+
+    def test_dashboard_routes_are_not_taken_by_the_admin_site(self):
+        for url in ('/admin/dashboard/', '/admin/dashboard/stats/', '/admin/dashboard/charts/'):
+            self.assertEqual(resolve(url).func.__module__, 'hostel.views')
+        self.client.force_login(self.admin.user)
+        self.assertEqual(self.client.get('/admin/dashboard/').status_code, 200)
+
+    def test_signals_move_the_cached_snapshot(self):
+        get_dashboard_stats()
+        with self.captureOnCommitCallbacks(execute=True):
+            complaint = Complaint.objects.create(description='Broken fan', student=self.student)
+            Complaint.objects.create(description='Leaking tap', student=self.student)
+            complaint.status = 'Resolved'
+            complaint.save()
+            application = Application.objects.create(applicant=self.student)
+            application.status = True
+            application.save()
+            bob = make_student('bob')
+            bob.application_status = True
+            bob.save()
+            Room.objects.create(number='101', floor=self.floor)
+            make_floor(self.admin, name='South')
+
+        self.assertSnapshotCurrent()
+        stats = get_dashboard_stats()
+        self.assertEqual(stats['pending_complaints'], 1)
+        self.assertEqual(stats['resolved_complaints'], 1)
+        self.assertEqual(stats['approved_applications'], 1)
+        self.assertEqual(stats['students_with_rooms'], 1)
+        self.assertEqual(stats['hostel_count'], 2)
+
+    def test_deletes_move_the_cached_snapshot(self):
+        complaint = Complaint.objects.create(description='Broken fan', student=self.student)
+        Application.objects.create(applicant=self.student)
+        get_dashboard_stats()
+        with self.captureOnCommitCallbacks(execute=True):
+            complaint.delete()
+            make_student('bob', application_status=True).delete()
+            self.student.delete()
+
+        self.assertSnapshotCurrent()
+        self.assertEqual(get_dashboard_stats()['total_students'], 0)
+
+    def test_save_with_deferred_status_drops_the_snapshot(self):
+        Complaint.objects.create(description='Broken fan', student=self.student)
+        get_dashboard_stats()
+        complaint = Complaint.objects.only('id', 'description', 'student').get()
+        with self.captureOnCommitCallbacks(execute=True):
+            Complaint.objects.filter(pk=complaint.pk).update(status='Resolved')
+            complaint.save()
+
+        self.assertFalse(cache.get_many([f'dashboard_stats:{name}' for name in STATS_KEYS]))
+        self.assertEqual(get_dashboard_stats()['resolved_complaints'], 1)
+
+    def test_snapshot_is_not_moved_before_commit(self):
+        get_dashboard_stats()
+        with self.captureOnCommitCallbacks(execute=False):
+            Complaint.objects.create(description='Broken fan', student=self.student)
+        self.assertEqual(get_dashboard_stats()['pending_complaints'], 0)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = make_student('alice')
+        self.complaints = [
+            Complaint.objects.create(description=f'Complaint {i}', student=self.student,
+                                     status='Pending' if i % 2 else 'Resolved')
+            for i in range(25)
+        ]
+        self.newest_first = [complaint.id for complaint in reversed(self.complaints)]
+        self.factory = RequestFactory()
+
+    def page(self, **params):
+        return keyset_paginate(Complaint.objects.all(), self.factory.get('/complaints/', params))
+
+    def test_after_and_before_cursors_walk_the_pages(self):
+        first = self.page(page_size=10)
+        self.assertEqual([c.id for c in first], self.newest_first[:10])
+        self.assertFalse(first.has_previous)
+        self.assertTrue(first.has_next)
+
+        second = self.page(page_size=10, after=first.next_cursor)
+        self.assertEqual([c.id for c in second], self.newest_first[10:20])
+
+        last = self.page(page_size=10, after=second.next_cursor)
+        self.assertEqual([c.id for c in last], self.newest_first[20:])
+        self.assertFalse(last.has_next)
+
+        back = self.page(page_size=10, before=second.prev_cursor)
+        self.assertEqual([c.id for c in back], self.newest_first[:10])
+        self.assertFalse(back.has_previous)
+
+    def test_page_is_one_query_whatever_its_depth(self):
+        cursor = self.newest_first[20]
+        with self.assertNumQueries(1):
+            page = self.page(page_size=2, after=cursor)
+        self.assertEqual([c.id for c in page], self.newest_first[21:23])
+
+    @override_settings(LIST_PAGE_SIZE=5, LIST_PAGE_SIZE_MAX=8)
+    def test_page_size_defaults_and_is_clamped(self):
+        self.assertEqual(len(self.page()), 5)
+        self.assertEqual(len(self.page(page_size=100)), 8)
+        self.assertEqual(len(self.page(page_size='x', after='y')), 5)
+
+    def test_list_view_filters_on_the_server(self):
+        admin = make_admin()
+        self.client.force_login(admin.user)
+        response = self.client.get('/complaints/', {'status': 'Pending', 'page_size': 5})
+        page = response.context['page']
+        self.assertEqual(len(page), 5)
+        self.assertTrue(all(complaint.status == 'Pending' for complaint in page))
+        self.assertContains(response, f'after={page.next_cursor}')
+
+
+class AllocationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.floor = make_floor(make_admin())
+        self.double = Room.objects.create(number='101', floor=self.floor, room_type='AC', occupancy='Double')
+        self.single = Room.objects.create(number='102', floor=self.floor, room_type='Non-AC', occupancy='Single')
+
+    def apply(self, username, room_type='AC', occupancy='Double'):
+        student = make_student(username)
+        return Application.objects.create(applicant=student, room_type=room_type, occupancy=occupancy)
+
+    def test_matches_applications_to_free_beds_of_their_kind(self):
+        applications = [self.apply(name) for name in ('alice', 'bob', 'carol')]
+        self.apply('dave', 'Non-AC', 'Single')
+        self.apply('erin', 'Non-AC', 'Triple')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = allocate_pending_applications()
+
+        self.assertEqual((result['allocated'], result['unmatched']), (3, 2))
+        self.assertEqual(sorted(self.double.residents.values_list('student_id', flat=True)), ['ALICE', 'BOB'])
+        self.assertEqual(list(self.single.residents.values_list('student_id', flat=True)), ['DAVE'])
+        self.assertTrue(Application.objects.get(pk=applications[0].pk).status)
+        self.assertFalse(Application.objects.get(pk=applications[2].pk).status)
+        self.assertTrue(Student.objects.get(student_id='ALICE').application_status)
+        self.double.refresh_from_db()
+        self.assertEqual(self.double.occupied_beds, 2)
+        self.assertEqual(get_dashboard_stats(), repository.dashboard_stats())
+
+    def test_applicant_with_two_applications_is_housed_once(self):
+        application = self.apply('alice')
+        Application.objects.create(applicant=application.applicant, room_type='AC', occupancy='Double')
+
+        result = allocate_pending_applications()
+
+        self.assertEqual(result['allocated'], 1)
+        self.assertEqual(self.double.residents.count(), 1)
+
+    def test_admin_select_all_allocates_the_whole_changelist(self):
+        for name in ('alice', 'bob'):
+            self.apply(name)
+        self.client.force_login(User.objects.create_superuser('root', password='pass'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/admin/hostel/application/', {
+                'action': 'allocate_rooms', 'select_across': '1', 'index': '0',
+                '_selected_action': [Application.objects.first().pk],
+            })
+
+        self.assertEqual(self.double.residents.count(), 2)
+
+    def test_dry_run_writes_nothing(self):
+        self.apply('alice')
+
+        result = allocate_pending_applications(dry_run=True)
+
+        self.assertEqual(result['allocated'], 1)
+        self.assertFalse(self.double.residents.exists())
+        self.assertFalse(Application.objects.filter(status=True).exists())
+
+
+class BedCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.floor = make_floor(make_admin())
+        self.room = Room.objects.create(number='101', floor=self.floor, room_type='AC', occupancy='Triple')
+        self.students = [make_student(name) for name in ('alice', 'bob', 'carol')]
+
+    def assertOccupied(self, beds):
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.occupied_beds, beds)
+        self.assertEqual(self.room.residents.count(), beds)
+        self.assertEqual(RoomStatistic.objects.get(hostel=self.floor.wing.hostel).occupied_beds, beds)
+
+    def test_capacity_follows_occupancy(self):
+        self.assertEqual(self.room.capacity, 3)
+
+    def test_counter_follows_both_sides_of_residents(self):
+        self.room.residents.add(*self.students)
+        self.assertOccupied(3)
+        self.assertFalse(Room.objects.with_free_beds().exists())
+
+        self.room.residents.remove(self.students[0])
+        self.assertOccupied(2)
+        self.assertEqual(list(Room.objects.with_free_beds('AC')), [self.room])
+
+        self.students[1].rooms.clear()
+        self.assertOccupied(1)
+
+        self.room.residents.clear()
+        self.assertOccupied(0)
+
+    def test_deleting_a_resident_frees_their_bed(self):
+        self.room.residents.add(*self.students[:2])
+
+        self.students[0].delete()
+
+        self.assertOccupied(1)
+
+
+class WaitlistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.room = Room.objects.create(number='101', floor=make_floor(make_admin()), room_type='AC', occupancy='Double')
+        self.start = timezone.now()
+        self.students = []
+        # Seniors first, then first come, first served
+        for i, semester in enumerate((1, 5, 5, 3, 8)):
+            student = make_student(f's{i}', semester=semester)
+            self.apply(student, minutes=i)
+            self.students.append(student)
+
+    def apply(self, student, minutes=0):
+        return Application.objects.create(applicant=student, room_type='AC', occupancy='Double',
+                                          submitted_at=self.start + timedelta(minutes=minutes))
+
+    def queue(self):
+        return [applicant_id for _, applicant_id in queue_heads('AC', 'Double', 10)]
+
+    def residents(self):
+        return sorted(self.room.residents.values_list('pk', flat=True))
+
+    def pks(self, *indexes):
+        return sorted(self.students[i].pk for i in indexes)
+
+    def test_queue_order_follows_the_priority(self):
+        self.assertEqual(self.queue(), [self.students[i].pk for i in (4, 1, 2, 3, 0)])
+
+        self.students[0].semester = 9
+        self.students[0].save()
+
+        self.assertEqual(self.queue()[0], self.students[0].pk)
+
+    def test_allocation_houses_the_queue_heads(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            allocate_pending_applications()
+
+        self.assertEqual(self.residents(), self.pks(4, 1))
+        self.assertEqual(self.queue(), [self.students[i].pk for i in (2, 3, 0)])
+
+    def test_freed_beds_go_to_the_queue_head(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            allocate_pending_applications()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.residents.remove(self.students[4])
+        self.assertEqual(self.residents(), self.pks(1, 2))
+        self.assertTrue(Student.objects.get(pk=self.students[2].pk).application_status)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.students[1].delete()
+        self.assertEqual(self.residents(), self.pks(2, 3))
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.occupied_beds, 2)
+        self.assertEqual(self.queue(), [self.students[0].pk])
+
+    def test_full_room_fills_nothing(self):
+        self.room.residents.add(*self.students[:2])
+
+        self.assertEqual(fill_free_beds([self.room.pk]), [])
+        self.assertEqual(len(self.queue()), 3)
+
+    def test_freed_beds_skip_applicants_housed_meanwhile(self):
+        # Housed by a set-based write that left their entry in the queue
+        Student.objects.filter(pk__in=[self.students[4].pk, self.students[1].pk]).update(application_status=True)
+
+        allocations = fill_free_beds([self.room.pk])
+
+        self.assertEqual(sorted(applicant_id for _, applicant_id, _ in allocations), self.pks(2, 3))
+        self.assertEqual(self.residents(), self.pks(2, 3))
+
+    def test_housed_applicants_are_never_queued(self):
+        student = self.students[0]
+        application = Application.objects.get(applicant=student)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.residents.add(student)
+        self.assertNotIn(student.pk, self.queue())
+
+        # Housed by hand: a later save of the application leaves it out
+        student = Student.objects.get(pk=student.pk)
+        student.application_status = True
+        student.save()
+        application.save()
+        self.assertNotIn(student.pk, self.queue())
+
+        student.application_status = False
+        student.save()
+        self.assertIn(student.pk, self.queue())
+
+        student.application_status = True
+        student.save()
+        self.assertFalse(WaitlistEntry.objects.filter(application=application).exists())
+
+    def test_queue_heads_are_distinct_applicants(self):
+        self.apply(self.students[4], minutes=10)
+
+        # Their second application is next in line, but they are housed once
+        heads = queue_heads('AC', 'Double', 2)
+        self.assertEqual([applicant_id for _, applicant_id in heads], [self.students[4].pk, self.students[1].pk])
+        self.assertEqual(len(queue_heads('AC', 'Double', 10)), 5)
+        self.assertEqual(queue_heads('AC', 'Double', 0), [])
+
+
+class RoomStatisticTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        admin = make_admin()
+        self.north, self.south = make_floor(admin, 'North'), make_floor(admin, 'South')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room = Room.objects.create(number='101', floor=self.north, room_type='AC', occupancy='Double')
+            Room.objects.create(number='102', floor=self.north, room_type='Non-AC', occupancy='Single')
+        self.students = [make_student(name) for name in ('alice', 'bob')]
+
+    def summary(self):
+        return sorted(RoomStatistic.objects.values_list(
+            'hostel_id', 'room_type', 'occupancy', 'total_rooms', 'occupied_beds', 'total_capacity',
+        ))
+
+    def assertSummaryCurrent(self):
+        incremental = self.summary()
+        RoomStatistic.objects.rebuild()
+        self.assertEqual(incremental, self.summary())
+
+    def test_residents_move_the_summary(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.residents.add(*self.students)
+        self.assertSummaryCurrent()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.residents.remove(self.students[0])
+        self.assertSummaryCurrent()
+
+    def test_moved_room_moves_its_group(self):
+        self.room.residents.add(self.students[0])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.floor = self.south
+            self.room.occupancy = 'Triple'
+            self.room.save()
+
+        self.assertSummaryCurrent()
+        self.assertTrue(RoomStatistic.objects.filter(hostel=self.south.wing.hostel, occupancy='Triple').exists())
+
+    def test_bulk_created_rooms_are_summarized(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            rooms = Room.objects.bulk_create([
+                Room(number='201', floor=self.south, room_type='AC', occupancy='Triple'),
+                Room(number='103', floor=self.north, room_type='AC', occupancy='Double'),
+            ])
+        self.assertEqual(rooms[0].capacity, 3)
+        self.assertSummaryCurrent()
+
+        # The first resident of a group the summary had no row for
+        RoomStatistic.objects.filter(hostel=self.south.wing.hostel).delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            rooms[0].residents.add(self.students[0])
+        self.assertSummaryCurrent()
+
+    def test_dashboard_charts_read_the_summary_only(self):
+        self.room.residents.add(self.students[0])
+        self.client.force_login(make_admin('matron').user)
+        get_dashboard_stats()
+
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            response = self.client.get('/admin/dashboard/charts/')
+
+        self.assertEqual(response.status_code, 200)
+        tables = ' '.join(query['sql'] for query in queries.captured_queries)
+        self.assertIn('"hostel_roomstatistic"', tables)
+        self.assertNotIn('"hostel_room"', tables)
+        self.assertNotIn('"hostel_room_residents"', tables)
+
+
+class StudentDashboardCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = make_student('alice', application_status=True)
+        self.room = Room.objects.create(number='101', floor=make_floor(make_admin()), room_type='AC', occupancy='Double')
+        self.room.residents.add(self.student)
+        self.complaint = Complaint.objects.create(description='Broken fan', student=self.student)
+
+    def reload(self, change):
+        get_student_dashboard(self.student.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            dashboard = get_student_dashboard(self.student.pk)
+        self.assertTrue(queries.captured_queries, 'the cached dashboard was not dropped')
+        return dashboard
+
+    def test_hit_runs_no_queries(self):
+        get_student_dashboard(self.student.pk)
+        with self.assertNumQueries(0):
+            dashboard = get_student_dashboard(self.student.pk)
+        self.assertEqual(dashboard['room'], self.room)
+        self.assertEqual(dashboard['complaints'], [self.complaint])
+
+    def test_application_and_complaint_changes_drop_the_entry(self):
+        dashboard = self.reload(lambda: Application.objects.create(
+            applicant=self.student, room_type='AC', occupancy='Double'))
+        self.assertIsNotNone(dashboard['application'])
+
+        def resolve():
+            self.complaint.status = 'Resolved'
+            self.complaint.save()
+        self.assertEqual(self.reload(resolve)['complaints'][0].status, 'Resolved')
+
+        self.assertEqual(self.reload(self.complaint.delete)['complaints'], [])
+
+    def test_resident_and_room_changes_drop_the_entry(self):
+        def renumber():
+            self.room.number = '102'
+            self.room.save()
+        self.assertEqual(self.reload(renumber)['room'].number, '102')
+
+        self.assertIsNone(self.reload(lambda: self.room.residents.remove(self.student))['room'])
+        self.assertEqual(self.reload(lambda: self.student.rooms.add(self.room))['room'], self.room)
+        self.assertIsNone(self.reload(self.room.delete)['room'])
+
+    def test_rename_drops_the_entry(self):
+        def rename():
+            self.student.name = 'Alice B'
+            self.student.save()
+        self.assertEqual(self.reload(rename)['student'].name, 'Alice B')
+
+
+class HostelTreeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        admin = make_admin()
+        self.north, self.south = make_floor(admin, 'North'), make_floor(admin, 'South')
+        self.hostel = self.north.wing.hostel
+        self.room = Room.objects.create(number='101', floor=self.north, room_type='AC', occupancy='Double')
+        self.student = make_student('alice')
+        self.room.residents.add(self.student)
+
+    def tree(self, hostel=None):
+        return json.loads(get_hostel_tree_json([(hostel or self.hostel).pk])[0])
+
+    def rooms(self, hostel=None):
+        tree = self.tree(hostel)
+        return [room for wing in tree['wings'] for floor in wing['floors'] for room in floor['rooms']]
+
+    def test_hit_runs_no_queries(self):
+        self.tree()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.rooms()[0]['residents'], [{'student_id': 'ALICE', 'name': 'alice'}])
+
+    def test_query_count_does_not_grow_with_the_rooms(self):
+        # hostels, wings, floors, rooms, residents
+        with self.assertNumQueries(5):
+            load_hostel_trees()
+        students = [make_student(f's{i}') for i in range(10)]
+        for i, student in enumerate(students):
+            Room.objects.create(number=f'2{i:02d}', floor=self.south, occupancy='Single').residents.add(student)
+        with self.assertNumQueries(5):
+            trees = load_hostel_trees()
+        self.assertEqual(sum(len(floor['rooms']) for tree in trees for wing in tree['wings'] for floor in wing['floors']), 11)
+
+    def test_residents_and_renames_drop_the_tree(self):
+        self.tree()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.residents.remove(self.student)
+        self.assertEqual(self.rooms()[0]['residents'], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.rooms.add(self.room)
+        self.tree()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.name = 'Alice B'
+            self.student.save()
+        self.assertEqual(self.rooms()[0]['residents'][0]['name'], 'Alice B')
+
+    def test_room_changes_drop_the_tree(self):
+        self.tree()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.number = '102'
+            self.room.save()
+        self.assertEqual(self.rooms()[0]['number'], '102')
+
+        # A move drops the trees of both hostels
+        south = self.south.wing.hostel
+        self.tree(south)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.floor = self.south
+            self.room.save()
+        self.assertEqual(self.rooms(), [])
+        self.assertEqual([room['number'] for room in self.rooms(south)], ['102'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.delete()
+        self.assertEqual(self.rooms(south), [])
+
+    def test_wing_and_floor_changes_drop_the_tree(self):
+        south = self.south.wing.hostel
+        self.tree()
+        self.tree(south)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.north.wing = self.south.wing
+            self.north.save()
+        self.assertEqual(self.tree()['wings'][0]['floors'], [])
+        self.assertEqual(len(self.tree(south)['wings'][0]['floors']), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Wing.objects.create(name='B', hostel=self.hostel)
+            self.south.wing.name = 'South A'
+            self.south.wing.save()
+        self.assertEqual([wing['name'] for wing in self.tree()['wings']], ['A', 'B'])
+        self.assertEqual(self.tree(south)['wings'][0]['name'], 'South A')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.north.delete()
+        self.assertEqual(len(self.tree(south)['wings'][0]['floors']), 1)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        admin = make_admin()
+        student = make_student('alice')
+        Complaint.objects.create(description='Broken fan', student=student)
+        Complaint.objects.create(description='=HYPERLINK("http://example.com","Click")', student=student)
+        Application.objects.create(applicant=student, room_type='AC', occupancy='Double')
+        self.client.force_login(admin.user)
+
+    def export(self, dataset, fmt):
+        response = self.client.get(f'/export/{dataset}/', {'format': fmt})
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_has_the_header_first_and_the_repository_rows(self):
+        for dataset, rows in (('complaints', repository.complaints), ('applications', repository.applications)):
+            with self.subTest(dataset=dataset):
+                expected = list(rows())
+                lines = list(csv.reader(io.StringIO(self.export(dataset, 'csv'))))
+                self.assertEqual(lines[0], list(expected[0]))
+                self.assertEqual(len(lines), 1 + len(expected))
+                for line, row in zip(lines[1:], expected):
+                    self.assertEqual([value.removeprefix("'") for value in line], [str(value) for value in row.values()])
+
+    def test_header_is_sent_before_the_query_runs(self):
+        lines = stream_export('complaints', 'csv')
+        with self.assertNumQueries(0):
+            self.assertEqual(next(lines), 'id,description,status,student_id,student_name,student_email\r\n')
+
+    def test_csv_neutralizes_formulas(self):
+        lines = list(csv.DictReader(io.StringIO(self.export('complaints', 'csv'))))
+        self.assertEqual(
+            sorted(line['description'] for line in lines),
+            ['\'=HYPERLINK("http://example.com","Click")', 'Broken fan'],
+        )
+
+    def test_jsonl_rows_match_the_repository_rows(self):
+        for dataset, rows in (('complaints', repository.complaints), ('applications', repository.applications)):
+            with self.subTest(dataset=dataset):
+                lines = self.export(dataset, 'jsonl').splitlines()
+                self.assertEqual([json.loads(line) for line in lines], list(rows()))
+
+
+class ServeFileTests(TestCase):
+    content = b'0123456789'
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.pdf')
+        with os.fdopen(handle, 'wb') as f:
+            f.write(self.content)
+        self.addCleanup(os.remove, self.path)
+        self.factory = RequestFactory()
+
+    def serve(self, **headers):
+        request = self.factory.get('/download_voucher/', **headers)
+        response = serve_file(request, self.path, 'application/pdf', 'voucher.pdf')
+        self.addCleanup(response.close)
+        return response
+
+    def test_full_response_carries_validators(self):
+        response = self.serve()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="voucher.pdf"')
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+    def test_unchanged_file_is_not_sent_again(self):
+        full = self.serve()
+        self.assertEqual(self.serve(HTTP_IF_NONE_MATCH=full['ETag']).status_code, 304)
+        self.assertEqual(self.serve(HTTP_IF_MODIFIED_SINCE=full['Last-Modified']).status_code, 304)
+        self.assertEqual(self.serve(HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_single_byte_ranges(self):
+        response = self.serve(HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+
+        response = self.serve(HTTP_RANGE='bytes=-3')
+        self.assertEqual(b''.join(response.streaming_content), b'789')
+
+        # Malformed or multi-range headers get the whole file
+        self.assertEqual(self.serve(HTTP_RANGE='bytes=0-1,4-5').status_code, 200)
+
+    def test_unsatisfiable_range(self):
+        response = self.serve(HTTP_RANGE='bytes=20-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_if_range_only_resumes_the_same_file(self):
+        etag = self.serve()['ETag']
+        self.assertEqual(self.serve(HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE=etag).status_code, 206)
+        self.assertEqual(self.serve(HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE='"stale"').status_code, 200)
+
+    def test_sendfile_offload(self):
+        root = os.path.dirname(self.path)
+        with self.settings(SENDFILE_BACKEND='x-accel-redirect', SENDFILE_ROOT=root, SENDFILE_URL='/protected/'):
+            response = self.serve()
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected/{os.path.basename(self.path)}')
+        self.assertEqual(response.content, b'')
+
+
+class ComplaintSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = make_student('alice')
+        self.leak = Complaint.objects.create(description='Leaking tap in wing B washroom', student=self.student)
+        self.tap = Complaint.objects.create(description='Tap broken', student=self.student, status='Resolved')
+        self.fan = Complaint.objects.create(description='Fan noisy', student=self.student)
+
+    def ids(self, query, **kwargs):
+        return [complaint.id for complaint in search_complaints(query, **kwargs)]
+
+    def test_any_term_matches_and_more_terms_rank_first(self):
+        self.assertEqual(self.ids('leaking tap wing B'), [self.leak.id, self.tap.id])
+        self.assertEqual(self.ids('leak'), [self.leak.id])
+        self.assertEqual(self.ids('tap', status='Resolved'), [self.tap.id])
+        self.assertEqual(self.ids('zzz'), [])
+
+    def test_query_syntax_is_treated_as_words(self):
+        Complaint.objects.create(description='Door will not lock', student=self.student)
+        self.assertEqual(self.ids('"NOT * ('), self.ids('not'))
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        self.fan.description = 'Tap dripping'
+        self.fan.save()
+        self.assertIn(self.fan.id, self.ids('tap'))
+
+        # Set-based writes are indexed by the database's own triggers
+        Complaint.objects.filter(pk=self.leak.pk).update(description='Window stuck')
+        self.assertEqual(self.ids('window'), [self.leak.id])
+        self.assertNotIn(self.leak.id, self.ids('leaking'))
+        created = Complaint.objects.bulk_create([Complaint(description='Window cracked', student=self.student)])
+        self.assertEqual(len(self.ids('window')), 1 + len(created))
+
+        fan_id = self.fan.id
+        self.fan.delete()
+        self.assertNotIn(fan_id, self.ids('tap'))
+
+
+class TriageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = make_admin()
+        self.student = make_student('alice')
+        self.complaints = [
+            Complaint.objects.create(description=f'Complaint {i}', student=self.student) for i in range(6)
+        ]
+        self.ids = [complaint.id for complaint in self.complaints]
+
+    def statuses(self):
+        return list(Complaint.objects.order_by('id').values_list('status', flat=True))
+
+    def test_moves_and_audits_the_selection(self):
+        get_dashboard_stats()
+        get_student_dashboard(self.student.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            moved = transition_complaints('In Progress', self.ids[:4], changed_by_id=self.admin.pk)
+
+        self.assertEqual(moved, {'Pending': 4})
+        self.assertEqual(self.statuses(), ['In Progress'] * 4 + ['Pending'] * 2)
+        self.assertEqual(
+            sorted(ComplaintStatusChange.objects.values_list('complaint_id', 'old_status', 'new_status', 'changed_by_id')),
+            [(pk, 'Pending', 'In Progress', self.admin.pk) for pk in self.ids[:4]],
+        )
+        self.assertEqual(get_dashboard_stats(), repository.dashboard_stats())
+        dashboard = get_student_dashboard(self.student.pk)
+        self.assertEqual(sum(complaint.status == 'In Progress' for complaint in dashboard['complaints']), 4)
+
+    def test_resolving_moves_every_open_status_once(self):
+        transition_complaints('In Progress', self.ids[:2])
+
+        moved = transition_complaints('Resolved', self.ids[1:4])
+
+        self.assertEqual(moved, {'Pending': 2, 'In Progress': 1})
+        self.assertEqual(self.statuses(), ['In Progress'] + ['Resolved'] * 3 + ['Pending'] * 2)
+        self.assertEqual(ComplaintStatusChange.objects.filter(new_status='Resolved').count(), 3)
+        # Already moved: nothing is moved or audited twice
+        self.assertEqual(transition_complaints('Resolved', self.ids[1:4]), {})
+        self.assertEqual(ComplaintStatusChange.objects.count(), 5)
+
+    def test_scope_all_uses_set_based_statements(self):
+        Complaint.objects.filter(pk=self.ids[0]).update(status='In Progress')
+
+        # savepoint, student ids, audit INSERT ... SELECT, UPDATE, release
+        with self.assertNumQueries(5):
+            moved = transition_complaints('Resolved', from_status='Pending')
+
+        self.assertEqual(moved, {'Pending': 5})
+        self.assertEqual(self.statuses(), ['In Progress'] + ['Resolved'] * 5)
+        self.assertEqual(ComplaintStatusChange.objects.count(), 5)
+
+    def test_queryset_selection_binds_no_ids(self):
+        selection = Complaint.objects.filter(id__in=Complaint.objects.filter(pk__gte=self.ids[2]).values('id'))
+
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            moved = transition_complaints('Resolved', selection)
+
+        self.assertEqual(moved, {'Pending': 4})
+        self.assertEqual(self.statuses(), ['Pending'] * 2 + ['Resolved'] * 4)
+        update = next(query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE'))
+        self.assertIn('IN (SELECT', update)
+        self.assertNotRegex(update, r'IN \(\d')
+
+    def test_admin_select_all_moves_the_whole_changelist(self):
+        superuser = User.objects.create_superuser('root', password='pass')
+        self.client.force_login(superuser)
+        self.complaints[0].status = 'Resolved'
+        self.complaints[0].save()
+
+        self.client.post('/admin/hostel/complaint/?status__exact=Pending', {
+            'action': 'mark_in_progress', 'select_across': '1', 'index': '0',
+            '_selected_action': [self.ids[-1]],
+        })
+
+        self.assertEqual(self.statuses(), ['Resolved'] + ['In Progress'] * 5)
+
+    @skipUnless(importlib.util.find_spec('cx_Oracle'), 'cx_Oracle is not installed')
+    def test_procedures_take_a_queryset_selection_in_chunks(self):
+        with mock.patch('hostel.triage.repository.use_procedures', return_value=True), \
+                mock.patch('hostel.triage.PROCEDURE_CHUNK_SIZE', 4), \
+                mock.patch('hostel.db_utils.call_transition_complaints', return_value=[2, 1]) as call:
+            moved = transition_complaints('Resolved', Complaint.objects.all())
+
+        self.assertEqual([len(args[0]) for args, _ in call.call_args_list], [4, 2])
+        self.assertEqual(moved, {'Pending': 4, 'In Progress': 2})
+
+    def test_rejects_transitions_it_does_not_allow(self):
+        with self.assertRaises(ValueError):
+            transition_complaints('Pending', self.ids)
+        with self.assertRaises(ValueError):
+            transition_complaints('In Progress', self.ids, from_status='Resolved')
+        self.assertFalse(ComplaintStatusChange.objects.exists())
+
+    def test_view_moves_every_complaint_in_the_filter(self):
+        self.client.force_login(self.admin.user)
+        response = self.client.post('/complaints/triage/', {
+            'status': 'Resolved', 'scope': 'all', 'from_status': 'Pending', 'querystring': 'status=Pending',
+        })
+        self.assertRedirects(response, '/complaints/?status=Pending', fetch_redirect_response=False)
+        self.assertEqual(self.statuses(), ['Resolved'] * 6)
+        self.assertEqual(set(ComplaintStatusChange.objects.values_list('changed_by_id', flat=True)), {self.admin.pk})
+
+
+@use_replica
+def read_alias_view(request):
+    return HttpResponse(router.db_for_read(Complaint))
+
+
+@mock.patch('hostel.replica.replica_configured', return_value=True)
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def test_replica_views_read_from_the_replica(self, configured):
+        response = read_alias_view(self.factory.get('/'))
+        self.assertEqual(response.content.decode(), 'replica')
+        self.assertEqual(router.db_for_read(Complaint), DEFAULT_DB_ALIAS)
+        self.assertEqual(router.db_for_write(Complaint), DEFAULT_DB_ALIAS)
+
+    def test_pin_cookie_keeps_reads_on_the_primary(self, configured):
+        request = self.factory.get('/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        self.assertEqual(read_alias_view(request).content.decode(), DEFAULT_DB_ALIAS)
+
+    @override_settings(REPLICA_PIN_SECONDS=10)
+    def test_unsafe_requests_set_the_pin_cookie(self, configured):
+        middleware = ReplicaPinMiddleware(lambda request: HttpResponse())
+        response = middleware(self.factory.post('/'))
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], 10)
+        self.assertNotIn(PIN_COOKIE, middleware(self.factory.get('/')).cookies)
+
+        configured.return_value = False
+        self.assertNotIn(PIN_COOKIE, middleware(self.factory.post('/')).cookies)
+
+    def test_cached_list_rows_are_rendered_from_the_primary(self, configured):
+        admin, student = make_admin(), make_student('alice')
+        Complaint.objects.create(description='Broken fan', student=student)
+        Application.objects.create(applicant=student, room_type='AC', occupancy='Double')
+        self.client.force_login(admin.user)
+        for url in ('/complaints/', '/applications/'):
+            self.assertContains(self.client.get(url), 'alice')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            student.name = 'Alice Renamed'
+            student.save()
+
+        for url in ('/complaints/', '/applications/'):
+            with self.subTest(url=url), CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+                self.assertContains(self.client.get(url), 'Alice Renamed')
+                self.assertTrue(any('hostel_' in query['sql'] for query in queries.captured_queries))
+
+    def test_shared_dashboard_snapshot_is_computed_on_the_primary(self, configured):
+        with replica_reads(), CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            stats = get_dashboard_stats()
+        self.assertTrue(queries.captured_queries)
+        self.assertEqual(stats, repository.dashboard_stats())
+
+
+class ConditionalJsonTests(TestCase):
+    urls = ('/admin/dashboard/stats/', '/admin/dashboard/charts/', '/complaints/search/?q=water')
+
+    def setUp(self):
+        cache.clear()
+        self.admin = make_admin()
+        self.student = make_student('alice')
+        self.client.force_login(self.admin.user)
+
+    def test_unchanged_tables_answer_with_304(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('private', response['Cache-Control'])
+                self.assertIn('no-cache', response['Cache-Control'])
+                # Session and user only: no query reads the data
+                with self.assertNumQueries(2):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(response.status_code, 304)
+
+    def test_committed_writes_change_the_etag(self):
+        etags = {url: self.client.get(url)['ETag'] for url in self.urls}
+        with self.captureOnCommitCallbacks(execute=True):
+            complaint = Complaint.objects.create(description='Water leak', student=self.student)
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], etags[url])
+                etags[url] = response['ETag']
+
+        # Set-based writes bump the counters too
+        with self.captureOnCommitCallbacks(execute=True):
+            transition_complaints('Resolved', [complaint.pk])
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etags[url]).status_code, 200)
+
+    def test_search_etag_varies_with_the_query(self):
+        self.assertNotEqual(
+            self.client.get('/complaints/search/?q=water')['ETag'],
+            self.client.get('/complaints/search/?q=fan')['ETag'],
+        )
+
+    def test_evicted_counters_never_match_an_old_etag(self):
+        etag = self.client.get(self.urls[0])['ETag']
+        cache.clear()
+        self.assertEqual(self.client.get(self.urls[0], HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_error_responses_carry_no_etag(self):
+        with mock.patch('hostel.stats.get_dashboard_stats', side_effect=RuntimeError('down')):
+            response = self.client.get(self.urls[0])
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(response.has_header('ETag'))
+
+
+@skipUnless(importlib.util.find_spec('cx_Oracle'), 'cx_Oracle is not installed')
+@override_settings(ORACLE_POOL={
+    'ENABLED': True, 'MIN': 2, 'MAX': 4, 'INCREMENT': 1,
+    'WAIT_TIMEOUT': 1000, 'IDLE_TIMEOUT': 60, 'PING_INTERVAL': 30,
+})
+class OraclePoolTests(TestCase):
+    def setUp(self):
+        from hostel import oracle_pool
+
+        self.oracle_pool = oracle_pool
+        patcher = mock.patch('hostel.oracle_pool.cx_Oracle.SessionPool')
+        self.SessionPool = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = self.SessionPool.return_value
+        self.pool.configure_mock(opened=3, busy=1, min=2, max=4, increment=1)
+        self.addCleanup(oracle_pool.close_pool)
+
+    def test_pool_is_created_once_with_the_configured_sizes(self):
+        with mock.patch('hostel.oracle_pool.atexit.register') as register:
+            self.assertIs(self.oracle_pool.get_pool(), self.pool)
+            self.assertIs(self.oracle_pool.get_pool(), self.pool)
+
+        self.SessionPool.assert_called_once()
+        self.assertEqual(
+            {name: self.SessionPool.call_args.kwargs[name] for name in ('min', 'max', 'increment')},
+            {'min': 2, 'max': 4, 'increment': 1},
+        )
+        register.assert_called_once_with(self.oracle_pool.close_pool)
+
+    def test_borrowed_sessions_are_always_released(self):
+        with self.assertRaises(RuntimeError):
+            with self.oracle_pool.pooled_connection() as conn:
+                raise RuntimeError('query failed')
+        self.pool.release.assert_called_once_with(conn)
+
+    def test_health_check_pings_a_pooled_session(self):
+        self.assertTrue(self.oracle_pool.check_pool())
+        self.pool.acquire.return_value.ping.assert_called_once()
+
+        self.pool.acquire.side_effect = self.oracle_pool.cx_Oracle.DatabaseError('ORA-12541')
+        self.assertFalse(self.oracle_pool.check_pool())
+
+    def test_stats_have_the_same_keys_before_and_after_the_pool_exists(self):
+        before = self.oracle_pool.pool_stats()
+        self.assertEqual(before, {'enabled': True, 'opened': 0, 'busy': 0, 'min': 2, 'max': 4, 'increment': 1})
+
+        self.oracle_pool.get_pool()
+        after = self.oracle_pool.pool_stats()
+        self.assertEqual(after, {**before, 'opened': 3, 'busy': 1})
+
+    def test_close_pool_closes_the_sessions(self):
+        self.oracle_pool.get_pool()
+
+        self.oracle_pool.close_pool()
+
+        self.pool.close.assert_called_once_with(force=True)
+        self.assertEqual(self.oracle_pool.pool_stats()['opened'], 0)
+
+    def test_check_command(self):
+        out = io.StringIO()
+        call_command('check_oracle_pool', stdout=out)
+        self.assertIn('3 open, 1 busy', out.getvalue())
+
+        self.pool.acquire.side_effect = self.oracle_pool.cx_Oracle.DatabaseError('ORA-12541')
+        with self.assertRaises(CommandError):
+            call_command('check_oracle_pool', stdout=io.StringIO())
+
+        with self.settings(ORACLE_POOL={**self.oracle_pool.settings.ORACLE_POOL, 'ENABLED': False}):
+            with self.assertRaises(CommandError):
+                call_command('check_oracle_pool', stdout=io.StringIO())
+
+
+@override_settings(SQL_INSTRUMENTATION=True, SQL_QUERY_BUDGET=3)
+class QueryInstrumentationTests(TestCase):
+    def setUp(self):
+        self.student = make_student('alice')
+        self.factory = RequestFactory()
+
+    def respond(self, queries):
+        def view(request):
+            for _ in range(queries):
+                Student.objects.filter(pk=self.student.pk).exists()
+            return HttpResponse()
+        return QueryInstrumentationMiddleware(view)(self.factory.get('/complaints/'))
+
+    def test_server_timing_reports_the_queries(self):
+        with self.assertLogs('hostel.middleware', 'INFO') as logs:
+            response = self.respond(2)
+
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="2 queries, 1 repeated", app;dur=[\d.]+$')
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(logs.records[0].levelname, 'INFO')
+        self.assertIn('path=/complaints/ status=200 queries=2', logs.output[0])
+
+    def test_requests_over_budget_are_warnings_with_the_repeated_statement(self):
+        with self.assertLogs('hostel.middleware', 'WARNING') as logs:
+            self.respond(5)
+
+        self.assertIn('queries=5', logs.output[0])
+        self.assertIn('over_budget=3', logs.output[0])
+        self.assertRegex(logs.output[0], r'top=[0-9a-f]{10}x5')
+        self.assertIn('user_student', logs.output[1])
+
+    @override_settings(SQL_INSTRUMENTATION=False)
+    def test_disabled_middleware_is_dropped(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryInstrumentationMiddleware(lambda request: HttpResponse())
+
+
+class AsyncViewTests(TestCase):
+    # Masked CSRF tokens differ on every render
+    CSRF_RE = re.compile(r'name="csrfmiddlewaretoken" value="[^"]+"')
+
+    def setUp(self):
+        cache.clear()
+        self.admin = make_admin()
+        self.student = make_student('alice', application_status=True)
+        room = Room.objects.create(number='101', floor=make_floor(self.admin), room_type='AC', occupancy='Double')
+        room.residents.add(self.student)
+        Complaint.objects.create(description='Broken fan', student=self.student)
+        Complaint.objects.create(description='Leaking tap', student=self.student, status='Resolved')
+        Application.objects.create(applicant=self.student, room_type='AC', occupancy='Double')
+
+    def assertSameOutput(self, url, **params):
+        sync = self.client.get(url, params)
+        # Cold cache for the async view too, so both load from the database
+        cache.clear()
+        asynchronous = self.client.get(f'/async{url}', params)
+        self.assertEqual(sync.status_code, 200)
+        self.assertEqual(asynchronous.status_code, 200)
+        self.assertEqual(self.CSRF_RE.sub('', asynchronous.content.decode()), self.CSRF_RE.sub('', sync.content.decode()))
+        return sync
+
+    def test_student_dashboard(self):
+        self.client.force_login(self.student.user)
+        self.assertContains(self.assertSameOutput('/student/dashboard/'), 'Leaking tap')
+
+    def test_admin_pages(self):
+        self.client.force_login(self.admin.user)
+        self.assertSameOutput('/admin/dashboard/')
+        self.assertSameOutput('/complaints/')
+        self.assertSameOutput('/complaints/', status='Resolved', page_size=1)
+        self.assertContains(self.assertSameOutput('/complaints/', q='fan'), 'Broken fan')
+        self.assertSameOutput('/applications/', status='pending')
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.emitted = []
+
+    def emit(self, record):
+        self.emitted.append((self.format(record), threading.current_thread()))
+
+
+class LoggingPipelineTests(TestCase):
+    def record(self, level):
+        return logging.LogRecord('hostel.access', level, __file__, 1, 'page view', None, None)
+
+    def test_sampling_keeps_a_share_of_info_records(self):
+        sampler = SamplingFilter(rate=0.25)
+        with mock.patch('hostel.log_handlers.random.random', side_effect=[0.1, 0.5]):
+            self.assertTrue(sampler.filter(self.record(logging.INFO)))
+            self.assertFalse(sampler.filter(self.record(logging.INFO)))
+        self.assertTrue(SamplingFilter(rate=1).filter(self.record(logging.DEBUG)))
+
+    def test_warnings_are_never_sampled_out(self):
+        sampler = SamplingFilter(rate=0)
+        for level in (logging.WARNING, logging.ERROR, logging.CRITICAL):
+            self.assertTrue(sampler.filter(self.record(level)))
+        self.assertFalse(sampler.filter(self.record(logging.INFO)))
+
+    def test_queued_handlers_write_on_a_listener_thread(self):
+        recording = RecordingHandler()
+        self.addCleanup(configure_logging, settings.LOGGING)
+        self.addCleanup(stop_listeners)
+        with self.settings(LOG_QUEUED=True):
+            configure_logging({
+                'version': 1,
+                'disable_existing_loggers': False,
+                'formatters': {'plain': {'format': '%(levelname)s %(message)s'}},
+                'handlers': {'recording': {'()': lambda: recording, 'formatter': 'plain'}},
+                'loggers': {'hostel.tests.queued': {'handlers': ['recording'], 'level': 'INFO', 'propagate': False}},
+            })
+        logger = logging.getLogger('hostel.tests.queued')
+        self.assertEqual([type(handler) for handler in logger.handlers], [DeferredQueueHandler])
+
+        logger.info('Moved %s complaints', 3)
+        stop_listeners()
+
+        self.assertEqual(len(recording.emitted), 1)
+        message, thread = recording.emitted[0]
+        self.assertEqual(message, 'INFO Moved 3 complaints')
+        self.assertIsNot(thread, threading.current_thread())
@@ -0,0 +1,154 @@
+"""
+Bulk complaint triage for HostelMS.
+
+Moves many complaints forward (Pending -> In Progress -> Resolved) in one
+call and one transaction. Each (from, to) transition is two set-based
+statements built from the same filter: an INSERT ... SELECT writing the
+audit rows and a filtered UPDATE, so no complaint ids travel to Python or
+back however many match; a selection given as a queryset (an admin
+action's "select all") is applied as a subquery. On Oracle the same work is done by the
+complaint_triage procedures in a single call for every source status;
+they do not commit, so a failure leaves nothing half moved. Neither path
+sends model signals, so the dashboard counters and the affected students'
+cached dashboards are updated here once the changes commit.
+"""
+import logging
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Union
+
+from django.db import DatabaseError, connection, transaction
+from django.db.models import DateTimeField, IntegerField, QuerySet, Value
+from django.utils import timezone
+
+from . import repository
+from .models import Complaint, ComplaintStatusChange
+from .stats import COMPLAINT_STATUS_KEYS, adjust_dashboard_stats
+from .student_cache import invalidate_student_dashboards
+from .versions import COMPLAINTS, bump_versions
+
+logger = logging.getLogger(__name__)
+
+# Target status -> statuses a complaint may move to it from
+TRANSITIONS = {
+    'In Progress': ('Pending',),
+    'Resolved': ('Pending', 'In Progress'),
+}
+
+# Ids bound per procedure call when a queryset selection is moved on Oracle
+PROCEDURE_CHUNK_SIZE = 1000
+
+
+def _orm_transition(selection: Union[List[int], QuerySet, None], old: str, new: str,
+                    changed_by_id: Optional[int]) -> int:
+    """Move the selected complaints in status ``old`` to ``new``; returns how many moved."""
+    queryset = Complaint.objects.filter(status=old)
+    if selection is not None:
+        queryset = queryset.filter(id__in=selection)
+
+    audit = queryset.order_by().values_list(
+        'id',
+        Value(old),
+        Value(new),
+        Value(changed_by_id, output_field=IntegerField()),
+        Value(timezone.now(), output_field=DateTimeField()),
+    )
+    sql, params = audit.query.sql_with_params()
+    opts = ComplaintStatusChange._meta
+    columns = ', '.join(
+        connection.ops.quote_name(opts.get_field(name).column)
+        for name in ('complaint', 'old_status', 'new_status', 'changed_by', 'changed_at')
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f'INSERT INTO {connection.ops.quote_name(opts.db_table)} ({columns}) {sql}', params)
+        audited = cursor.rowcount
+
+    moved = queryset.update(status=new)
+    if moved != audited:
+        # A concurrent write changed the selection between the two statements
+        raise DatabaseError(f'{audited} complaints audited but {moved} moved from {old!r}; nothing was changed')
+    return moved
+
+
+def _procedure_transition(selection: Union[List[int], QuerySet, None], sources, new_status: str,
+                          changed_by_id: Optional[int]) -> List[int]:
+    """Move the selected complaints with the complaint_triage procedures; returns the counts per source."""
+    from . import db_utils
+
+    if not isinstance(selection, QuerySet):
+        return db_utils.call_transition_complaints(selection, sources, new_status, changed_by_id)
+
+    # The procedures take id arrays: bind a queryset's ids a chunk at a time
+    counts = [0] * len(sources)
+    ids = selection.values_list('id', flat=True).iterator(chunk_size=PROCEDURE_CHUNK_SIZE)
+    while chunk := list(islice(ids, PROCEDURE_CHUNK_SIZE)):
+        moved = db_utils.call_transition_complaints(chunk, sources, new_status, changed_by_id)
+        counts = [total + count for total, count in zip(counts, moved)]
+    return counts
+
+
+def transition_complaints(new_status: str, complaint_ids: Union[Iterable[int], QuerySet, None] = None,
+                          from_status: Optional[str] = None,
+                          changed_by_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Move a set of complaints to ``new_status``.
+
+    Complaints already at or past ``new_status`` are left alone, so the
+    same selection can be submitted twice without double-counting.
+
+    Args:
+        new_status: Target status ('In Progress' or 'Resolved')
+        complaint_ids: Complaints to move, as ids or as a Complaint
+            queryset (filtered in the database, never loaded); None selects
+            every complaint in an allowed source status
+        from_status: Only move complaints currently in this status
+        changed_by_id: Admin recorded on the audit rows
+
+    Returns:
+        Dict[str, int]: Number of complaints moved, per source status
+
+    Raises:
+        ValueError: If the transition is not allowed
+    """
+    sources = TRANSITIONS.get(new_status)
+    if sources is None:
+        raise ValueError(f'Complaints cannot be moved to {new_status!r}')
+    if from_status is not None:
+        if from_status not in sources:
+            raise ValueError(f'Complaints cannot be moved from {from_status!r} to {new_status!r}')
+        sources = (from_status,)
+
+    if isinstance(complaint_ids, QuerySet):
+        selection = complaint_ids.order_by().values('id')
+    elif complaint_ids is not None:
+        selection = sorted({int(pk) for pk in complaint_ids})
+        if not selection:
+            return {}
+    else:
+        selection = None
+
+    filters = {'status__in': sources}
+    if selection is not None:
+        filters['id__in'] = selection
+
+    with transaction.atomic():
+        # Read while the complaints are still in a source status
+        student_ids = set(
+            Complaint.objects.filter(**filters).order_by().values_list('student_id', flat=True).distinct()
+        )
+        if repository.use_procedures():
+            counts = _procedure_transition(selection, sources, new_status, changed_by_id)
+        else:
+            counts = [_orm_transition(selection, old, new_status, changed_by_id) for old in sources]
+        moved = {old: count for old, count in zip(sources, counts) if count}
+
+        if moved:
+            deltas = Counter({COMPLAINT_STATUS_KEYS[new_status]: sum(moved.values())})
+            for old, count in moved.items():
+                deltas[COMPLAINT_STATUS_KEYS[old]] -= count
+            transaction.on_commit(lambda: adjust_dashboard_stats(dict(deltas)))
+            transaction.on_commit(lambda: invalidate_student_dashboards(student_ids))
+            bump_versions(COMPLAINTS)
+
+    logger.info('Moved %s complaints to %s (%s)', sum(moved.values()), new_status, moved or 'none')
+    return moved
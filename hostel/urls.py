@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import views, async_views
 
 urlpatterns = [
     # Student URLs
@@ -11,6 +11,19 @@ urlpatterns = [
 
     # Admin URLs
     path('admin/dashboard/', views.admin_dashboard, name='admin_dashboard'),
+    path('admin/dashboard/stats/', views.dashboard_stats, name='dashboard_stats'),
+    path('admin/dashboard/charts/', views.dashboard_charts, name='dashboard_charts'),
     path('complaints/', views.fetch_complaints, name='fetch_complaints'),
+    path('complaints/search/', views.search_complaints, name='search_complaints'),
+    path('complaints/triage/', views.triage_complaints, name='triage_complaints'),
     path('applications/', views.fetch_applications, name='fetch_applications'),
+    path('export/<str:dataset>/', views.export_data, name='export_data'),
+    path('hostels/tree/', views.hostel_tree, name='hostel_tree'),
+    path('hostels/<int:hostel_id>/tree/', views.hostel_tree, name='hostel_tree_detail'),
+
+    # Async variants, for deployments behind an ASGI server
+    path('async/student/dashboard/', async_views.student_dashboard, name='async_student_dashboard'),
+    path('async/admin/dashboard/', async_views.admin_dashboard, name='async_admin_dashboard'),
+    path('async/complaints/', async_views.fetch_complaints, name='async_fetch_complaints'),
+    path('async/applications/', async_views.fetch_applications, name='async_fetch_applications'),
 ]
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+Table version counters and conditional GETs for HostelMS JSON endpoints.
+
+Every write to a table that feeds the admin JSON endpoints bumps that
+table's counter in the cache once the write commits: model signals for
+saves and deletes, and the set-based paths (triage, allocation, bed
+recounts, sample data) explicitly. An endpoint's strong ETag is a hash of
+the counters of the tables it reads, so checking whether a poll can be
+answered with 304 Not Modified costs one cache read and no SQL.
+
+A counter missing from the cache (evicted or never set) starts again from
+the current time rather than from zero, so an ETag handed out before the
+eviction cannot match data written after it.
+"""
+import hashlib
+import time
+from functools import wraps
+from typing import Dict, Iterable, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+COMPLAINTS = 'complaints'
+APPLICATIONS = 'applications'
+STUDENTS = 'students'
+ROOMS = 'rooms'
+HOSTELS = 'hostels'
+
+TABLES = (COMPLAINTS, APPLICATIONS, STUDENTS, ROOMS, HOSTELS)
+
+# Table bumped when a row of the model is saved or deleted, by model label
+MODEL_TABLES = {
+    'hostel.complaint': COMPLAINTS,
+    'hostel.application': APPLICATIONS,
+    'user.student': STUDENTS,
+    'hostel.room': ROOMS,
+    'hostel.hostel': HOSTELS,
+}
+
+CACHE_PREFIX = 'table_version:'
+
+
+def _cache_key(table: str) -> str:
+    return f'{CACHE_PREFIX}{table}'
+
+
+def _seed() -> int:
+    return time.time_ns()
+
+
+def _bump(tables: Iterable[str]) -> None:
+    for table in set(tables):
+        key = _cache_key(table)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Not in the cache: restart from a value no earlier counter had
+            cache.set(key, _seed(), None)
+
+
+def bump_versions(*tables: str, using: Optional[str] = None) -> None:
+    """
+    Bump the version counters of ``tables`` once the current transaction commits.
+
+    Args:
+        *tables: Table names from TABLES
+        using: Database alias of the transaction
+    """
+    transaction.on_commit(lambda: _bump(tables), using=using)
+
+
+def model_changed(model, using) -> None:
+    """A row of ``model`` was saved or deleted; see MODEL_TABLES."""
+    bump_versions(MODEL_TABLES[model._meta.label_lower], using=using)
+
+
+def get_versions(tables: Iterable[str]) -> Dict[str, int]:
+    """
+    Current version counters of ``tables``, read with one cache call.
+
+    Returns:
+        Dict[str, int]: Counter per table name
+    """
+    tables = tuple(tables)
+    cached = cache.get_many([_cache_key(table) for table in tables])
+    versions = {}
+    for table in tables:
+        version = cached.get(_cache_key(table))
+        if version is None:
+            version = _seed()
+            # add(), so a counter set concurrently is not overwritten
+            if not cache.add(_cache_key(table), version, None):
+                version = cache.get(_cache_key(table), version)
+        versions[table] = version
+    return versions
+
+
+def table_etag(tables: Iterable[str], *parts) -> str:
+    """
+    Strong, quoted ETag for a response built from ``tables``.
+
+    Args:
+        tables: Tables the response is read from
+        *parts: Anything else the response depends on (e.g. query parameters)
+    """
+    versions = get_versions(tables)
+    source = '|'.join([f'{table}:{versions[table]}' for table in sorted(versions)] + [str(part) for part in parts])
+    return quote_etag(hashlib.md5(source.encode(), usedforsecurity=False).hexdigest())
+
+
+def versioned(*tables: str, vary_on_query: bool = False):
+    """
+    Decorator answering GETs of a JSON view with 304 while ``tables`` are unchanged.
+
+    Like django.views.decorators.http.condition, but the ETag is only
+    attached to successful responses, so an error body is never
+    revalidated into a later 304. Responses are marked private and
+    no-cache, so browsers keep them but revalidate every poll.
+
+    Apply it inside the role decorators. The view must read from the
+    primary: a replica's lag would tag old data with the current versions.
+
+    Args:
+        *tables: Tables the view reads
+        vary_on_query: Whether the query string is part of the ETag
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            # Versions are read before the data, so a write racing the view
+            # can only make the ETag older than the body, never newer
+            etag = table_etag(tables, request.GET.urlencode() if vary_on_query else '')
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code == 200:
+                    response.headers.setdefault('ETag', etag)
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
@@ -1,12 +1,23 @@
 import logging
+from django.conf import settings
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from .forms import ComplaintForm, ApplicationForm
 from .decorators import student_required, admin_required
-from django.http import FileResponse
+from .pagination import KeysetPage, get_page_size, keyset_paginate
+from .replica import use_replica
+from .versions import APPLICATIONS, COMPLAINTS, ROOMS, STUDENTS, TABLES, versioned
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.contrib.auth.decorators import login_required
+from django.urls import reverse
+from django.utils.http import urlencode
 
 logger = logging.getLogger(__name__)
+# High-volume page views, sampled separately (LOG_ACCESS_SAMPLE_RATE)
+access_logger = logging.getLogger('hostel.access')
+
+# Application status query values mapped to the boolean model field
+APPLICATION_STATUS_FILTERS = {'pending': False, 'approved': True}
 
 @student_required
 def lodge_complaint(request):
@@ -17,13 +28,13 @@ def lodge_complaint(request):
                 complaint = form.save(commit=False)
                 complaint.student = request.user.student
                 complaint.save()
-                logger.info(f'Student {request.user.student.student_id} lodged complaint ID {complaint.id}')
+                logger.info('Student %s lodged complaint ID %s', request.user.student.student_id, complaint.id)
                 messages.success(request, 'Complaint lodged successfully!')
                 return redirect('homepage')
         else:
             form = ComplaintForm()
     except Exception as e:
-        logger.error(f'Error lodging complaint: {str(e)}')
+        logger.error('Error lodging complaint: %s', e)
         messages.error(request, 'An error occurred while lodging your complaint. Please try again.')
         form = ComplaintForm()
 
@@ -32,19 +43,18 @@ def lodge_complaint(request):
 
 @student_required
 def download_voucher(request):
+    from .files import serve_file
+
     try:
-        file = open('static/fee_voucher.pdf', 'rb')
-        response = FileResponse(file)
-        response['Content-Type'] = 'application/pdf'
-        response['Content-Disposition'] = 'attachment; filename="FeeVoucher.pdf"'
-        logger.info(f'Student {request.user.student.student_id} downloaded fee voucher')
+        response = serve_file(request, settings.FEE_VOUCHER_PATH, 'application/pdf', filename='FeeVoucher.pdf')
+        logger.info('Student %s downloaded fee voucher (%s)', request.user.student.student_id, response.status_code)
         return response
     except FileNotFoundError:
         logger.error('Fee voucher file not found')
         messages.error(request, 'Fee voucher not available at this time.')
         return redirect('homepage')
     except Exception as e:
-        logger.error(f'Error downloading voucher: {str(e)}')
+        logger.error('Error downloading voucher: %s', e)
         messages.error(request, 'An error occurred while downloading the voucher.')
         return redirect('homepage')
 
@@ -59,7 +69,7 @@ def submit_application(request):
 
         if existing_application:
             messages.warning(request, 'You have already submitted an application.')
-            logger.warning(f'Student {request.user.student.student_id} attempted duplicate application')
+            logger.warning('Student %s attempted duplicate application', request.user.student.student_id)
             return redirect('homepage')
 
         if request.method == 'POST':
@@ -68,132 +78,363 @@ def submit_application(request):
                 application = form.save(commit=False)
                 application.applicant = request.user.student
                 application.save()
-                logger.info(f'Student {request.user.student.student_id} submitted application ID {application.id}')
+                logger.info('Student %s submitted application ID %s', request.user.student.student_id, application.id)
                 messages.success(request, 'Room application submitted successfully!')
                 return redirect('homepage')
         else:
             form = ApplicationForm()
     except Exception as e:
-        logger.error(f'Error submitting application: {str(e)}')
+        logger.error('Error submitting application: %s', e)
         messages.error(request, 'An error occurred while submitting your application. Please try again.')
         form = ApplicationForm()
 
     return render(request, 'hostel/room_application.html', {'form': form})
 
-@admin_required
-def fetch_complaints(request):
-    """Fetch all complaints using Django ORM (SQLite compatible)"""
+def filter_complaints(request):
+    """
+    Apply the complaint list's query-string filters.
+
+    Values outside the model choices are ignored.
+
+    Returns:
+        tuple: (filtered queryset, dict of the filters applied)
+    """
     from .models import Complaint
 
+    complaints = Complaint.objects.select_related('student')
+    filters = {}
+    status = request.GET.get('status', '')
+    if status in dict(Complaint.STATUS_CHOICES):
+        complaints = complaints.filter(status=status)
+        filters['status'] = status
+    return complaints, filters
+
+
+def complaints_context(page, filters):
+    from .models import Complaint
+    from .triage import TRANSITIONS
+
+    filters['page_size'] = page.page_size
+    return {
+        'complaints': page,
+        'page': page,
+        'filters': filters,
+        'querystring': urlencode(filters),
+        'status_choices': Complaint.STATUS_CHOICES,
+        'row_cache_timeout': settings.LIST_ROW_CACHE_TIMEOUT,
+        'triage_statuses': list(TRANSITIONS),
+    }
+
+
+def search_page(request, filters):
+    """
+    Run the ?q= full-text search, if any, as a single ranked page.
+
+    Returns:
+        KeysetPage or None: The best matches, or None without a query
+    """
+    from .search import search_complaints
+
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return None
+    filters['q'] = query
+    page_size = get_page_size(request)
+    return KeysetPage(search_complaints(query, status=filters.get('status'), limit=page_size), page_size)
+
+
+# Reads the primary, not the replica: its rows are cached (see hostel.fragments)
+@admin_required
+def fetch_complaints(request):
+    """Fetch one keyset page of complaints using Django ORM (SQLite compatible)"""
     try:
-        # Get all complaints with related student data
-        complaints = Complaint.objects.select_related('student').all().order_by('-id')
+        complaints, filters = filter_complaints(request)
+        page = search_page(request, filters)
+        if page is None:
+            page = keyset_paginate(complaints, request)
 
-        logger.info(f'Admin {request.user.username} fetched all complaints')
-        return render(request, 'hostel/complaints.html', {'complaints': complaints})
+        access_logger.info('Admin %s fetched complaints page', request.user.username)
+        return render(request, 'hostel/complaints.html', complaints_context(page, filters))
 
     except Exception as e:
-        logger.error(f'Error fetching complaints: {str(e)}')
+        logger.error('Error fetching complaints: %s', e)
         messages.error(request, 'An error occurred while fetching complaints.')
         return redirect('homepage')
 
 @admin_required
-def fetch_applications(request):
-    """Fetch all applications using Django ORM (SQLite compatible)"""
+def triage_complaints(request):
+    """Move the selected complaints, or every open complaint in the list, to a new status"""
+    from user.models import Admin
+    from .triage import transition_complaints
+
+    querystring = request.POST.get('querystring', '')
+    redirect_to = redirect(f"{reverse('fetch_complaints')}?{querystring}" if querystring else 'fetch_complaints')
+    if request.method != 'POST':
+        return redirect_to
+
+    status = request.POST.get('status', '')
+    changed_by_id = request.profile.pk if isinstance(request.profile, Admin) else None
+    try:
+        if request.POST.get('scope') == 'all':
+            # Everything matching the list's status filter, however many pages
+            moved = transition_complaints(status, from_status=request.POST.get('from_status') or None,
+                                          changed_by_id=changed_by_id)
+        else:
+            complaint_ids = [pk for pk in request.POST.getlist('complaint_ids') if pk.isdigit()]
+            if not complaint_ids:
+                messages.warning(request, 'Select at least one complaint.')
+                return redirect_to
+            moved = transition_complaints(status, complaint_ids=complaint_ids, changed_by_id=changed_by_id)
+
+        count = sum(moved.values())
+        logger.info('Admin %s moved %s complaints to %s', request.user.username, count, status)
+        messages.success(request, f'{count} complaint(s) moved to {status}.')
+
+    except ValueError as e:
+        messages.error(request, str(e))
+    except Exception as e:
+        logger.error('Error triaging complaints: %s', e)
+        messages.error(request, 'An error occurred while updating complaints.')
+
+    return redirect_to
+
+def filter_applications(request):
+    """
+    Apply the application list's query-string filters.
+
+    Values outside the model choices are ignored.
+
+    Returns:
+        tuple: (filtered queryset, dict of the filters applied)
+    """
     from .models import Application
 
+    applications = Application.objects.select_related('applicant')
+    filters = {}
+    status = request.GET.get('status', '')
+    if status in APPLICATION_STATUS_FILTERS:
+        applications = applications.filter(status=APPLICATION_STATUS_FILTERS[status])
+        filters['status'] = status
+
+    room_type = request.GET.get('room_type', '')
+    if room_type in dict(Application.ROOM_TYPE_CHOICES):
+        applications = applications.filter(room_type=room_type)
+        filters['room_type'] = room_type
+
+    occupancy = request.GET.get('occupancy', '')
+    if occupancy in dict(Application.OCCUPANCY_CHOICES):
+        applications = applications.filter(occupancy=occupancy)
+        filters['occupancy'] = occupancy
+    return applications, filters
+
+
+def applications_context(page, filters):
+    from .models import Application
+
+    filters['page_size'] = page.page_size
+    return {
+        'applications': page,
+        'page': page,
+        'filters': filters,
+        'querystring': urlencode(filters),
+        'room_type_choices': Application.ROOM_TYPE_CHOICES,
+        'occupancy_choices': Application.OCCUPANCY_CHOICES,
+        'row_cache_timeout': settings.LIST_ROW_CACHE_TIMEOUT,
+    }
+
+
+@admin_required
+@versioned(COMPLAINTS, STUDENTS, vary_on_query=True)
+def search_complaints(request):
+    """Ranked full-text search over complaint descriptions, as JSON; 304 while nothing changed"""
+    from .models import Complaint
+    from .search import search_complaints as run_search
+
+    query = request.GET.get('q', '').strip()
+    status = request.GET.get('status', '')
+    if status not in dict(Complaint.STATUS_CHOICES):
+        status = None
+
     try:
-        # Get all applications with related applicant data
-        applications = Application.objects.select_related('applicant').all().order_by('-id')
+        results = run_search(query, status=status, limit=get_page_size(request))
+    except Exception as e:
+        logger.error('Error searching complaints: %s', e)
+        return JsonResponse({'error': 'Search failed.'}, status=500)
+
+    return JsonResponse({
+        'query': query,
+        'status': status,
+        'count': len(results),
+        'results': [
+            {
+                'id': complaint.id,
+                'description': complaint.description,
+                'status': complaint.status,
+                'student_id': complaint.student.student_id,
+                'student_name': complaint.student.name,
+                'rank': complaint.search_rank,
+            }
+            for complaint in results
+        ],
+    })
+
+
+# Reads the primary, not the replica: its rows are cached (see hostel.fragments)
+@admin_required
+def fetch_applications(request):
+    """Fetch one keyset page of applications using Django ORM (SQLite compatible)"""
+    try:
+        applications, filters = filter_applications(request)
+        page = keyset_paginate(applications, request)
 
-        logger.info(f'Admin {request.user.username} fetched all applications')
-        return render(request, 'hostel/applications.html', {'applications': applications})
+        access_logger.info('Admin %s fetched applications page', request.user.username)
+        return render(request, 'hostel/applications.html', applications_context(page, filters))
 
     except Exception as e:
-        logger.error(f'Error fetching applications: {str(e)}')
+        logger.error('Error fetching applications: %s', e)
         messages.error(request, 'An error occurred while fetching applications.')
         return redirect('homepage')
 
 
+@admin_required
+@use_replica
+def export_data(request, dataset):
+    """Stream a complaints, applications or residents export as CSV or JSON Lines"""
+    from .exports import DATASETS, FORMATS, stream_export
+
+    fmt = request.GET.get('format', 'csv')
+    if dataset not in DATASETS or fmt not in FORMATS:
+        messages.error(request, 'Unknown export requested.')
+        return redirect('admin_dashboard')
+
+    response = StreamingHttpResponse(stream_export(dataset, fmt), content_type=FORMATS[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{dataset}.{fmt}"'
+
+    logger.info('Admin %s exported %s as %s', request.user.username, dataset, fmt)
+    return response
+
+
+def admin_dashboard_context(stats):
+    total_rooms = stats['total_rooms']
+    students_with_rooms = stats['students_with_rooms']
+
+    # Calculate occupancy percentage
+    if total_rooms > 0:
+        occupancy_rate = round((students_with_rooms / total_rooms) * 100, 1)
+    else:
+        occupancy_rate = 0
+
+    return {
+        'stats': stats,
+        'hostel_count': stats['hostel_count'],
+        'occupancy_rate': occupancy_rate,
+    }
+
+
 @admin_required
 def admin_dashboard(request):
     """Admin dashboard with statistics and charts (SQLite compatible)"""
-    from .models import Student, Room, Hostel, Application, Complaint
+    from .stats import get_dashboard_stats
 
     try:
-        # Get statistics using Django ORM
-        total_students = Student.objects.count()
-        total_rooms = Room.objects.count()
-        pending_applications = Application.objects.filter(status=False).count()
-        approved_applications = Application.objects.filter(status=True).count()
-        pending_complaints = Complaint.objects.filter(status='Pending').count()
-        inprogress_complaints = Complaint.objects.filter(status='In Progress').count()
-        resolved_complaints = Complaint.objects.filter(status='Resolved').count()
-        students_with_rooms = Student.objects.filter(application_status=True).count()
-        hostel_count = Hostel.objects.count()
-
-        # Calculate occupancy percentage
-        if total_rooms > 0:
-            occupancy_rate = round((students_with_rooms / total_rooms) * 100, 1)
-        else:
-            occupancy_rate = 0
-
-        stats = {
-            'total_students': total_students,
-            'total_rooms': total_rooms,
-            'pending_applications': pending_applications,
-            'approved_applications': approved_applications,
-            'pending_complaints': pending_complaints,
-            'inprogress_complaints': inprogress_complaints,
-            'resolved_complaints': resolved_complaints,
-            'students_with_rooms': students_with_rooms,
-        }
-
-        context = {
-            'stats': stats,
-            'hostel_count': hostel_count,
-            'occupancy_rate': occupancy_rate,
-        }
-
-        logger.info(f'Admin {request.user.username} accessed dashboard')
+        # Cached snapshot, computed in a single query on a cache miss
+        context = admin_dashboard_context(get_dashboard_stats())
+
+        access_logger.info('Admin %s accessed dashboard', request.user.username)
         return render(request, 'hostel/admin_dashboard.html', context)
 
     except Exception as e:
-        logger.error(f'Error loading admin dashboard: {str(e)}')
+        logger.error('Error loading admin dashboard: %s', e)
         messages.error(request, 'An error occurred while loading the dashboard.')
         return redirect('homepage')
 
 
-@student_required
-def student_dashboard(request):
-    """Student dashboard showing application and complaint status (SQLite compatible)"""
-    from .models import Application, Complaint
+@admin_required
+@versioned(*TABLES)
+def dashboard_stats(request):
+    """Admin dashboard counters as JSON, from the cached snapshot; 304 while nothing changed"""
+    from .stats import get_dashboard_stats
 
     try:
-        student = request.user.student
+        context = admin_dashboard_context(get_dashboard_stats())
+    except Exception as e:
+        logger.error('Error loading dashboard statistics: %s', e)
+        return JsonResponse({'error': 'Statistics unavailable.'}, status=500)
 
-        # Get student's application using Django ORM
-        application = Application.objects.filter(applicant=student).first()
+    return JsonResponse({**context['stats'], 'occupancy_rate': context['occupancy_rate']})
 
-        # Get student's complaints using Django ORM
-        complaints = Complaint.objects.filter(student=student).order_by('-id')
 
-        # Get room details if allocated
-        room = None
-        if student.application_status:
-            room = student.rooms.first()
+@admin_required
+@versioned(APPLICATIONS, COMPLAINTS, ROOMS)
+def dashboard_charts(request):
+    """Admin dashboard chart data as JSON, from the cached counters and the room summary; 304 while nothing changed"""
+    from . import repository
+    from .stats import get_dashboard_stats
 
-        context = {
-            'student': student,
-            'application': application,
-            'complaints': complaints,
-            'room': room,
-        }
+    try:
+        stats = get_dashboard_stats()
+        rooms = repository.room_statistics()
+    except Exception as e:
+        logger.error('Error loading dashboard charts: %s', e)
+        return JsonResponse({'error': 'Chart data unavailable.'}, status=500)
+
+    return JsonResponse({
+        'applications': {
+            'labels': ['Pending', 'Approved'],
+            'data': [stats['pending_applications'], stats['approved_applications']],
+        },
+        'complaints': {
+            'labels': ['Pending', 'In Progress', 'Resolved'],
+            'data': [stats['pending_complaints'], stats['inprogress_complaints'], stats['resolved_complaints']],
+        },
+        'beds': {
+            'labels': [f"{row['room_type']} {row['occupancy']}" for row in rooms],
+            'occupied': [row['occupied_beds'] or 0 for row in rooms],
+            'free': [(row['total_capacity'] or 0) - (row['occupied_beds'] or 0) for row in rooms],
+        },
+    })
+
+
+@admin_required
+def hostel_tree(request, hostel_id=None):
+    """Hostel -> wing -> floor -> room -> residents hierarchy as JSON, cached per hostel"""
+    from .hierarchy import get_hostel_tree_json
+    from .models import Hostel
+
+    try:
+        if hostel_id is None:
+            hostel_ids = list(Hostel.objects.order_by('id').values_list('id', flat=True))
+        else:
+            hostel_ids = [hostel_id]
+        # Each tree is already encoded, so the response is joined rather than re-serialized
+        trees = get_hostel_tree_json(hostel_ids)
+    except Exception as e:
+        logger.error('Error loading hostel tree: %s', e)
+        return JsonResponse({'error': 'Hostel tree unavailable.'}, status=500)
+
+    if hostel_id is not None:
+        if not trees:
+            return JsonResponse({'error': 'Hostel not found.'}, status=404)
+        return HttpResponse(trees[0], content_type='application/json')
+    return HttpResponse('{"hostels": [%s]}' % ', '.join(trees), content_type='application/json')
+
+
+@student_required
+def student_dashboard(request):
+    """Student dashboard showing application and complaint status (SQLite compatible)"""
+    from .student_cache import get_student_dashboard
+
+    try:
+        # Cached per student and dropped whenever their data changes
+        context = get_student_dashboard(request.user.pk)
+        if context is None:
+            messages.error(request, 'Student profile not found. Please contact administrator.')
+            return redirect('homepage')
 
-        logger.info(f'Student {student.student_id} accessed dashboard')
+        access_logger.info('Student %s accessed dashboard', context['student'].student_id)
         return render(request, 'hostel/student_dashboard.html', context)
 
     except Exception as e:
-        logger.error(f'Error loading student dashboard: {str(e)}')
+        logger.error('Error loading student dashboard: %s', e)
         messages.error(request, 'An error occurred while loading your dashboard.')
         return redirect('homepage')
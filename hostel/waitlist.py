@@ -0,0 +1,206 @@
+"""
+Room waitlist for HostelMS.
+
+Every pending application has a WaitlistEntry in the queue for its
+(room_type, occupancy). An entry's priority is a string built from the
+settings.WAITLIST_PRIORITY keys (e.g. seniors first, then first come,
+first served), so a queue's head is the first row of an index range scan:
+taking the next applicant for a freed bed is O(log n) whatever the queue
+length, and no pending application is rescanned.
+
+Signal handlers keep the entries in step with applications and students;
+allocation.fill_free_beds hands freed beds to the queue heads.
+"""
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+# Key name -> (digits, value); values are non-negative integers
+PRIORITY_KEYS = {
+    'semester': (4, lambda semester, submitted_at: semester),
+    'submitted_at': (17, lambda semester, submitted_at: int(submitted_at.timestamp() * 1_000_000)),
+}
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def priority_key(semester: int, submitted_at) -> str:
+    """
+    Sortable priority string for an application, per settings.WAITLIST_PRIORITY.
+
+    Each key is written as a fixed-width number, complemented when the key
+    is descending, so plain string order is queue order.
+
+    Args:
+        semester: The applicant's semester
+        submitted_at: When the application was submitted
+
+    Raises:
+        ImproperlyConfigured: If WAITLIST_PRIORITY names an unknown key
+    """
+    parts = []
+    for name in settings.WAITLIST_PRIORITY:
+        descending = name.startswith('-')
+        try:
+            width, value = PRIORITY_KEYS[name.lstrip('-')]
+        except KeyError:
+            raise ImproperlyConfigured(f'Unknown WAITLIST_PRIORITY key {name!r}')
+        limit = 10 ** width - 1
+        number = min(max(value(semester, submitted_at), 0), limit)
+        parts.append(f'{limit - number if descending else number:0{width}d}')
+    return '.'.join(parts)
+
+
+def enqueue(application) -> None:
+    """
+    Add a pending application to its queue, or move it if its preference changed.
+
+    Approved applications and applicants who already have a room leave the
+    queue instead, the same rule rebuild_waitlist applies.
+    """
+    from .models import WaitlistEntry
+
+    if application.status or application.applicant.application_status:
+        WaitlistEntry.objects.filter(application=application).delete()
+        return
+
+    WaitlistEntry.objects.update_or_create(
+        application=application,
+        defaults={
+            'room_type': application.room_type,
+            'occupancy': application.occupancy,
+            'priority': priority_key(application.applicant.semester, application.submitted_at),
+        },
+    )
+
+
+def requeue_applicant(applicant_id: int) -> None:
+    """
+    Rewrite an applicant's entries after their semester or housing changed.
+
+    A housed applicant leaves every queue; one who lost their room goes
+    back into the queues of their pending applications.
+    """
+    from .models import Application
+
+    rebuild_waitlist(Application.objects.filter(applicant_id=applicant_id).values_list('id', flat=True))
+
+
+def dequeue_applicants(applicant_ids: Iterable[int], using: Optional[str] = None) -> None:
+    """Take housed applicants out of every queue they were in."""
+    from .models import WaitlistEntry
+
+    applicant_ids = list(applicant_ids)
+    if applicant_ids:
+        WaitlistEntry.objects.using(using).filter(application__applicant_id__in=applicant_ids).delete()
+
+
+def queue_heads(room_type: str, occupancy: str, count: int = 1, lock: bool = False) -> List[Tuple[int, int]]:
+    """
+    The first ``count`` applicants waiting for a (room_type, occupancy) bed.
+
+    The queue is read in pages of ``count`` entries, each an index range
+    scan that resumes after the last entry read, until enough applicants
+    are found or the queue runs out: an applicant with two applications
+    for the same kind of bed is housed once.
+
+    Args:
+        room_type: Queue's room type
+        occupancy: Queue's occupancy
+        count: Number of applicants wanted
+        lock: Lock the returned entries and their applicants until the
+              current transaction ends. Only the entries of each page are
+              locked, never the whole queue; entries another transaction
+              has locked are skipped, and so are applicants it has housed
+              meanwhile (waiting in a second queue), so the next ones in
+              line take their place.
+
+    Returns:
+        List[Tuple[int, int]]: (application_id, applicant_id) pairs in
+            queue order, one per applicant
+    """
+    from user.models import Student
+    from .models import WaitlistEntry
+
+    heads = []
+    if count < 1:
+        return heads
+    queue = WaitlistEntry.objects.filter(room_type=room_type, occupancy=occupancy).order_by('priority', 'id')
+    seen = set()
+    after = None
+    while len(heads) < count:
+        page = queue
+        if after is not None:
+            page = page.filter(Q(priority__gt=after[0]) | Q(priority=after[0], id__gt=after[1]))
+        rows = list(page.values_list('priority', 'id', 'application_id', 'application__applicant_id')[:count])
+        if not rows:
+            break
+        after = rows[-1][:2]
+
+        candidates = []
+        for _, entry_id, application_id, applicant_id in rows:
+            if applicant_id not in seen:
+                seen.add(applicant_id)
+                candidates.append((entry_id, application_id, applicant_id))
+        if lock and candidates:
+            # Locked by primary key, without a row limit, which Oracle cannot
+            # combine with FOR UPDATE
+            locked = set(
+                WaitlistEntry.objects
+                .select_for_update(skip_locked=True)
+                .filter(pk__in=[entry_id for entry_id, _, _ in candidates])
+                .values_list('pk', flat=True)
+            )
+            housed = set(
+                Student.objects
+                .select_for_update()
+                .filter(user_id__in=[applicant_id for _, _, applicant_id in candidates], application_status=True)
+                .values_list('user_id', flat=True)
+            )
+            candidates = [c for c in candidates if c[0] in locked and c[2] not in housed]
+        heads.extend((application_id, applicant_id) for _, application_id, applicant_id in candidates)
+    return heads[:count]
+
+
+def rebuild_waitlist(application_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recreate the waitlist entries of pending applications.
+
+    Needed after WAITLIST_PRIORITY changes and after raw inserts that
+    bypass the signals (sample data).
+
+    Args:
+        application_ids: Only rebuild these applications' entries (default: all)
+
+    Returns:
+        int: Number of entries written
+    """
+    from .models import Application, WaitlistEntry
+
+    pending = Application.objects.filter(status=False, applicant__application_status=False)
+    stale = WaitlistEntry.objects.all()
+    if application_ids is not None:
+        application_ids = list(application_ids)
+        pending = pending.filter(id__in=application_ids)
+        stale = stale.filter(application_id__in=application_ids)
+
+    rows = pending.order_by('id').values_list('id', 'room_type', 'occupancy', 'applicant__semester', 'submitted_at')
+    with transaction.atomic():
+        stale.delete()
+        entries = WaitlistEntry.objects.bulk_create(
+            [
+                WaitlistEntry(application_id=pk, room_type=room_type, occupancy=occupancy,
+                              priority=priority_key(semester, submitted_at))
+                for pk, room_type, occupancy, semester, submitted_at in rows.iterator(chunk_size=REBUILD_BATCH_SIZE)
+            ],
+            batch_size=REBUILD_BATCH_SIZE,
+        )
+
+    logger.info('Rebuilt %s waitlist entries', len(entries))
+    return len(entries)
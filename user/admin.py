@@ -3,6 +3,18 @@ from django.contrib import admin
 from user.models import Student,User,Admin
 
 # Register your models here.
-admin.site.register(Student)
+
+
+@admin.register(Student)
+class StudentAdmin(admin.ModelAdmin):
+    list_display = ('student_id', 'name', 'email', 'semester', 'application_status')
+    ordering = ('student_id',)
+    # Also used by the autocomplete widgets of rooms, complaints and applications,
+    # so it is a prefix match on the unique student_id only: a substring match
+    # on name would scan the whole table on every keystroke
+    search_fields = ('^student_id',)
+    show_full_result_count = False
+
+
 admin.site.register(User)
-admin.site.register(Admin)
\ No newline at end of file
+admin.site.register(Admin)
@@ -0,0 +1,47 @@
+"""
+Authentication backend for HostelMS.
+
+Loads the session's user together with their Student/Admin profile in one
+joined query, so role checks and views reading request.user.student or
+request.user.admin never issue a second query. With
+AUTH_PROFILE_CACHE_TIMEOUT set, the loaded user is also kept in the cache
+and requests are served without any user query at all.
+"""
+from typing import Iterable
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+CACHE_PREFIX = 'auth_profile:'
+
+
+def profile_cache_key(user_id) -> str:
+    return f'{CACHE_PREFIX}{user_id}'
+
+
+def invalidate_profiles(user_ids: Iterable) -> None:
+    """Drop cached users so their next request reloads them."""
+    keys = [profile_cache_key(user_id) for user_id in set(user_ids)]
+    if keys:
+        cache.delete_many(keys)
+
+
+class ProfileBackend(ModelBackend):
+    """ModelBackend whose get_user also loads the Student/Admin profile."""
+
+    def get_user(self, user_id):
+        timeout = settings.AUTH_PROFILE_CACHE_TIMEOUT
+
+        user = cache.get(profile_cache_key(user_id)) if timeout else None
+        if user is None:
+            UserModel = get_user_model()
+            try:
+                user = UserModel._default_manager.select_related('student', 'admin').get(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            if timeout:
+                cache.set(profile_cache_key(user_id), user, timeout)
+
+        return user if self.user_can_authenticate(user) else None
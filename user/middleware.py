@@ -0,0 +1,41 @@
+"""
+Request profile middleware for HostelMS.
+"""
+from django.core.exceptions import ObjectDoesNotExist
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
+
+def get_profile(user):
+    """
+    Return the Student or Admin profile of a user.
+
+    Args:
+        user: The request user
+
+    Returns:
+        Student, Admin or None: The profile matching the user's role, or
+            None for anonymous users and users without one
+    """
+    if not user.is_authenticated:
+        return None
+    for role, attr in (('is_student', 'student'), ('is_admin', 'admin')):
+        if getattr(user, role, False):
+            try:
+                return getattr(user, attr)
+            except ObjectDoesNotExist:
+                return None
+    return None
+
+
+class ProfileMiddleware(MiddlewareMixin):
+    """
+    Attach the user's Student/Admin profile as request.profile.
+
+    Must come after AuthenticationMiddleware. With ProfileBackend the
+    profile arrives with the user, so reading it costs no query. Async
+    views must load request.user (await request.auser()) before reading it.
+    """
+
+    def process_request(self, request):
+        request.profile = SimpleLazyObject(lambda: get_profile(request.user))
@@ -0,0 +1,24 @@
+"""
+Signal handlers for the user app.
+Drops cached users when they or their profile change.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .backends import invalidate_profiles
+from .models import User, Student, Admin
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, using, **kwargs):
+    transaction.on_commit(lambda: invalidate_profiles([instance.pk]), using=using)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=Admin)
+@receiver(post_delete, sender=Admin)
+def profile_changed(sender, instance, using, **kwargs):
+    transaction.on_commit(lambda: invalidate_profiles([instance.user_id]), using=using)
@@ -1,3 +1,65 @@
-from django.test import TestCase
+from django.contrib import admin
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
 
-# Create your tests here.
+from user.backends import ProfileBackend, profile_cache_key
+from user.middleware import ProfileMiddleware, get_profile
+from user.models import User, Student, Admin
+
+
+def make_student(username='alice'):
+    user = User.objects.create_user(username, password='pass', is_student=True)
+    return Student.objects.create(user=user, student_id=username.upper(), name=username,
+                                  email=f'{username}@example.com', semester=1)
+
+
+class ProfileLoaderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = make_student()
+
+    def test_backend_loads_the_profile_with_the_user(self):
+        with self.assertNumQueries(1):
+            user = ProfileBackend().get_user(self.student.pk)
+            self.assertEqual(get_profile(user).student_id, 'ALICE')
+
+    def test_profile_matches_the_role(self):
+        user = User.objects.create_user('warden', password='pass', is_admin=True)
+        admin = Admin.objects.create(user=user, admin_id='W1', name='Warden', email='w@example.com')
+        self.assertEqual(get_profile(ProfileBackend().get_user(user.pk)), admin)
+        self.assertIsNone(get_profile(AnonymousUser()))
+        self.assertIsNone(get_profile(User.objects.create_user('staff', password='pass')))
+
+    def test_middleware_attaches_a_lazy_profile(self):
+        request = RequestFactory().get('/')
+        request.user = ProfileBackend().get_user(self.student.pk)
+        ProfileMiddleware(lambda request: None).process_request(request)
+        with self.assertNumQueries(0):
+            self.assertEqual(request.profile.student_id, 'ALICE')
+
+    @override_settings(AUTH_PROFILE_CACHE_TIMEOUT=60)
+    def test_cached_user_is_dropped_when_the_profile_changes(self):
+        ProfileBackend().get_user(self.student.pk)
+        with self.assertNumQueries(0):
+            ProfileBackend().get_user(self.student.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.name = 'Alice B'
+            self.student.save()
+
+        self.assertIsNone(cache.get(profile_cache_key(self.student.pk)))
+        self.assertEqual(ProfileBackend().get_user(self.student.pk).student.name, 'Alice B')
+
+
+class StudentSearchTests(TestCase):
+    def test_admin_search_matches_student_id_prefixes(self):
+        alice, bob = make_student('alice'), make_student('bob')
+        model_admin = admin.site._registry[Student]
+        request = RequestFactory().get('/')
+
+        results, _ = model_admin.get_search_results(request, Student.objects.all(), 'ali')
+        self.assertEqual(list(results), [alice])
+        # Names and IDs are not matched in the middle
+        results, _ = model_admin.get_search_results(request, Student.objects.all(), 'ob')
+        self.assertNotIn(bob, results)
@@ -28,7 +28,7 @@ def signup_view(request):
                     # Generate student_id from username
                     student_id = f"STU_{user.username.upper()}"
                     Student.objects.create(user=user, student_id=student_id, name=name, email=email, semester=semester)
-                    logger.info(f'New student registered: {student_id}')
+                    logger.info('New student registered: %s', student_id)
                     messages.success(request, 'Student account created successfully! Please login.')
 
                 elif 'admin_signup' in request.POST:
@@ -37,16 +37,16 @@ def signup_view(request):
                     # Generate admin_id from username
                     admin_id = f"ADM_{user.username.upper()}"
                     Admin.objects.create(user=user, admin_id=admin_id, name=name, email=email)
-                    logger.info(f'New admin registered: {admin_id}')
+                    logger.info('New admin registered: %s', admin_id)
                     messages.success(request, 'Admin account created successfully! Please login.')
 
                 return redirect('login')
 
             except IntegrityError as e:
-                logger.error(f'Integrity error during signup: {str(e)}')
+                logger.error('Integrity error during signup: %s', e)
                 messages.error(request, 'An account with this information already exists.')
             except Exception as e:
-                logger.error(f'Error during signup: {str(e)}')
+                logger.error('Error during signup: %s', e)
                 messages.error(request, 'An error occurred during registration. Please try again.')
     else:
         form = CustomUserCreationForm()
@@ -67,7 +67,7 @@ def login_view(request):
 
         if user is not None:
             login(request, user)
-            logger.info(f'User {username} logged in successfully')
+            logger.info('User %s logged in successfully', username)
 
             if user.is_student:
                 messages.success(request, f'Welcome back, {user.username}!')
@@ -79,7 +79,7 @@ def login_view(request):
                 messages.warning(request, 'User role not assigned. Please contact administrator.')
                 return redirect('homepage')
         else:
-            logger.warning(f'Failed login attempt for username: {username}')
+            logger.warning('Failed login attempt for username: %s', username)
             messages.error(request, 'Invalid username or password.')
             return render(request, 'user/login.html')
     else:
@@ -89,7 +89,7 @@ def login_view(request):
 def logout_view(request):
     username = request.user.username
     logout(request)
-    logger.info(f'User {username} logged out')
+    logger.info('User %s logged out', username)
     messages.success(request, 'You have been logged out successfully.')
     return redirect('login')
 
@@ -97,7 +97,10 @@ def logout_view(request):
 def homepage_view(request):
     try:
         if request.user.is_student:
-            student = Student.objects.get(user=request.user)
+            # Loaded with the user by ProfileBackend, so no extra query
+            student = request.profile
+            if not student:
+                raise Student.DoesNotExist
             context = {
                 'show_buttons': student.application_status,
                 'student': student
@@ -114,12 +117,12 @@ def homepage_view(request):
             return redirect('login')
 
     except Student.DoesNotExist:
-        logger.error(f'Student profile not found for user {request.user.username}')
+        logger.error('Student profile not found for user %s', request.user.username)
         messages.error(request, 'Student profile not found. Please contact administrator.')
         logout(request)
         return redirect('login')
     except Exception as e:
-        logger.error(f'Error in homepage view: {str(e)}')
+        logger.error('Error in homepage view: %s', e)
         messages.error(request, 'An error occurred. Please try again.')
         return redirect('login')
 